@@ -0,0 +1,153 @@
+"""
+Adaptive-width beam search: BSA that widens when it gets stuck and narrows in open terrain.
+
+`beam_search_astar_pruning_implicit` keeps a fixed `beam_width` and gives up
+when pruning leaves it with no candidates. In dense maps (scenario 5) that
+happens after a few dozen depths. The fix used to be a rerun at a wider W,
+which repeats all the work. `adaptive_beam_search` runs the same layer
+by layer search (expand the beam, keep the best W candidates by f, ties
+on lower h), and adjusts W as it goes:
+
+*   Stall: the beam's best h has not improved for `stall_depths` depths.
+    W doubles, up to `max_width`.
+*   Collapse: a layer has no candidates. W doubles, and the beam restarts
+    from the backtrack pool instead of failing.
+*   Open terrain: the best h has improved at every depth for `narrow_after`
+    depths in a row. W halves, down to `min_width`.
+
+Candidates pruned from a layer go into the backtrack pool, which holds the
+best `pool_size` of them by f (the worst are dropped). It is only sorted
+when a collapse needs it, so pruning costs a list extend per layer. A beam
+restored from the pool can mix depths, and pooled nodes that were reached
+more cheaply in the meantime are skipped. Paths come from a parent table
+rather than `Node` chains, so a pooled entry does not keep its ancestors
+alive. The reported score is the length of the returned path. The search gives up when the pool
+is empty too, or when `max_nodes_expanded_limit` expansions (the same
+budget as BSA's) are used up.
+
+The result is the usual result dict labelled `Adaptive Beam Search
+(W=min-max)`. It adds `widenings`, `narrowings`, `resumes` (restarts from
+the pool) and `peak_width`.
+"""
+import heapq
+import itertools
+import time
+
+DEFAULT_MIN_WIDTH = 8
+DEFAULT_MAX_WIDTH = 64
+DEFAULT_STALL_DEPTHS = 16
+DEFAULT_NARROW_AFTER = 32
+DEFAULT_POOL_SIZE = 16_384
+
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def adaptive_beam_search(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_expanded_limit,
+                         min_width=DEFAULT_MIN_WIDTH, max_width=DEFAULT_MAX_WIDTH, stall_depths=DEFAULT_STALL_DEPTHS,
+                         narrow_after=DEFAULT_NARROW_AFTER, pool_size=DEFAULT_POOL_SIZE):
+    if not 1 <= min_width <= max_width:
+        raise ValueError(f"need 1 <= min_width <= max_width, got {min_width} and {max_width}")
+    start_time = time.perf_counter()
+    label = f"Adaptive Beam Search (W={min_width}-{max_width})"
+
+    beam_width = min_width
+    start_h = heuristic_func(start_pos, goal_pos)
+    serial = itertools.count()
+    # Entries are (f, h, serial, g, position). Sorting them matches BSA's stable sort of `Node`s (f, then h,
+    # then generation order), and plain tuples let pruned entries sit in the pool without holding a Node chain.
+    current_beam = [(start_h, start_h, next(serial), 0, start_pos)]
+    visited_g_costs = {start_pos: 0}
+    parents = {start_pos: None}
+    pool = [] # pruned entries, unordered until a collapse sorts them
+    nodes_expanded_total = 0
+    limit_reached = False
+    counters = {"widenings": 0, "narrowings": 0, "resumes": 0, "peak_width": beam_width}
+
+    best_h = start_h
+    stalled_for = 0 # depths since best_h last improved
+    previous_layer_h = best_h
+    progress_streak = 0 # consecutive depths whose best h beat the previous depth's
+
+    def widen():
+        nonlocal beam_width, stalled_for, progress_streak
+        if beam_width < max_width:
+            beam_width = min(2 * beam_width, max_width)
+            counters["widenings"] += 1
+            counters["peak_width"] = max(counters["peak_width"], beam_width)
+        stalled_for = 0
+        progress_streak = 0
+
+    def result(path):
+        return dict({
+            "path": path,
+            "score": len(path) - 1 if path else float('inf'),
+            "time": time.perf_counter() - start_time,
+            "nodes_explored": nodes_expanded_total,
+            "limit_reached": limit_reached,
+            "algorithm": label,
+        }, **counters)
+
+    while current_beam:
+        candidates = []
+        for _, _, _, g, position in current_beam:
+            if nodes_expanded_total >= max_nodes_expanded_limit:
+                limit_reached = True
+                return result([])
+            nodes_expanded_total += 1
+
+            if position == goal_pos:
+                path = []
+                while position is not None:
+                    path.append(position)
+                    position = parents[position]
+                return result(path[::-1])
+
+            row, col = position
+            tentative_g_score = g + 1
+            for dr, dc in DIRECTIONS:
+                neighbor_pos = (row + dr, col + dc)
+                if not (0 <= neighbor_pos[0] < grid_dims[0] and 0 <= neighbor_pos[1] < grid_dims[1]):
+                    continue
+                if is_obstacle_func(neighbor_pos):
+                    continue
+                if tentative_g_score >= visited_g_costs.get(neighbor_pos, float('inf')):
+                    continue
+                visited_g_costs[neighbor_pos] = tentative_g_score
+                parents[neighbor_pos] = position
+                h_score = heuristic_func(neighbor_pos, goal_pos)
+                candidates.append((tentative_g_score + h_score, h_score, next(serial), tentative_g_score, neighbor_pos))
+
+        if not candidates:
+            # Collapse: resume from the best pruned entries that are still current, with a wider beam
+            widen()
+            current_beam = []
+            pool.sort(reverse=True) # best last, for pop()
+            while pool and len(current_beam) < beam_width:
+                entry = pool.pop()
+                if entry[3] == visited_g_costs[entry[4]]:
+                    current_beam.append(entry)
+            counters["resumes"] += bool(current_beam)
+            continue
+
+        candidates.sort()
+        current_beam = candidates[:beam_width]
+        pool.extend(candidates[beam_width:])
+        if len(pool) > 2 * pool_size:
+            pool = heapq.nsmallest(pool_size, pool)
+
+        layer_h = min(entry[1] for entry in current_beam)
+        if layer_h < best_h:
+            best_h = layer_h
+            stalled_for = 0
+        else:
+            stalled_for += 1
+        progress_streak = progress_streak + 1 if layer_h < previous_layer_h else 0
+        previous_layer_h = layer_h
+        if stalled_for >= stall_depths:
+            widen()
+        elif progress_streak >= narrow_after and beam_width > min_width:
+            beam_width = max(beam_width // 2, min_width)
+            counters["narrowings"] += 1
+            progress_streak = 0
+
+    return result([])
@@ -1,7 +1,5 @@
 import heapq
 import time
-import functools
-import csv
 
 # --- Global Limits ---
 MAX_NODES_TO_EXPLORE_ASTAR = 5_000_000
@@ -80,8 +78,12 @@ def is_obstacle_procedural(position, start_pos, goal_pos, grid_dims, scenario_se
     return random_val < obstacle_density
 
 # --- A* Algorithm (adapted for implicit grid) ---
-def a_star_search_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit):
+def a_star_search_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit, trace=None):
     start_time = time.perf_counter()
+    tracing = trace is not None # see tracing.SearchTrace
+    if tracing:
+        trace.start()
+        is_obstacle_func = trace.wrap_obstacle_func(is_obstacle_func)
     
     start_node = Node(start_pos, None, 0, heuristic_func(start_pos, goal_pos))
     
@@ -98,11 +100,24 @@ def a_star_search_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_ob
             limit_reached = True
             break
             
+        if tracing:
+            trace.peak_open = max(trace.peak_open, len(open_set))
         current_node = heapq.heappop(open_set)
         nodes_explored_count += 1
+        if tracing:
+            if current_node.position in closed_set:
+                trace.stale_pops += 1 # superseded entry; it is expanded again but adds nothing
+            if trace.sample_interval and nodes_explored_count % trace.sample_interval == 0:
+                trace.sample(nodes_explored_count, len(open_set), len(g_costs),
+                             [node.position for node in open_set[:trace.frontier_sample_size]])
 
         if current_node.position == goal_pos:
+            if tracing:
+                reconstruct_started = time.perf_counter()
             path = reconstruct_path(current_node)
+            if tracing:
+                trace.phase_times["reconstruct_path"] = time.perf_counter() - reconstruct_started
+                trace.finish_heap_search(nodes_explored_count, len(open_set), len(g_costs))
             end_time = time.perf_counter()
             return {
                 "path": path,
@@ -140,6 +155,8 @@ def a_star_search_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_ob
                 # For this version, pushing and letting g_costs check is fine.
                 heapq.heappush(open_set, neighbor_node)
                 
+    if tracing:
+        trace.finish_heap_search(nodes_explored_count, len(open_set), len(g_costs))
     end_time = time.perf_counter()
     return {
         "path": [],
@@ -151,8 +168,13 @@ def a_star_search_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_ob
     }
 
 # --- Beam Search (adapted for implicit grid) ---
-def beam_search_astar_pruning_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, beam_width, max_nodes_expanded_limit):
+def beam_search_astar_pruning_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, beam_width, max_nodes_expanded_limit, trace=None):
     start_time = time.perf_counter()
+    tracing = trace is not None # see tracing.SearchTrace
+    if tracing:
+        trace.start()
+        is_obstacle_func = trace.wrap_obstacle_func(is_obstacle_func)
+        candidates_total = 0
 
     start_node = Node(start_pos, None, 0, heuristic_func(start_pos, goal_pos))
     
@@ -170,6 +192,10 @@ def beam_search_astar_pruning_implicit(grid_dims, start_pos, goal_pos, heuristic
         if nodes_expanded_total >= max_nodes_expanded_limit :
             limit_reached = True
             break
+        if tracing:
+            trace.beam_sizes.append(len(current_beam))
+            if trace.sample_interval and depth % trace.sample_interval == 0:
+                trace.sample(depth, len(current_beam), len(visited_g_costs), [node.position for node in current_beam])
 
         candidates = []
         nodes_expanded_this_step = 0
@@ -182,9 +208,14 @@ def beam_search_astar_pruning_implicit(grid_dims, start_pos, goal_pos, heuristic
             nodes_expanded_this_step +=1
 
             if current_node.position == goal_pos:
+                if tracing:
+                    reconstruct_started = time.perf_counter()
                 path = reconstruct_path(current_node)
-                end_time = time.perf_counter()
                 nodes_expanded_total += nodes_expanded_this_step
+                if tracing:
+                    trace.phase_times["reconstruct_path"] = time.perf_counter() - reconstruct_started
+                    trace.finish_beam_search(nodes_expanded_total, candidates_total + len(candidates), len(visited_g_costs))
+                end_time = time.perf_counter()
                 return {
                     "path": path,
                     "score": current_node.g,
@@ -213,6 +244,9 @@ def beam_search_astar_pruning_implicit(grid_dims, start_pos, goal_pos, heuristic
                 candidates.append(neighbor_node)
         
         nodes_expanded_total += nodes_expanded_this_step
+        if tracing:
+            candidates_total += len(candidates)
+            trace.peak_open = max(trace.peak_open, len(candidates))
         if limit_reached: # If limit was hit while generating successors
             break
 
@@ -225,6 +259,8 @@ def beam_search_astar_pruning_implicit(grid_dims, start_pos, goal_pos, heuristic
         if not current_beam:
             break
             
+    if tracing:
+        trace.finish_beam_search(nodes_expanded_total, candidates_total, len(visited_g_costs))
     end_time = time.perf_counter()
     return {
         "path": [],
@@ -355,141 +391,8 @@ scenarios = [
 BEAM_WIDTH = 8
 
 # --- Main Run and Logging Logic ---
-CSV_LOG_FILE_NAME = "pathfinding_results.csv"
-TEXT_LOG_FILE_NAME = "pathfinding_verbose_log.txt"
-
-CSV_HEADER = [
-    "Scenario_Name", "Grid_Dims", "Start_Pos", "Goal_Pos", "Scenario_Seed", "Obstacle_Density",
-    "Algorithm", "Beam_Width", "Path_Found", "Path_Score", "Nodes_Processed", "Time_s", "Limit_Reached"
-]
-
-# Open both log files
-with open(CSV_LOG_FILE_NAME, 'w', newline='') as csv_log_file, \
-     open(TEXT_LOG_FILE_NAME, 'w') as text_log_file:
-
-    csv_writer = csv.writer(csv_log_file)
-    csv_writer.writerow(CSV_HEADER) # Write the CSV header
-
-    def write_to_console_and_text_log(message):
-        """Helper function to print to console and write to text log."""
-        print(message)
-        text_log_file.write(message + "\n")
-
-    write_to_console_and_text_log(f"Starting experiments. CSV results logged to {CSV_LOG_FILE_NAME}, Verbose log to {TEXT_LOG_FILE_NAME}")
-
-    for i, scenario_data in enumerate(scenarios):
-        scenario_name = scenario_data['name']
-        dims = scenario_data['grid_dims']
-        start = scenario_data['start']
-        goal = scenario_data['goal']
-        seed = scenario_data['scenario_seed']
-        density = scenario_data['obstacle_density']
-        beam_widths_to_test = scenario_data['beam_widths_to_test']
-
-        # --- Scenario Header ---
-        scenario_header_text = f"\n--- Scenario {i+1}: {scenario_name} ---"
-        write_to_console_and_text_log(scenario_header_text)
-        
-        details_text = (
-            f"  Grid Dimensions: {dims[0]}x{dims[1]}, Start: {start}, Goal: {goal}\n"
-            f"  Obstacle Density: {density*100:.1f}%, Scenario Seed: {seed}\n"
-            f"  A* Node Limit: {MAX_NODES_TO_EXPLORE_ASTAR}, Beam Search Node Limit: {MAX_NODES_TO_EXPAND_BEAM}"
-        ) # Note: Beam width is per-run for Beam Search
-        write_to_console_and_text_log(details_text)
-
-        current_is_obstacle_func = functools.partial(is_obstacle_procedural,
-                                                     start_pos=start,
-                                                     goal_pos=goal,
-                                                     grid_dims=dims,
-                                                     scenario_seed=seed,
-                                                     obstacle_density=density)
-
-        # --- Run A* ---
-        write_to_console_and_text_log(f"\n  Running A*...")
-        results_astar = a_star_search_implicit(dims, start, goal, heuristic_manhattan, current_is_obstacle_func, MAX_NODES_TO_EXPLORE_ASTAR)
-        
-        # Log A* results to CSV
-        log_row_astar = [
-            scenario_name, f"{dims[0]}x{dims[1]}", str(start), str(goal), seed, f"{density:.2f}",
-            results_astar['algorithm'], "N/A",
-            "Yes" if results_astar['path'] else "No",
-            results_astar['score'] if results_astar['path'] else "N/A",
-            results_astar['nodes_explored'],
-            f"{results_astar['time']:.6f}",
-            "Yes" if results_astar['limit_reached'] else "No"
-        ]
-        csv_writer.writerow(log_row_astar)
-
-        # Write A* results to text log
-        astar_text_log = (
-            f"    [{results_astar['algorithm']} Results]\n"
-            f"      Path Found: {'Yes' if results_astar['path'] else 'No'}\n"
-        )
-        if results_astar['path']:
-            astar_text_log += f"      Path Score (Cost): {results_astar['score']}\n"
-        astar_text_log += (
-            f"      Nodes Explored: {results_astar['nodes_explored']}\n"
-            f"      Wall Clock Time: {results_astar['time']:.6f} seconds\n"
-        )
-        if results_astar['limit_reached']:
-            astar_text_log += f"      Termination: Max nodes explored limit ({MAX_NODES_TO_EXPLORE_ASTAR}) reached.\n"
-        write_to_console_and_text_log(astar_text_log)
-
-
-        # --- Run Beam Search for each specified width ---
-        for beam_width_val in beam_widths_to_test:
-            write_to_console_and_text_log(f"\n  Running Beam Search (W={beam_width_val})...")
-            results_beam = beam_search_astar_pruning_implicit(dims, start, goal, heuristic_manhattan, current_is_obstacle_func, beam_width_val, MAX_NODES_TO_EXPAND_BEAM)
-            
-            # Log Beam Search results to CSV
-            log_row_beam = [
-                scenario_name, f"{dims[0]}x{dims[1]}", str(start), str(goal), seed, f"{density:.2f}",
-                results_beam['algorithm'], 
-                beam_width_val,
-                "Yes" if results_beam['path'] else "No",
-                results_beam['score'] if results_beam['path'] else "N/A",
-                results_beam['nodes_explored'],
-                f"{results_beam['time']:.6f}",
-                "Yes" if results_beam['limit_reached'] else "No"
-            ]
-            csv_writer.writerow(log_row_beam)
-
-            # Write Beam Search results to text log
-            beam_text_log = (
-                f"    [{results_beam['algorithm']} Results]\n"
-                f"      Path Found: {'Yes' if results_beam['path'] else 'No'}\n"
-            )
-            if results_beam['path']:
-                beam_text_log += f"      Path Score (Cost): {results_beam['score']}\n"
-            beam_text_log += (
-                f"      Nodes Expanded from Beam: {results_beam['nodes_explored']}\n"
-                f"      Wall Clock Time: {results_beam['time']:.6f} seconds\n"
-            )
-            if results_beam['limit_reached']:
-                beam_text_log += f"      Termination: Max nodes expanded limit ({MAX_NODES_TO_EXPAND_BEAM}) reached.\n"
-            write_to_console_and_text_log(beam_text_log)
-
-            # --- Comparison Note (for text log only) ---
-            comparison_text = "      Comparison: "
-            if results_astar['path'] and results_beam['path']:
-                if results_astar['score'] < results_beam['score']:
-                    comparison_text += "A* found a better (shorter/cheaper) path."
-                elif results_beam['score'] < results_astar['score']:
-                    comparison_text += "Beam Search found a better path (A* might have hit limit or Beam got lucky)."
-                else: 
-                    comparison_text += "Both algorithms found paths of the same quality (or both hit limits similarly)."
-            elif results_astar['path'] and not results_beam['path']:
-                comparison_text += "A* found a path, but Beam Search did not (possibly due to pruning or hitting limit)."
-            elif not results_astar['path'] and results_beam['path']:
-                comparison_text += "Beam Search found a path, but A* did not (A* might have hit its limit earlier on a wider search)."
-            elif not results_astar['path'] and not results_beam['path']:
-                comparison_text += "Neither algorithm found a path (possibly no path exists, or both hit limits)."
-            write_to_console_and_text_log(comparison_text)
-        
-        write_to_console_and_text_log("\n" + "="*60 + "\n") # Scenario separator
-        
-        # Flush buffers to ensure data is written, especially for long runs
-        csv_log_file.flush()
-        text_log_file.flush()
-
-    write_to_console_and_text_log(f"\nAll scenarios processed. CSV log: {CSV_LOG_FILE_NAME}, Verbose log: {TEXT_LOG_FILE_NAME}")
\ No newline at end of file
+# The experiment driver lives in run_experiments.py, so importing this module has no side effects
+# (and does not pull in NumPy). `python algorithm.py` still runs it, with the same command-line options.
+if __name__ == "__main__":
+    from run_experiments import main
+    main()
@@ -0,0 +1,239 @@
+"""
+Anytime "quick path, then refine" planner.
+
+`anytime_search` is a generator. It yields a first path from a narrow beam
+search, then only strictly better paths, until the path is proven optimal,
+the deadline passes, or the node budget runs out:
+
+1. Beam phase: `beam_search_astar_pruning_implicit` at each width in
+   `beam_widths` (narrowest first). A wider beam is reported only when it
+   beats the incumbent. The obstacle callable is wrapped so that a beam run
+   that is still going at the deadline is abandoned.
+2. ARA* phase: weighted A* with a falling weight (`epsilons`). It starts
+   from the best beam path: every cell on it gets its g value and parent, so
+   the search begins with an incumbent cost to prune against. Only the path
+   is reused, not every g value the beam saw: BSA keeps no parents for the
+   other cells, and a g value with no parent chain behind it cannot be
+   turned back into a path. Each weight
+   round reuses the g values, parents and open cells of the previous one
+   instead of starting over (cells improved after they were expanded wait in
+   an INCONS set, as in ARA*). Nothing is pushed whose g + h could not beat
+   the incumbent.
+
+After each round the suboptimality bound is min(epsilon, cost / lower bound),
+where the lower bound is the smallest g + h still open. The path is proven
+optimal once that bound reaches 1.
+
+Every yielded item is the usual result dict (with `time` and
+`nodes_explored` counted from the call, so they are cumulative), plus
+`bound` and `optimal`. A yielded dict is never changed afterwards: when a
+later round only tightens the bound on the same path, the summary's `best`
+is a new dict with the new bound. The generator's return value, which `plan_anytime`
+hands back, summarizes the run: best result, time to first path, time to
+the proven optimum (None if it was not reached) and whether the deadline
+cut it short.
+"""
+import heapq
+import time
+
+from algorithm import beam_search_astar_pruning_implicit
+
+DEFAULT_BEAM_WIDTHS = (8, 32)
+DEFAULT_EPSILONS = (3.0, 2.0, 1.5, 1.2, 1.0)
+# Pops (ARA* phase) or obstacle checks (beam phase) between deadline checks
+DEADLINE_CHECK_INTERVAL = 1024
+
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class _DeadlinePassed(Exception):
+    pass
+
+
+def _with_deadline(is_obstacle_func, stop_time):
+    """`is_obstacle_func` that raises `_DeadlinePassed` once `time.perf_counter()` passes `stop_time`."""
+    if stop_time == float('inf'):
+        return is_obstacle_func
+    perf_counter = time.perf_counter
+    calls = 0
+
+    def guarded(position):
+        nonlocal calls
+        calls += 1
+        if calls % DEADLINE_CHECK_INTERVAL == 0 and perf_counter() >= stop_time:
+            raise _DeadlinePassed
+        return is_obstacle_func(position)
+    return guarded
+
+
+def _path_from_parents(parents, position):
+    path = []
+    while position is not None:
+        path.append(position)
+        position = parents[position]
+    return path[::-1]
+
+
+def anytime_search(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit,
+                   deadline=None, beam_widths=DEFAULT_BEAM_WIDTHS, epsilons=DEFAULT_EPSILONS):
+    """
+    Yield strictly improving result dicts (see the module docstring);
+    `deadline` is in seconds from the call, None for no deadline. A beam run
+    cut short by the deadline reports nothing, and its expansions are not
+    counted in `nodes_explored`.
+    """
+    start_time = time.perf_counter()
+    stop_time = start_time + deadline if deadline is not None else float('inf')
+    nodes_explored_count = 0
+    best = None
+    time_to_first_path = None
+    time_to_optimal = None
+    deadline_hit = False
+
+    def make_result(path, phase, bound):
+        nonlocal best, time_to_first_path
+        elapsed = time.perf_counter() - start_time
+        if time_to_first_path is None:
+            time_to_first_path = elapsed
+        best = {
+            "path": path,
+            "score": len(path) - 1,
+            "time": elapsed,
+            "nodes_explored": nodes_explored_count,
+            "limit_reached": False,
+            "algorithm": f"Anytime ({phase})",
+            "bound": bound,
+            "optimal": bound <= 1.0,
+        }
+        return best
+
+    def summary():
+        return {
+            "best": best,
+            "time_to_first_path": time_to_first_path,
+            "time_to_optimal": time_to_optimal,
+            "optimal": time_to_optimal is not None,
+            "deadline_hit": deadline_hit,
+            "nodes_explored": nodes_explored_count,
+            "time": time.perf_counter() - start_time,
+        }
+
+    # --- Beam phase ---
+    beam_obstacle_func = _with_deadline(is_obstacle_func, stop_time)
+    for beam_width in beam_widths:
+        if nodes_explored_count >= max_nodes_explored_limit:
+            break
+        if time.perf_counter() >= stop_time:
+            deadline_hit = True
+            break
+        try:
+            result = beam_search_astar_pruning_implicit(grid_dims, start_pos, goal_pos, heuristic_func,
+                                                        beam_obstacle_func, beam_width,
+                                                        max_nodes_explored_limit - nodes_explored_count)
+        except _DeadlinePassed:
+            deadline_hit = True
+            break
+        nodes_explored_count += result['nodes_explored']
+        if result['path'] and (best is None or result['score'] < best['score']):
+            yield make_result(result['path'], f"beam W={beam_width}", float('inf'))
+    if deadline_hit:
+        return summary()
+
+    # --- ARA* phase, seeded with the incumbent path ---
+    g_costs = {start_pos: 0}
+    parents = {start_pos: None}
+    if best is not None:
+        path = best['path']
+        for depth, position in enumerate(path):
+            if depth < g_costs.get(position, float('inf')):
+                g_costs[position] = depth
+                parents[position] = path[depth - 1] if depth else None
+    goal_g = g_costs.get(goal_pos, float('inf'))
+    open_positions = set(g_costs)
+    incons = set()
+
+    for epsilon in epsilons:
+        open_set = []
+        for position in open_positions | incons:
+            h_score = heuristic_func(position, goal_pos)
+            open_set.append((g_costs[position] + epsilon * h_score, h_score, position))
+        heapq.heapify(open_set)
+        closed_set = set()
+        incons = set()
+        interrupted = False
+
+        while open_set and open_set[0][0] < goal_g:
+            if nodes_explored_count % DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() >= stop_time:
+                deadline_hit = interrupted = True
+                break
+            if nodes_explored_count >= max_nodes_explored_limit:
+                interrupted = True
+                break
+            _, _, position = heapq.heappop(open_set)
+            if position in closed_set:
+                continue # superseded duplicate
+            closed_set.add(position)
+            nodes_explored_count += 1
+
+            tentative_g_score = g_costs[position] + 1
+            for dr, dc in DIRECTIONS:
+                neighbor_pos = (position[0] + dr, position[1] + dc)
+                if not (0 <= neighbor_pos[0] < grid_dims[0] and 0 <= neighbor_pos[1] < grid_dims[1]):
+                    continue
+                if tentative_g_score >= g_costs.get(neighbor_pos, float('inf')):
+                    continue
+                h_score = heuristic_func(neighbor_pos, goal_pos)
+                if tentative_g_score + h_score >= goal_g:
+                    continue # cannot beat the incumbent
+                if is_obstacle_func(neighbor_pos):
+                    continue
+
+                g_costs[neighbor_pos] = tentative_g_score
+                parents[neighbor_pos] = position
+                if neighbor_pos == goal_pos:
+                    goal_g = tentative_g_score
+                if neighbor_pos in closed_set:
+                    incons.add(neighbor_pos)
+                else:
+                    heapq.heappush(open_set, (tentative_g_score + epsilon * h_score, h_score, neighbor_pos))
+
+        open_positions = {position for _, _, position in open_set if position not in closed_set}
+        lower_bound = min((g_costs[p] + heuristic_func(p, goal_pos) for p in open_positions | incons), default=float('inf'))
+        if goal_g == float('inf'):
+            if not interrupted and lower_bound == float('inf'):
+                time_to_optimal = time.perf_counter() - start_time # proven: there is no path
+                break
+            if interrupted:
+                break
+            continue
+
+        bound = goal_g / lower_bound if lower_bound > 0 else float('inf')
+        if not interrupted:
+            bound = min(bound, epsilon)
+        bound = max(bound, 1.0)
+        if best is None or goal_g < best['score']:
+            yield make_result(_path_from_parents(parents, goal_pos), f"ARA* eps={epsilon:g}", bound)
+        else:
+            bound = min(best['bound'], bound)
+            best = dict(best, bound=bound, optimal=bound <= 1.0) # the caller keeps the dict it was given
+        if best['optimal']:
+            time_to_optimal = time.perf_counter() - start_time
+            break
+        if interrupted:
+            break
+
+    return summary()
+
+
+def plan_anytime(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit,
+                 deadline=None, on_path=None, **options):
+    """Run `anytime_search` to the end, calling `on_path(result)` for each improvement; returns the summary."""
+    search = anytime_search(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func,
+                            max_nodes_explored_limit, deadline=deadline, **options)
+    while True:
+        try:
+            result = next(search)
+        except StopIteration as stop:
+            return stop.value
+        if on_path is not None:
+            on_path(result)
@@ -0,0 +1,184 @@
+"""
+Batch shortest-path queries on one map.
+
+`batch_a_star_search` takes a list of `(start_pos, goal_pos)` pairs for a single
+`ObstacleField` and returns one result dict per query, in input order.
+
+Queries are grouped by a shared endpoint: the endpoint that the most
+unanswered queries have in common (as start or as goal) becomes the root of
+one search tree, and each query in the group is answered when its other
+endpoint is popped. Grid moves are reversible, so a group sharing a goal is
+searched from that goal and its paths are reversed. Queries that share
+nothing form groups of one, which is plain A*.
+
+A group's tree is an A* whose heuristic is the minimum of `heuristic_func`
+over the targets not popped yet (consistent if `heuristic_func` is). When a
+target is popped, the open set is re-keyed for the remaining targets and the
+search carries on: closed cells keep their optimal g, so every answer is
+still optimal. Heap entries whose key predates the latest target are re-keyed
+lazily, when they surface. Groups with more than `MAX_TARGETS_PER_TREE`
+distinct targets are split by direction around the root: a tree pays off
+when its targets lie roughly the same way and share path prefixes, not when
+its open set has to cover every direction.
+
+Obstacle semantics match one `is_obstacle_procedural` call per query. The
+root is open, like every query's start and goal. A target that the terrain
+blocks can be reached as that query's endpoint, but no path runs through
+it. Every group reads the same field, so tiles loaded for one group are
+cached for the next.
+"""
+import heapq
+import math
+import time
+from collections import Counter
+
+MAX_TARGETS_PER_TREE = 8
+
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def group_queries(queries):
+    """
+    Greedy grouping: [(root, reverse, [query indices])], where `reverse` means
+    the root is the shared goal. Each step takes the endpoint shared by the
+    most unassigned queries (starts win ties, then first appearance).
+    """
+    unassigned = dict(enumerate(queries))
+    groups = []
+    while unassigned:
+        counts = Counter()
+        for start_pos, goal_pos in unassigned.values():
+            counts[(start_pos, False)] += 1
+            counts[(goal_pos, True)] += 1
+        # max keeps the first of equal keys, so ties go to start roots, then to the endpoint seen first
+        (root, reverse), _ = max(counts.items(), key=lambda item: (item[1], not item[0][1]))
+        members = [index for index, (start_pos, goal_pos) in unassigned.items()
+                   if (goal_pos if reverse else start_pos) == root]
+        for index in members:
+            del unassigned[index]
+        groups.extend((root, reverse, chunk) for chunk in _split_by_direction(root, reverse, members, queries))
+    return groups
+
+
+def _split_by_direction(root, reverse, members, queries):
+    """Chunks of `members` with at most MAX_TARGETS_PER_TREE distinct targets, by angle around `root`."""
+    by_target = {}
+    for index in members:
+        by_target.setdefault(queries[index][0] if reverse else queries[index][1], []).append(index)
+    targets = sorted(by_target, key=lambda target: math.atan2(target[0] - root[0], target[1] - root[1]))
+    chunks = []
+    for i in range(0, len(targets), MAX_TARGETS_PER_TREE):
+        chunks.append(sorted(index for target in targets[i:i + MAX_TARGETS_PER_TREE] for index in by_target[target]))
+    return chunks
+
+
+def _tree_search(grid_dims, root, targets, heuristic_func, field, max_nodes_explored_limit):
+    """
+    One search tree from `root` to every cell in `targets`. Returns
+    (answers, limit reached, nodes explored, seconds), where answers maps each
+    reached target to (path from root, g, nodes explored so far, seconds so far).
+    """
+    start_time = time.perf_counter()
+    is_terrain_obstacle = field.bind(root, root) # root open, terrain everywhere else
+    remaining = set(targets)
+    answers = {}
+
+    def h_of(position):
+        return min(heuristic_func(position, target) for target in remaining)
+
+    # Entries carry the target-set version their h was computed for. Dropping a target can only
+    # raise h, so an outdated key is still a lower bound: it is re-keyed when it surfaces.
+    version = 0
+    root_h = h_of(root)
+    open_set = [(root_h, root_h, version, root)]
+    g_costs = {root: 0}
+    parents = {root: None}
+    closed_set = set()
+    nodes_explored_count = 0
+    limit_reached = False
+
+    while open_set and remaining:
+        if nodes_explored_count >= max_nodes_explored_limit:
+            limit_reached = True
+            break
+        _, h_score, entry_version, position = heapq.heappop(open_set)
+        if position in closed_set:
+            continue # superseded duplicate
+        if entry_version != version:
+            new_h = h_of(position)
+            if new_h != h_score:
+                heapq.heappush(open_set, (g_costs[position] + new_h, new_h, version, position))
+                continue
+        closed_set.add(position)
+        nodes_explored_count += 1
+
+        if position in remaining:
+            path = []
+            current = position
+            while current is not None:
+                path.append(current)
+                current = parents[current]
+            answers[position] = (path[::-1], g_costs[position], nodes_explored_count, time.perf_counter() - start_time)
+            remaining.discard(position)
+            if not remaining:
+                break
+            version += 1
+            if position != root and is_terrain_obstacle(position):
+                continue # an endpoint for its own query only; no path runs through it
+
+        tentative_g_score = g_costs[position] + 1
+        for dr, dc in DIRECTIONS:
+            neighbor_pos = (position[0] + dr, position[1] + dc)
+            if not (0 <= neighbor_pos[0] < grid_dims[0] and 0 <= neighbor_pos[1] < grid_dims[1]):
+                continue
+            if neighbor_pos in closed_set:
+                continue
+            if tentative_g_score >= g_costs.get(neighbor_pos, float('inf')):
+                continue
+            if neighbor_pos not in remaining and is_terrain_obstacle(neighbor_pos):
+                continue
+
+            g_costs[neighbor_pos] = tentative_g_score
+            parents[neighbor_pos] = position
+            h_score = h_of(neighbor_pos)
+            heapq.heappush(open_set, (tentative_g_score + h_score, h_score, version, neighbor_pos))
+
+    return answers, limit_reached, nodes_explored_count, time.perf_counter() - start_time
+
+
+def batch_a_star_search(grid_dims, queries, heuristic_func, field, max_nodes_explored_limit):
+    """
+    Optimal paths for every `(start_pos, goal_pos)` in `queries` on `field`
+    (an `ObstacleField`), as result dicts in input order. Each tree stops
+    after `max_nodes_explored_limit` pops, like a single query. In a result,
+    `time` and `nodes_explored` are what its tree had spent when that query
+    was answered (or in total, if it was not).
+    """
+    results = [None] * len(queries)
+    for root, reverse, members in group_queries(queries):
+        targets = {queries[index][0] if reverse else queries[index][1] for index in members}
+        answers, limit_reached, tree_nodes, tree_time = _tree_search(
+            grid_dims, root, targets, heuristic_func, field, max_nodes_explored_limit)
+        for index in members:
+            target = queries[index][0] if reverse else queries[index][1]
+            answer = answers.get(target)
+            if answer is None:
+                results[index] = {
+                    "path": [],
+                    "score": float('inf'),
+                    "time": tree_time,
+                    "nodes_explored": tree_nodes,
+                    "limit_reached": limit_reached,
+                    "algorithm": "Batch A*"
+                }
+                continue
+            path, g, nodes_explored_count, elapsed = answer
+            results[index] = {
+                "path": path[::-1] if reverse else list(path),
+                "score": g,
+                "time": elapsed,
+                "nodes_explored": nodes_explored_count,
+                "limit_reached": False,
+                "algorithm": "Batch A*"
+            }
+    return results
@@ -0,0 +1,218 @@
+"""
+Batched beam engine: `beam_search_astar_pruning_implicit` with NumPy arrays.
+
+The Node-based beam search builds a list of `Node` candidates per depth and
+fully sorts it to keep the best `beam_width`. Here the beam is a pair of
+position arrays, all four neighbor offsets of the whole beam are generated in
+one step, bounds/visited/obstacle filtering happens on the batch, and the next
+beam is picked with `np.argpartition` instead of a full sort.
+
+Every node in the beam at depth d has g == d, so f order is h order. Ties are
+broken on generation order (beam index, then neighbor order), which is what
+the stable `candidates.sort()` does, and duplicates keep their first
+occurrence, which is what the sequential visited check does. The engine
+therefore returns exactly the same result dict as the Node version (path,
+score, nodes_explored, limit_reached), just faster at wide beams.
+
+`is_obstacle_func` is used through its `batch(rows, cols)` attribute when it
+has one (see `obstacle_field.bind_obstacle_field`), and one cell at a time
+otherwise. `heuristic_manhattan` is vectorized; any other heuristic is called
+per candidate.
+"""
+import time
+
+import numpy as np
+
+from algorithm import heuristic_manhattan
+
+PAGE_SHIFT = 5
+PAGE_MASK = (1 << PAGE_SHIFT) - 1
+PAGE_CELLS = 1 << (2 * PAGE_SHIFT)
+
+# Same neighbor order as the Node-based searches
+DIRECTIONS_R = np.array([0, 0, 1, -1], dtype=np.int64)
+DIRECTIONS_C = np.array([1, -1, 0, 0], dtype=np.int64)
+
+
+class VisitedGTable:
+    """
+    g values of every cell the beam has generated, in 32x32 int32 pages
+    (-1 = never generated) so lookups and updates are done per page with
+    fancy indexing rather than per cell.
+    """
+
+    def __init__(self, grid_dims):
+        self.pages_per_row = (grid_dims[1] + PAGE_MASK) >> PAGE_SHIFT
+        self.pages = {}
+
+    def _page(self, key):
+        page = self.pages.get(key)
+        if page is None:
+            page = np.full(PAGE_CELLS, -1, dtype=np.int32)
+            self.pages[key] = page
+        return page
+
+    def locate(self, rows, cols):
+        """Page keys and in-page offsets for coordinate arrays."""
+        keys = (rows >> PAGE_SHIFT) * self.pages_per_row + (cols >> PAGE_SHIFT)
+        offsets = ((rows & PAGE_MASK) << PAGE_SHIFT) | (cols & PAGE_MASK)
+        return keys, offsets
+
+    def get(self, keys, offsets):
+        if keys.size and keys.min() == keys.max(): # the whole batch sits in one page (the common case)
+            return self._page(int(keys[0]))[offsets]
+        g_values = np.empty(keys.size, dtype=np.int32)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        for i, key in enumerate(unique_keys.tolist()):
+            selector = inverse == i
+            g_values[selector] = self._page(key)[offsets[selector]]
+        return g_values
+
+    def set(self, keys, offsets, g):
+        if keys.size and keys.min() == keys.max():
+            self._page(int(keys[0]))[offsets] = g
+            return
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        for i, key in enumerate(unique_keys.tolist()):
+            self._page(key)[offsets[inverse == i]] = g
+
+    def set_one(self, position, g):
+        r, c = position
+        key = (r >> PAGE_SHIFT) * self.pages_per_row + (c >> PAGE_SHIFT)
+        self._page(key)[((r & PAGE_MASK) << PAGE_SHIFT) | (c & PAGE_MASK)] = g
+
+
+def _obstacle_mask(is_obstacle_func, rows, cols):
+    batch = getattr(is_obstacle_func, "batch", None)
+    if batch is not None:
+        return batch(rows, cols)
+    return np.fromiter((is_obstacle_func((r, c)) for r, c in zip(rows.tolist(), cols.tolist())),
+                       dtype=bool, count=rows.size)
+
+
+def _heuristic_values(heuristic_func, rows, cols, goal_pos):
+    if heuristic_func is heuristic_manhattan:
+        return np.abs(rows - goal_pos[0]) + np.abs(cols - goal_pos[1])
+    # float, so a non-integer heuristic ranks candidates exactly as `candidates.sort()` does
+    return np.fromiter((heuristic_func((r, c), goal_pos) for r, c in zip(rows.tolist(), cols.tolist())),
+                       dtype=float, count=rows.size)
+
+
+def select_top(h_values, beam_width):
+    """
+    Indices of the `beam_width` smallest h values, ties in index order, sorted
+    the same way `candidates.sort()` would leave them.
+    """
+    n = h_values.size
+    if h_values.dtype.kind == "f":
+        return np.argsort(h_values, kind="stable")[:beam_width] # h first, then generation order
+    keys = h_values * n + np.arange(n) # unique keys: h first, then generation order
+    if n <= beam_width:
+        return np.argsort(keys)
+    chosen = np.argpartition(keys, beam_width - 1)[:beam_width]
+    return chosen[np.argsort(keys[chosen])]
+
+
+def _reconstruct_path(beam_history, depth, index):
+    path = []
+    while depth >= 0:
+        rows, cols, parents = beam_history[depth]
+        path.append((int(rows[index]), int(cols[index])))
+        index = parents[index]
+        depth -= 1
+    return path[::-1]
+
+
+# --- Batched Beam Search ---
+def beam_search_batched(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, beam_width, max_nodes_expanded_limit):
+    start_time = time.perf_counter()
+    algorithm_name = f"Beam Search (W={beam_width})"
+
+    n_rows, n_cols = grid_dims
+    goal_r, goal_c = goal_pos
+    visited = VisitedGTable(grid_dims)
+    visited.set_one(start_pos, 0)
+
+    beam_r = np.array([start_pos[0]], dtype=np.int64)
+    beam_c = np.array([start_pos[1]], dtype=np.int64)
+    # Per depth: beam positions and each node's index in the previous beam
+    beam_history = [(beam_r, beam_c, np.array([-1], dtype=np.int64))]
+    nodes_expanded_total = 0
+    limit_reached = False
+
+    max_depth = n_rows + n_cols # A loose upper bound for path length, as in the Node version
+
+    for depth in range(max_depth):
+        beam_size = beam_r.size
+        if beam_size == 0:
+            break
+        allowed = max_nodes_expanded_limit - nodes_expanded_total
+        if allowed <= 0:
+            limit_reached = True
+            break
+
+        goal_hits = np.flatnonzero((beam_r == goal_r) & (beam_c == goal_c))
+        if goal_hits.size and goal_hits[0] < allowed:
+            goal_index = int(goal_hits[0])
+            nodes_expanded_total += goal_index + 1
+            path = _reconstruct_path(beam_history, depth, goal_index)
+            end_time = time.perf_counter()
+            return {
+                "path": path,
+                "score": depth,
+                "time": end_time - start_time,
+                "nodes_explored": nodes_expanded_total,
+                "limit_reached": False,
+                "algorithm": algorithm_name
+            }
+
+        if beam_size > allowed:
+            # The Node version expands the first `allowed` nodes, then stops without a path
+            nodes_expanded_total += allowed
+            limit_reached = True
+            break
+        nodes_expanded_total += beam_size
+
+        # All neighbors of the whole beam, in (beam index, direction) order
+        cand_r = (beam_r[:, None] + DIRECTIONS_R[None, :]).ravel()
+        cand_c = (beam_c[:, None] + DIRECTIONS_C[None, :]).ravel()
+        cand_parent = np.repeat(np.arange(beam_size), 4)
+
+        if beam_r.min() == 0 or beam_c.min() == 0 or beam_r.max() == n_rows - 1 or beam_c.max() == n_cols - 1:
+            keep = (cand_r >= 0) & (cand_r < n_rows) & (cand_c >= 0) & (cand_c < n_cols)
+            cand_r, cand_c, cand_parent = cand_r[keep], cand_c[keep], cand_parent[keep]
+
+        tentative_g_score = depth + 1
+        keys, offsets = visited.locate(cand_r, cand_c)
+        old_g = visited.get(keys, offsets)
+        keep = (old_g < 0) | (old_g > tentative_g_score)
+
+        # First occurrence wins among duplicates generated in this step (a stable sort keeps it in front)
+        packed = cand_r * n_cols + cand_c
+        order = np.argsort(packed, kind='stable')
+        repeated = packed[order[1:]] == packed[order[:-1]]
+        keep[order[1:][repeated]] = False
+
+        keep_index = np.flatnonzero(keep)
+        if keep_index.size:
+            blocked = _obstacle_mask(is_obstacle_func, cand_r[keep_index], cand_c[keep_index])
+            keep_index = keep_index[~blocked]
+        if keep_index.size == 0:
+            break
+
+        cand_r, cand_c, cand_parent = cand_r[keep_index], cand_c[keep_index], cand_parent[keep_index]
+        visited.set(keys[keep_index], offsets[keep_index], tentative_g_score)
+
+        chosen = select_top(_heuristic_values(heuristic_func, cand_r, cand_c, goal_pos), beam_width)
+        beam_r, beam_c = cand_r[chosen], cand_c[chosen]
+        beam_history.append((beam_r, beam_c, cand_parent[chosen]))
+
+    end_time = time.perf_counter()
+    return {
+        "path": [],
+        "score": float('inf'),
+        "time": end_time - start_time,
+        "nodes_explored": nodes_expanded_total,
+        "limit_reached": limit_reached,
+        "algorithm": algorithm_name
+    }
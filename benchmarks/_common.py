@@ -0,0 +1,32 @@
+"""Shared helpers for the benchmark scripts (run them from the repo root with `python -m benchmarks.<name>`)."""
+import functools
+
+from algorithm import scenarios, is_obstacle_procedural
+
+
+def get_scenario(number):
+    """Scenarios are numbered from 1, matching their names and the verbose log."""
+    return scenarios[number - 1]
+
+
+def procedural_obstacle_func(scenario):
+    """The original pure-Python obstacle callable for a scenario."""
+    return functools.partial(is_obstacle_procedural,
+                             start_pos=scenario['start'],
+                             goal_pos=scenario['goal'],
+                             grid_dims=scenario['grid_dims'],
+                             scenario_seed=scenario['scenario_seed'],
+                             obstacle_density=scenario['obstacle_density'])
+
+
+def parse_scenario_numbers(text):
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def print_table(header, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    line = "  ".join(f"{{:<{w}}}" for w in widths)
+    print(line.format(*header))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print(line.format(*[str(cell) for cell in row]))
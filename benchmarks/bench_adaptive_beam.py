@@ -0,0 +1,133 @@
+"""
+Adaptive-width beam search against BSA at fixed widths on every scenario.
+
+Each scenario runs BSA at each width in --widths and `adaptive_beam_search`,
+all with the same --node-limit expansion budget and the same warm
+`ObstacleField`. A* runs first with --astar-limit to get the optimal cost
+where that is cheap. The first table gives cost and time per scenario
+("-" = no path). The summary gives each method's success rate, mean cost
+above optimal on scenarios where A* succeeded and the method found a path,
+and total time.
+
+Scenario 5's goal cannot be reached (A* runs out of nodes), so the scenarios
+hardly exercise the widening. --dense-queries adds that many random queries
+per density in --densities, on scenario 5's seed around its start. Each has
+a start and goal 0-400 cells apart that A* connects within --astar-limit.
+They are summarized the same way.
+
+    python -m benchmarks.bench_adaptive_beam --node-limit 1000000
+    python -m benchmarks.bench_adaptive_beam --scenarios 4,5,8 --max-width 256 --dense-queries 0
+"""
+import argparse
+import random
+
+from adaptive_beam import (
+    DEFAULT_MAX_WIDTH, DEFAULT_MIN_WIDTH, DEFAULT_NARROW_AFTER, DEFAULT_STALL_DEPTHS, adaptive_beam_search,
+)
+from algorithm import a_star_search_implicit, beam_search_astar_pruning_implicit, heuristic_manhattan, scenarios
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=parse_scenario_numbers, default=list(range(1, len(scenarios) + 1)))
+    parser.add_argument("--widths", type=parse_scenario_numbers, default=[8, 16, 32, 64])
+    parser.add_argument("--node-limit", type=int, default=1_000_000)
+    parser.add_argument("--astar-limit", type=int, default=500_000)
+    parser.add_argument("--min-width", type=int, default=DEFAULT_MIN_WIDTH)
+    parser.add_argument("--max-width", type=int, default=DEFAULT_MAX_WIDTH)
+    parser.add_argument("--stall-depths", type=int, default=DEFAULT_STALL_DEPTHS)
+    parser.add_argument("--narrow-after", type=int, default=DEFAULT_NARROW_AFTER)
+    parser.add_argument("--dense-queries", type=int, default=15, help="random queries per density (0 = none)")
+    parser.add_argument("--densities", type=lambda text: [float(part) for part in text.split(",") if part.strip()],
+                        default=[0.3, 0.35, 0.38])
+    parser.add_argument("--seed", type=int, default=18)
+    args = parser.parse_args()
+
+    methods = [f"W={width}" for width in args.widths] + ["Adaptive"]
+
+    def run_all(dims, start, goal, field):
+        runs = {}
+        for width in args.widths:
+            runs[f"W={width}"] = beam_search_astar_pruning_implicit(dims, start, goal, heuristic_manhattan,
+                                                                    field.bind(start, goal), width, args.node_limit)
+        runs["Adaptive"] = adaptive_beam_search(dims, start, goal, heuristic_manhattan, field.bind(start, goal),
+                                                args.node_limit, args.min_width, args.max_width,
+                                                args.stall_depths, args.narrow_after)
+        return runs
+
+    totals = _new_totals(methods)
+    rows = []
+    for number in args.scenarios:
+        scenario = get_scenario(number)
+        dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+        field = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density'])
+        reference = a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal), args.astar_limit)
+        optimal = reference['score'] if reference['path'] else None
+        runs = run_all(dims, start, goal, field)
+        _add_to_totals(totals, runs, optimal)
+
+        row = [number, optimal if optimal is not None else "-"]
+        for method in methods:
+            result = runs[method]
+            if result['path']:
+                row.append(f"{result['score']} / {result['time']:.2f}s")
+            else:
+                row.append(f"- / {result['time']:.2f}s" + (" (limit)" if result['limit_reached'] else ""))
+        adaptive = runs["Adaptive"]
+        row.append(f"{adaptive['peak_width']} ({adaptive['widenings']}+/{adaptive['narrowings']}-/{adaptive['resumes']}r)")
+        rows.append(row)
+
+    print(f"Cost / time per scenario ({args.node_limit} expansion budget; adaptive W={args.min_width}-{args.max_width})")
+    print_table(["Scenario", "A*_cost", *methods, "Adaptive_peak_W (widen/narrow/resume)"], rows)
+    print()
+    _print_summary(methods, totals, len(args.scenarios))
+
+    if args.dense_queries:
+        rng = random.Random(args.seed)
+        scenario = get_scenario(5)
+        dims, (r0, c0) = scenario['grid_dims'], scenario['start']
+        for density in args.densities:
+            field = get_obstacle_field(scenario['scenario_seed'], density)
+            totals = _new_totals(methods)
+            found = 0
+            while found < args.dense_queries:
+                start = (r0 + rng.randrange(400), c0 + rng.randrange(400))
+                goal = (start[0] + rng.randrange(-200, 200), start[1] + rng.randrange(-200, 200))
+                if field.is_obstacle(start) or field.is_obstacle(goal):
+                    continue
+                reference = a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal),
+                                                   args.astar_limit)
+                if not reference['path']:
+                    continue
+                found += 1
+                _add_to_totals(totals, run_all(dims, start, goal, field), reference['score'])
+            print(f"\n{args.dense_queries} reachable random queries at density {density}")
+            _print_summary(methods, totals, args.dense_queries)
+
+
+def _new_totals(methods):
+    return {method: {"found": 0, "excess": [], "time": 0.0} for method in methods}
+
+
+def _add_to_totals(totals, runs, optimal):
+    for method, result in runs.items():
+        totals[method]["time"] += result['time']
+        if result['path']:
+            totals[method]["found"] += 1
+            if optimal is not None:
+                totals[method]["excess"].append(result['score'] / optimal - 1)
+
+
+def _print_summary(methods, totals, n):
+    summary = []
+    for method in methods:
+        excess = totals[method]["excess"]
+        summary.append([method, f"{totals[method]['found']}/{n}",
+                        f"{100 * sum(excess) / len(excess):.1f}%" if excess else "-", f"{totals[method]['time']:.2f}"])
+    print_table(["Method", "Success", "Mean_excess_cost", "Total_time_s"], summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+A* and BSA with the ALT landmark heuristic against `heuristic_manhattan`.
+
+For each scenario, landmark tables are built for the window around its start
+and goal (grown by --margin). The scenario query and --queries random
+(start, goal) pairs then run with both heuristics on the same warm
+`ObstacleField`. The random pairs lie inside the window and in the
+landmarks' connected component. A* costs must match. The table reports total
+nodes expanded and search time per heuristic, the preprocessing time, and
+the net time per query once preprocessing is spread over all the queries.
+Break-even is how many such queries pay for the tables.
+
+    python -m benchmarks.bench_alt --scenarios 3,4,5,11,12 --margin 512 --queries 20
+"""
+import argparse
+import random
+
+from algorithm import a_star_search_implicit, beam_search_astar_pruning_implicit, heuristic_manhattan
+from grid_file import scenario_window
+from landmarks import DEFAULT_LANDMARKS, get_landmark_table
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=parse_scenario_numbers, default=[3, 4, 5, 11, 12])
+    parser.add_argument("--margin", type=int, default=512)
+    parser.add_argument("--landmarks", type=int, default=DEFAULT_LANDMARKS)
+    parser.add_argument("--queries", type=int, default=20, help="random queries per window, on top of the scenario's own")
+    parser.add_argument("--beam-width", type=int, default=8)
+    parser.add_argument("--node-limit", type=int, default=300_000)
+    parser.add_argument("--cache-dir", default=None, help="reuse/save tables here (preprocessing then only counts once)")
+    parser.add_argument("--seed", type=int, default=14)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    astar_rows, beam_rows = [], []
+    for number in args.scenarios:
+        scenario = get_scenario(number)
+        dims = scenario['grid_dims']
+        origin, shape = scenario_window(scenario, args.margin)
+        table = get_landmark_table(scenario['scenario_seed'], scenario['obstacle_density'], origin, shape,
+                                   args.landmarks, dims, args.cache_dir)
+        field = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density'])
+
+        def cell():
+            # endpoints in sealed pockets would only measure how fast each heuristic hits the node limit
+            while True:
+                position = (origin[0] + rng.randrange(shape[0]), origin[1] + rng.randrange(shape[1]))
+                if table.distances_at(position)[0] != table.unreachable:
+                    return position
+
+        queries = [(scenario['start'], scenario['goal'])] + [(cell(), cell()) for _ in range(args.queries)]
+        for start, goal in queries: # warm the field so both heuristics see the same cache
+            a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal), args.node_limit)
+
+        totals = {key: [0, 0.0] for key in ("astar", "astar_alt", "beam", "beam_alt")}
+        beam_scores = [0, 0]
+        for start, goal in queries:
+            alt = table.heuristic_for(start, goal)
+            runs = {
+                "astar": a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal), args.node_limit),
+                "astar_alt": a_star_search_implicit(dims, start, goal, alt, field.bind(start, goal), args.node_limit),
+                "beam": beam_search_astar_pruning_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal),
+                                                           args.beam_width, args.node_limit),
+                "beam_alt": beam_search_astar_pruning_implicit(dims, start, goal, alt, field.bind(start, goal),
+                                                               args.beam_width, args.node_limit),
+            }
+            if runs["astar"]['path'] and runs["astar"]['score'] != runs["astar_alt"]['score']:
+                raise AssertionError(f"ALT cost {runs['astar_alt']['score']} != A* cost {runs['astar']['score']} for {start} -> {goal}")
+            for key, result in runs.items():
+                totals[key][0] += result['nodes_explored']
+                totals[key][1] += result['time']
+            beam_scores[0] += runs["beam"]['path'] != [] and runs["beam"]['score'] == runs["astar"]['score']
+            beam_scores[1] += runs["beam_alt"]['path'] != [] and runs["beam_alt"]['score'] == runs["astar"]['score']
+
+        n = len(queries)
+        (plain_nodes, plain_time), (alt_nodes, alt_time) = totals["astar"], totals["astar_alt"]
+        saved_per_query = (plain_time - alt_time) / n
+        astar_rows.append([
+            number, n, f"{table.build_time:.2f}", plain_nodes, alt_nodes,
+            f"{100 * (1 - alt_nodes / plain_nodes):.0f}%" if plain_nodes else "-",
+            f"{1000 * plain_time / n:.1f}", f"{1000 * alt_time / n:.1f}",
+            f"{1000 * (alt_time + table.build_time) / n:.1f}",
+            f"{table.build_time / saved_per_query:.0f}" if saved_per_query > 0 else "never",
+        ])
+        beam_rows.append([
+            number, totals["beam"][0], totals["beam_alt"][0],
+            f"{beam_scores[0]}/{n}", f"{beam_scores[1]}/{n}",
+        ])
+
+    print(f"A* ({args.landmarks} landmarks, {args.margin}-cell margin, times in ms per query)")
+    print_table(["Scenario", "Queries", "Preprocess_s", "Manhattan_nodes", "ALT_nodes", "Reduction",
+                 "Manhattan_ms", "ALT_ms", "ALT_net_ms", "Break_even"], astar_rows)
+    print(f"\nBSA W={args.beam_width} (queries solved optimally)")
+    print_table(["Scenario", "Manhattan_nodes", "ALT_nodes", "Manhattan_optimal", "ALT_optimal"], beam_rows)
+
+
+if __name__ == "__main__":
+    main()
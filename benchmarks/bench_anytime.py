@@ -0,0 +1,56 @@
+"""
+Anytime planner: time to first path and time to a proven optimum per scenario.
+
+Each improvement is listed with its cost, the suboptimality bound known at
+that point and the elapsed time. "Optimal at" stays N/A when the deadline or
+the node limit stopped the run first.
+
+    python -m benchmarks.bench_anytime --scenarios 1,2,3,4,8,9,11,12 --deadline 10
+"""
+import argparse
+
+from algorithm import heuristic_manhattan
+from anytime import DEFAULT_BEAM_WIDTHS, plan_anytime
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="1,2,3,4,8,9,11,12", help="comma separated scenario numbers (default: 1,2,3,4,8,9,11,12)")
+    parser.add_argument("--deadline", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--node-limit", type=int, default=5_000_000)
+    parser.add_argument("--beam-widths", default=",".join(map(str, DEFAULT_BEAM_WIDTHS)))
+    args = parser.parse_args()
+    beam_widths = tuple(parse_scenario_numbers(args.beam_widths))
+
+    improvement_rows = []
+    summary_rows = []
+    for number in parse_scenario_numbers(args.scenarios):
+        scenario = get_scenario(number)
+        dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+        obstacle_func = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density']).bind(start, goal)
+
+        def on_path(result):
+            improvement_rows.append([number, result['algorithm'], result['score'], f"{result['bound']:.3f}",
+                                     result['nodes_explored'], f"{result['time']:.3f}"])
+
+        summary = plan_anytime(dims, start, goal, heuristic_manhattan, obstacle_func, args.node_limit,
+                               deadline=args.deadline, on_path=on_path, beam_widths=beam_widths)
+        best = summary['best']
+        summary_rows.append([
+            number,
+            best['score'] if best else "N/A",
+            f"{summary['time_to_first_path']:.3f}" if summary['time_to_first_path'] is not None else "N/A",
+            f"{summary['time_to_optimal']:.3f}" if summary['optimal'] else "N/A",
+            "Yes" if summary['deadline_hit'] else "No",
+            summary['nodes_explored'],
+        ])
+
+    print_table(["Scenario", "Phase", "Score", "Bound", "Nodes", "Time_s"], improvement_rows)
+    print()
+    print_table(["Scenario", "Best", "First_path_s", "Optimal_at_s", "Deadline_hit", "Nodes"], summary_rows)
+
+
+if __name__ == "__main__":
+    main()
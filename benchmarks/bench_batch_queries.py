@@ -0,0 +1,85 @@
+"""
+Batch query throughput against a loop of single A* calls on one scenario map.
+
+Three workloads of random cells around the scenario start (fixed --seed):
+  one-to-many    one depot to --queries goals
+  many-to-many   a sqrt(--queries) x sqrt(--queries) grid of starts and goals
+  unrelated      --queries pairs that share nothing (one tree per query)
+
+Both sides use the same shared ObstacleField, warmed up before timing, and
+every batch cost is checked against the looped A*.
+
+    python -m benchmarks.bench_batch_queries --scenario 3 --queries 64 --radius 150
+"""
+import argparse
+import math
+import random
+import time
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from batch_queries import batch_a_star_search
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, print_table
+
+
+def random_cell(rng, center, radius, grid_dims):
+    r = min(max(center[0] + rng.randint(-radius, radius), 0), grid_dims[0] - 1)
+    c = min(max(center[1] + rng.randint(-radius, radius), 0), grid_dims[1] - 1)
+    return (r, c)
+
+
+def workloads(rng, center, radius, grid_dims, n_queries):
+    cell = lambda: random_cell(rng, center, radius, grid_dims)
+    depot = cell()
+    side = max(1, math.isqrt(n_queries))
+    starts = [cell() for _ in range(side)]
+    goals = [cell() for _ in range(side)]
+    return {
+        "one-to-many": [(depot, cell()) for _ in range(n_queries)],
+        "many-to-many": [(s, g) for s in starts for g in goals],
+        "unrelated": [(cell(), cell()) for _ in range(n_queries)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--radius", type=int, default=150, help="cells are drawn within this many rows/cols of the scenario start")
+    parser.add_argument("--node-limit", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    scenario = get_scenario(args.scenario)
+    dims = scenario['grid_dims']
+    field = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density'])
+    rng = random.Random(args.seed)
+
+    rows = []
+    for name, queries in workloads(rng, scenario['start'], args.radius, dims, args.queries).items():
+        batch_a_star_search(dims, queries, heuristic_manhattan, field, args.node_limit) # warm the tile cache
+
+        started = time.perf_counter()
+        looped = [a_star_search_implicit(dims, s, g, heuristic_manhattan, field.bind(s, g), args.node_limit) for s, g in queries]
+        loop_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batched = batch_a_star_search(dims, queries, heuristic_manhattan, field, args.node_limit)
+        batch_time = time.perf_counter() - started
+
+        for (s, g), single, batch in zip(queries, looped, batched):
+            if single['path'] and single['score'] != batch['score']:
+                raise AssertionError(f"batch cost {batch['score']} != A* cost {single['score']} for {s} -> {g}")
+
+        rows.append([
+            name, len(queries),
+            f"{len(queries) / loop_time:.1f}", f"{len(queries) / batch_time:.1f}",
+            f"{loop_time / batch_time:.2f}x",
+            sum(r['nodes_explored'] for r in looped),
+        ])
+
+    print_table(["Workload", "Queries", "Loop_q/s", "Batch_q/s", "Speedup", "Loop_nodes"], rows)
+
+
+if __name__ == "__main__":
+    main()
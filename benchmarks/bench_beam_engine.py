@@ -0,0 +1,55 @@
+"""
+Node-based beam search against the batched NumPy beam engine.
+
+Both run on the same warmed-up `ObstacleField` and must return identical
+paths, scores and expansion counts; only the time may differ.
+
+    python -m benchmarks.bench_beam_engine --scenarios 4,8,9 --widths 8,16,32,64
+"""
+import argparse
+
+from algorithm import beam_search_astar_pruning_implicit, heuristic_manhattan, MAX_NODES_TO_EXPAND_BEAM
+from beam_engine import beam_search_batched
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+COMPARED_KEYS = ("path", "score", "nodes_explored", "limit_reached", "algorithm")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="4,8,9", help="comma separated scenario numbers (default: 4,8,9)")
+    parser.add_argument("--widths", default="8,16,32,64", help="comma separated beam widths (default: 8,16,32,64)")
+    parser.add_argument("--node-limit", type=int, default=MAX_NODES_TO_EXPAND_BEAM)
+    parser.add_argument("--repeats", type=int, default=3, help="best-of-N timing per engine")
+    args = parser.parse_args()
+
+    rows = []
+    for number in parse_scenario_numbers(args.scenarios):
+        scenario = get_scenario(number)
+        obstacle_func = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density']).bind(
+            scenario['start'], scenario['goal'])
+        for beam_width in parse_scenario_numbers(args.widths):
+            search_args = (scenario['grid_dims'], scenario['start'], scenario['goal'],
+                           heuristic_manhattan, obstacle_func, beam_width, args.node_limit)
+            beam_search_batched(*search_args) # warm the tile cache
+            node_result = min((beam_search_astar_pruning_implicit(*search_args) for _ in range(args.repeats)),
+                              key=lambda result: result['time'])
+            batched_result = min((beam_search_batched(*search_args) for _ in range(args.repeats)),
+                                 key=lambda result: result['time'])
+            if any(node_result[key] != batched_result[key] for key in COMPARED_KEYS):
+                raise AssertionError(f"batched engine differs from the Node version on scenario {number}, W={beam_width}")
+            rows.append([
+                number, beam_width,
+                node_result['score'] if node_result['path'] else "N/A",
+                node_result['nodes_explored'],
+                f"{node_result['time']:.3f}",
+                f"{batched_result['time']:.3f}",
+                f"{node_result['time'] / batched_result['time']:.2f}x",
+            ])
+
+    print_table(["Scenario", "W", "Score", "Nodes", "Node_s", "Batched_s", "Speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
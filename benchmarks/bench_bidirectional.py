@@ -0,0 +1,50 @@
+"""
+Bidirectional A* against one-directional A* on the long scenarios.
+
+"Saved" is the number of pops one-directional A* needed that the bidirectional
+search did not. When A* hits the node limit it is a lower bound.
+
+    python -m benchmarks.bench_bidirectional --scenarios 4,8,9,10,12 --node-limit 1000000
+"""
+import argparse
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from bidirectional import bidirectional_a_star_search_implicit
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="4,8,9,10,12", help="comma separated scenario numbers (default: 4,8,9,10,12)")
+    parser.add_argument("--node-limit", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = []
+    for number in parse_scenario_numbers(args.scenarios):
+        scenario = get_scenario(number)
+        dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+        obstacle_func = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density']).bind(start, goal)
+
+        one_way = a_star_search_implicit(dims, start, goal, heuristic_manhattan, obstacle_func, args.node_limit)
+        two_way = bidirectional_a_star_search_implicit(dims, start, goal, heuristic_manhattan, obstacle_func, args.node_limit)
+        if one_way['path'] and two_way['score'] != one_way['score']:
+            raise AssertionError(f"bidirectional cost {two_way['score']} != A* cost {one_way['score']} on scenario {number}")
+
+        saved = one_way['nodes_explored'] - two_way['nodes_explored']
+        for result in (one_way, two_way):
+            rows.append([
+                number, result['algorithm'],
+                result['score'] if result['path'] else "N/A",
+                "Yes" if result['limit_reached'] else "No",
+                result['nodes_explored'],
+                f"{result['time']:.3f}",
+            ])
+        rows.append([number, "  saved", "", "",
+                     f"{'>=' if one_way['limit_reached'] else ''}{saved} ({saved / one_way['nodes_explored']:.0%})", ""])
+
+    print_table(["Scenario", "Algorithm", "Score", "Limit", "Nodes", "Time_s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Memory and speed of the compact A* search state against the Node-based A*.
+
+Each search runs twice: once for wall time, once under tracemalloc for its peak
+allocation. Both use the same warmed-up `ObstacleField`, so tile memory and
+obstacle hashing do not skew either side.
+
+    python -m benchmarks.bench_compact_astar --scenarios 4,8,10 --node-limit 300000
+"""
+import argparse
+import tracemalloc
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from compact_search import a_star_search_compact
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+SEARCHES = [
+    ("Node A*", a_star_search_implicit),
+    ("compact A*", a_star_search_compact),
+]
+
+
+def run_search(search_func, scenario, obstacle_func, node_limit):
+    return search_func(scenario['grid_dims'], scenario['start'], scenario['goal'],
+                       heuristic_manhattan, obstacle_func, node_limit)
+
+
+def peak_bytes(search_func, scenario, obstacle_func, node_limit):
+    tracemalloc.start()
+    try:
+        run_search(search_func, scenario, obstacle_func, node_limit)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="4,8,10", help="comma separated scenario numbers (default: 4,8,10)")
+    parser.add_argument("--node-limit", type=int, default=300_000,
+                        help="A* node limit (MAX_NODES_TO_EXPLORE_ASTAR is 5M; tracemalloc makes that take many minutes)")
+    args = parser.parse_args()
+
+    rows = []
+    for number in parse_scenario_numbers(args.scenarios):
+        scenario = get_scenario(number)
+        obstacle_func = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density']).bind(
+            scenario['start'], scenario['goal'])
+        run_search(a_star_search_compact, scenario, obstacle_func, args.node_limit) # warm the tile cache
+
+        baseline = None
+        for label, search_func in SEARCHES:
+            result = run_search(search_func, scenario, obstacle_func, args.node_limit)
+            peak = peak_bytes(search_func, scenario, obstacle_func, args.node_limit)
+            nodes = result['nodes_explored']
+            nodes_per_s = nodes / result['time'] if result['time'] > 0 else float('inf')
+            if baseline is None:
+                baseline = (result, nodes_per_s, peak)
+            rows.append([
+                number, label,
+                result['score'] if result['path'] else "N/A",
+                "Yes" if result['limit_reached'] else "No",
+                nodes,
+                f"{result['time']:.3f}",
+                f"{nodes_per_s:,.0f}",
+                f"{nodes_per_s / baseline[1]:.2f}x",
+                f"{peak / 2**20:.1f}",
+                f"{peak / max(nodes, 1):.0f}",
+                f"{baseline[2] / peak:.2f}x" if peak else "-",
+            ])
+            if result['score'] != baseline[0]['score'] or result['limit_reached'] != baseline[0]['limit_reached']:
+                raise AssertionError(f"{label} disagrees with Node A* on scenario {number}")
+
+    print_table(["Scenario", "Search", "Score", "Limit", "Nodes", "Time_s", "Nodes/s", "Speedup",
+                 "Peak_MiB", "Bytes/node", "Mem_saving"], rows)
+
+
+if __name__ == "__main__":
+    main()
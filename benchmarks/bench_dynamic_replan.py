@@ -0,0 +1,90 @@
+"""
+Replan latency after obstacle edits: D* Lite repair against a full A* rerun.
+
+For each edit batch size, a fresh overlay and planner make the first plan
+(untimed). Then --rounds times: toggle that many random cells within --radius
+of random cells on the current path (free cells get blocked, blocked ones
+cleared), and time `DStarLite.replan` against `a_star_search_implicit` on
+the same edited map. Edits pile up across rounds, as they would for a robot
+that keeps finding changes. Every repaired cost is checked against A*.
+
+    python -m benchmarks.bench_dynamic_replan --scenario 12 --edits 1 10 100 --rounds 5
+"""
+import argparse
+import random
+import statistics
+import time
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from dstar_lite import DStarLite
+from obstacle_field import get_obstacle_field
+from obstacle_overlay import ObstacleOverlay
+from benchmarks._common import get_scenario, print_table
+
+
+def edits_near_path(rng, path, count, radius, grid_dims, keep_open):
+    cells = set()
+    while len(cells) < count:
+        r, c = rng.choice(path)
+        cell = (min(max(r + rng.randint(-radius, radius), 0), grid_dims[0] - 1),
+                min(max(c + rng.randint(-radius, radius), 0), grid_dims[1] - 1))
+        if cell not in keep_open:
+            cells.add(cell)
+    return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", type=int, default=12)
+    parser.add_argument("--edits", type=int, nargs="+", default=[1, 10, 100], help="cells toggled per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--radius", type=int, default=3, help="edits land within this many rows/cols of the path")
+    parser.add_argument("--node-limit", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=12)
+    args = parser.parse_args()
+
+    scenario = get_scenario(args.scenario)
+    dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+    field = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density'])
+    rng = random.Random(args.seed)
+
+    rows = []
+    for count in args.edits:
+        overlay = ObstacleOverlay(field)
+        planner = DStarLite(dims, start, goal, heuristic_manhattan, overlay)
+        first = planner.replan(args.node_limit)
+        if not first['path']:
+            raise SystemExit(f"scenario {args.scenario} has no path within {args.node_limit} nodes")
+        path = first['path']
+        replan_times, a_star_times, replan_nodes, a_star_nodes = [], [], [], []
+        for _ in range(args.rounds):
+            cells = edits_near_path(rng, path, count, args.radius, dims, (start, goal))
+            overlay.block([cell for cell in cells if not overlay.is_blocked(cell)])
+            overlay.clear([cell for cell in cells if overlay.is_blocked(cell)])
+
+            repaired = planner.replan(args.node_limit)
+            started = time.perf_counter()
+            rerun = a_star_search_implicit(dims, start, goal, heuristic_manhattan, overlay.bind(start, goal), args.node_limit)
+            a_star_times.append(time.perf_counter() - started)
+            if repaired['score'] != rerun['score']:
+                raise AssertionError(f"D* Lite cost {repaired['score']} != A* cost {rerun['score']} after {count} edits")
+            replan_times.append(repaired['time'])
+            replan_nodes.append(repaired['nodes_explored'])
+            a_star_nodes.append(rerun['nodes_explored'])
+            if repaired['path']:
+                path = repaired['path']
+
+        replan_ms = statistics.median(replan_times) * 1000
+        a_star_ms = statistics.median(a_star_times) * 1000
+        rows.append([
+            count, f"{first['time'] * 1000:.1f}",
+            f"{replan_ms:.2f}", f"{a_star_ms:.2f}", f"{a_star_ms / replan_ms:.1f}x" if replan_ms else "-",
+            int(statistics.median(replan_nodes)), int(statistics.median(a_star_nodes)),
+        ])
+
+    print(f"{scenario['name']} ({args.rounds} rounds, medians)")
+    print_table(["Edits", "First_plan_ms", "Replan_ms", "A*_rerun_ms", "Speedup", "Replan_nodes", "A*_nodes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+A* on an exported grid file against the procedural map it came from.
+
+For each scenario the window around start and goal (grown by --margin) is
+exported once to a bit-packed grid file. A* then runs on:
+  procedural      the original pure-Python `is_obstacle_procedural`
+  field cold      a fresh `ObstacleField` (tiles hashed on demand)
+  field warm      the same field again, every tile cached
+  grid file       a freshly opened `GridFile` (mmap, nothing hashed)
+
+A window can only cut paths off, so a grid file cost above the procedural
+one means the margin is too small.
+
+    python -m benchmarks.bench_grid_file --scenarios 3,4,9,12 --margin 256
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from grid_file import GridFile, export_scenario_window
+from obstacle_field import ObstacleField
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table, procedural_obstacle_func
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=parse_scenario_numbers, default=[3, 4, 9, 12])
+    parser.add_argument("--margin", type=int, default=256)
+    parser.add_argument("--node-limit", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for number in args.scenarios:
+            scenario = get_scenario(number)
+            dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+            path = os.path.join(tmp_dir, f"scenario{number}.grid")
+            started = time.perf_counter()
+            export_scenario_window(path, scenario, args.margin)
+            export_time = time.perf_counter() - started
+
+            field = ObstacleField(scenario['scenario_seed'], scenario['obstacle_density'])
+            runs = [("procedural", dims, start, goal, lambda: procedural_obstacle_func(scenario)),
+                    ("field cold", dims, start, goal, lambda: field.bind(start, goal)),
+                    ("field warm", dims, start, goal, lambda: field.bind(start, goal))]
+            timings = {}
+            for name, run_dims, run_start, run_goal, make_func in runs:
+                result = a_star_search_implicit(run_dims, run_start, run_goal, heuristic_manhattan, make_func(), args.node_limit)
+                timings[name] = (result['time'], result['score'])
+
+            started = time.perf_counter()
+            grid = GridFile(path)
+            local_start, local_goal = grid.to_local(start), grid.to_local(goal)
+            result = a_star_search_implicit(grid.grid_dims, local_start, local_goal, heuristic_manhattan,
+                                            grid.bind(local_start, local_goal), args.node_limit)
+            timings["grid file"] = (time.perf_counter() - started, result['score'])
+            grid_dims = grid.grid_dims
+            grid.close()
+
+            for name, (seconds, score) in timings.items():
+                rows.append([number, name, f"{seconds:.3f}", score,
+                             f"{grid_dims[0]}x{grid_dims[1]}" if name == "grid file" else "",
+                             f"{os.path.getsize(path) / 1024:.0f} KiB, {export_time:.2f}s" if name == "grid file" else ""])
+
+    print_table(["Scenario", "Obstacles", "A*_time_s", "Score", "Window", "File, export"], rows)
+
+
+if __name__ == "__main__":
+    main()
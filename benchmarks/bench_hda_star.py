@@ -0,0 +1,64 @@
+"""
+HDA* speedup over serial A* for single long queries.
+
+For each scenario, runs `a_star_search_implicit` once, then
+`hda_star_search` with each worker count in --workers. Costs must match. All
+runs start from the same warm `ObstacleField`, and forked workers inherit
+its tile cache. Columns:
+  Speedup       A* wall time / HDA* wall time (process start-up included)
+  CPU_speedup   A* time / the busiest worker's CPU time, which is roughly the
+                wall-clock speedup when every worker has a core of its own.
+                On a machine with fewer cores than workers the processes
+                take turns, so wall time cannot improve there and only this
+                column shows how the work splits.
+  Overhead      expansions of all workers / A* expansions (re-expansions and
+                nodes a worker expanded before a better g arrived)
+
+    python -m benchmarks.bench_hda_star --scenarios 8,12 --workers 1,2,4,8
+"""
+import argparse
+import os
+
+from algorithm import MAX_NODES_TO_EXPLORE_ASTAR, a_star_search_implicit, heuristic_manhattan
+from hda_star import DEFAULT_BATCH_SIZE, DEFAULT_BLOCK_SIZE, hda_star_search
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=parse_scenario_numbers, default=[8, 12])
+    parser.add_argument("--workers", type=parse_scenario_numbers, default=[1, 2, 4, 8])
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--node-limit", type=int, default=MAX_NODES_TO_EXPLORE_ASTAR)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU(s) available")
+    for number in args.scenarios:
+        scenario = get_scenario(number)
+        dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+        seed, density = scenario['scenario_seed'], scenario['obstacle_density']
+        field = get_obstacle_field(seed, density)
+        a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal), args.node_limit) # warm-up
+        serial = a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal), args.node_limit)
+
+        rows = [["A*", f"{serial['time']:.2f}", "1.00", "1.00", serial['nodes_explored'], "1.00", "-", "-"]]
+        for n_workers in args.workers:
+            result = hda_star_search(dims, start, goal, seed, density, n_workers, args.node_limit,
+                                     args.block_size, args.batch_size)
+            if result['score'] != serial['score'] and not (result['limit_reached'] or serial['limit_reached']):
+                raise AssertionError(f"HDA* cost {result['score']} != A* cost {serial['score']} with {n_workers} workers")
+            busiest = max(result['worker_cpu_times'])
+            balance = max(result['worker_nodes']) * n_workers / max(1, result['nodes_explored'])
+            rows.append([
+                n_workers, f"{result['time']:.2f}", f"{serial['time'] / result['time']:.2f}",
+                f"{serial['time'] / busiest:.2f}", result['nodes_explored'],
+                f"{result['nodes_explored'] / max(1, serial['nodes_explored']):.2f}", result['messages'], f"{balance:.2f}",
+            ])
+        print(f"\n{scenario['name']} (cost {serial['score']}, block {args.block_size}, batch {args.batch_size})")
+        print_table(["Workers", "Time_s", "Speedup", "CPU_speedup", "Nodes", "Overhead", "Messages", "Max/mean_load"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+HPA* against plain A* on the large scenarios.
+
+Each scenario runs HPA* twice against the same cluster graph file: "cold"
+builds every cluster the query touches and appends it to the file, "warm"
+reopens the file (as a new process would) and only reads the memory-mapped
+records. A* runs once with the same node limit for comparison. Use
+--cache-dir to keep the files between runs; by default a temporary
+directory is used and removed.
+
+    python -m benchmarks.bench_hpa --scenarios 4,8,9,10,12 --node-limit 1000000
+"""
+import argparse
+import shutil
+import tempfile
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from hierarchical import DEFAULT_CLUSTER_SIZE, DEFAULT_MAX_TRANSITIONS, ClusterGraph, hpa_star_search
+from obstacle_field import get_obstacle_field
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="4,8,9,10,12", help="comma separated scenario numbers (default: 4,8,9,10,12)")
+    parser.add_argument("--node-limit", type=int, default=1_000_000)
+    parser.add_argument("--cluster-size", type=int, default=DEFAULT_CLUSTER_SIZE)
+    parser.add_argument("--max-transitions", type=int, default=DEFAULT_MAX_TRANSITIONS, help="per border, 0 keeps all")
+    parser.add_argument("--cache-dir", default=None, help="where cluster graph files go (default: a temporary directory)")
+    parser.add_argument("--skip-astar", action="store_true", help="only run HPA*")
+    args = parser.parse_args()
+
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix="hpa_bench_")
+    max_transitions = args.max_transitions or None
+    rows = []
+    try:
+        for number in parse_scenario_numbers(args.scenarios):
+            scenario = get_scenario(number)
+            dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+            seed, density = scenario['scenario_seed'], scenario['obstacle_density']
+            obstacle_func = get_obstacle_field(seed, density).bind(start, goal)
+
+            runs = []
+            if not args.skip_astar:
+                runs.append(("A*", a_star_search_implicit(dims, start, goal, heuristic_manhattan, obstacle_func, args.node_limit), ""))
+            for label in ("cold", "warm"):
+                graph = ClusterGraph(dims, seed, density, args.cluster_size, max_transitions, cache_dir=cache_dir)
+                result = hpa_star_search(graph, start, goal, heuristic_manhattan, obstacle_func, args.node_limit)
+                graph.close()
+                runs.append((f"HPA* {label}", result, f"{graph.clusters_built}/{graph.clusters_loaded}"))
+
+            for label, result, clusters in runs:
+                rows.append([
+                    number, label,
+                    result['score'] if result['path'] else "N/A",
+                    "Yes" if result['limit_reached'] else "No",
+                    result['nodes_explored'],
+                    clusters,
+                    f"{result['time']:.3f}",
+                ])
+    finally:
+        if args.cache_dir is None:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print_table(["Scenario", "Algorithm", "Score", "Limit", "Nodes", "Built/Loaded", "Time_s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Jump Point Search against A* and BSA over the `scenarios` list.
+
+Every algorithm uses the scenario's shared `ObstacleField`. Node counts are
+what each algorithm reports in `nodes_explored`: popped cells for A*, expanded
+jump points for JPS, and nodes expanded from the beam for BSA.
+
+    python -m benchmarks.bench_jps --node-limit 200000
+"""
+import argparse
+
+from algorithm import (scenarios, a_star_search_implicit, beam_search_astar_pruning_implicit,
+                       heuristic_manhattan)
+from jps import jump_point_search_implicit, DEFAULT_MAX_JUMP
+from obstacle_field import get_obstacle_field
+from benchmarks._common import parse_scenario_numbers, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(str(i + 1) for i in range(len(scenarios))),
+                        help="comma separated scenario numbers (default: all)")
+    parser.add_argument("--node-limit", type=int, default=200_000,
+                        help="node limit for every algorithm (the driver uses 5M, which takes minutes on 5 and 10)")
+    parser.add_argument("--max-jump", type=int, default=DEFAULT_MAX_JUMP)
+    args = parser.parse_args()
+
+    rows = []
+    for number in parse_scenario_numbers(args.scenarios):
+        scenario = scenarios[number - 1]
+        dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+        obstacle_func = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density']).bind(start, goal)
+        a_star_search_implicit(dims, start, goal, heuristic_manhattan, obstacle_func, args.node_limit) # warm the tiles
+
+        runs = [a_star_search_implicit(dims, start, goal, heuristic_manhattan, obstacle_func, args.node_limit),
+                jump_point_search_implicit(dims, start, goal, heuristic_manhattan, obstacle_func, args.node_limit,
+                                           max_jump=args.max_jump)]
+        runs += [beam_search_astar_pruning_implicit(dims, start, goal, heuristic_manhattan, obstacle_func,
+                                                    beam_width, args.node_limit)
+                 for beam_width in scenario['beam_widths_to_test']]
+        astar_time = runs[0]['time']
+        for result in runs:
+            rows.append([
+                number, f"{scenario['obstacle_density']:.2f}", result['algorithm'],
+                result['score'] if result['path'] else "N/A",
+                "Yes" if result['limit_reached'] else "No",
+                result['nodes_explored'],
+                f"{result['time']:.4f}",
+                f"{astar_time / result['time']:.2f}x" if result['time'] > 0 else "-",
+            ])
+        if runs[0]['path'] and runs[1]['score'] != runs[0]['score']:
+            raise AssertionError(f"JPS cost {runs[1]['score']} != A* cost {runs[0]['score']} on scenario {number}")
+
+    print_table(["Scenario", "Density", "Algorithm", "Score", "Limit", "Nodes", "Time_s", "vs A*"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Obstacle checks per second: `is_obstacle_procedural` vs the tile-cached `ObstacleField`.
+
+The exact sequence of positions that A* and every beam width query on a
+scenario is recorded once, then replayed through each obstacle callable, so all
+of them answer the same workload. "cold" starts from an empty tile cache and
+"warm" replays on the cache the cold pass left behind (what the driver sees for
+the beam runs after A* on the same map).
+
+    python -m benchmarks.bench_obstacle_field --scenarios 4,8
+"""
+import argparse
+import time
+
+from algorithm import (a_star_search_implicit, beam_search_astar_pruning_implicit, heuristic_manhattan,
+                       MAX_NODES_TO_EXPLORE_ASTAR, MAX_NODES_TO_EXPAND_BEAM)
+from obstacle_field import ObstacleField
+from benchmarks._common import get_scenario, procedural_obstacle_func, parse_scenario_numbers, print_table
+
+
+def record_queries(scenario, obstacle_func):
+    queried = []
+
+    def recording_obstacle_func(position):
+        queried.append(position)
+        return obstacle_func(position)
+
+    dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+    a_star_search_implicit(dims, start, goal, heuristic_manhattan, recording_obstacle_func, MAX_NODES_TO_EXPLORE_ASTAR)
+    for beam_width in scenario['beam_widths_to_test']:
+        beam_search_astar_pruning_implicit(dims, start, goal, heuristic_manhattan, recording_obstacle_func,
+                                           beam_width, MAX_NODES_TO_EXPAND_BEAM)
+    return queried
+
+
+def replay(obstacle_func, queried):
+    start_time = time.perf_counter()
+    blocked = [obstacle_func(position) for position in queried]
+    return time.perf_counter() - start_time, blocked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="4,8", help="comma separated scenario numbers (default: 4,8)")
+    parser.add_argument("--tile-size", type=int, default=256)
+    parser.add_argument("--max-tiles", type=int, default=1024)
+    args = parser.parse_args()
+
+    rows = []
+    for number in parse_scenario_numbers(args.scenarios):
+        scenario = get_scenario(number)
+        procedural = procedural_obstacle_func(scenario)
+        queried = record_queries(scenario, procedural)
+
+        field = ObstacleField(scenario['scenario_seed'], scenario['obstacle_density'], args.tile_size, args.max_tiles)
+        bound = field.bind(scenario['start'], scenario['goal'])
+
+        base_time, expected = replay(procedural, queried)
+        cold_time, cold_blocked = replay(bound, queried)
+        warm_time, warm_blocked = replay(bound, queried)
+        if cold_blocked != expected or warm_blocked != expected:
+            raise AssertionError(f"ObstacleField disagrees with is_obstacle_procedural on scenario {number}")
+
+        stats = field.cache_stats()
+        for label, elapsed in (("procedural", base_time), ("field (cold)", cold_time), ("field (warm)", warm_time)):
+            rows.append([
+                number, label, len(queried), f"{elapsed:.3f}",
+                f"{len(queried) / elapsed:,.0f}", f"{base_time / elapsed:.2f}x",
+                stats['misses'] if label != "procedural" else "-",
+            ])
+
+    print_table(["Scenario", "Obstacle func", "Checks", "Time_s", "Checks/s", "Speedup", "Tiles computed"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-node time of the A* open sets: the Node heap in `a_star_search_implicit`
+against the compact A* with `HeapOpenSet` and with `BucketOpenSet`.
+
+All runs share one warmed-up `ObstacleField` per scenario, and the path costs
+must match exactly.
+
+    python -m benchmarks.bench_open_sets --scenarios 4,8,9,10 --node-limit 500000
+"""
+import argparse
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from compact_search import a_star_search_compact
+from obstacle_field import get_obstacle_field
+from open_sets import HeapOpenSet, BucketOpenSet
+from benchmarks._common import get_scenario, parse_scenario_numbers, print_table
+
+VARIANTS = [
+    ("Node heap", lambda *args: a_star_search_implicit(*args)),
+    ("compact + heap", lambda *args: a_star_search_compact(*args, open_set_factory=HeapOpenSet)),
+    ("compact + bucket", lambda *args: a_star_search_compact(*args, open_set_factory=BucketOpenSet)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="4,8,9,10", help="comma separated scenario numbers (default: 4,8,9,10)")
+    parser.add_argument("--node-limit", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=3, help="best-of-N timing per variant")
+    args = parser.parse_args()
+
+    rows = []
+    for number in parse_scenario_numbers(args.scenarios):
+        scenario = get_scenario(number)
+        obstacle_func = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density']).bind(
+            scenario['start'], scenario['goal'])
+        search_args = (scenario['grid_dims'], scenario['start'], scenario['goal'],
+                       heuristic_manhattan, obstacle_func, args.node_limit)
+        a_star_search_compact(*search_args) # warm the tile cache
+
+        baseline_us = None
+        baseline_score = None
+        for label, run in VARIANTS:
+            results = [run(*search_args) for _ in range(args.repeats)]
+            best = min(results, key=lambda result: result['time'])
+            per_node_us = best['time'] / max(best['nodes_explored'], 1) * 1e6
+            if baseline_us is None:
+                baseline_us = per_node_us
+                baseline_score = best['score']
+            elif best['score'] != baseline_score:
+                raise AssertionError(f"{label} path cost {best['score']} != {baseline_score} on scenario {number}")
+            rows.append([
+                number, label,
+                best['score'] if best['path'] else "N/A",
+                "Yes" if best['limit_reached'] else "No",
+                best['nodes_explored'],
+                f"{best['time']:.3f}",
+                f"{per_node_us:.2f}",
+                f"{baseline_us / per_node_us:.2f}x",
+            ])
+
+    print_table(["Scenario", "Open set", "Score", "Limit", "Nodes", "Time_s", "us/node", "Speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Repeated-route traffic through `PathCache` against plain A*.
+
+Traffic runs between --stops random cells in the window around a scenario's
+start and goal. Pairs are drawn with Zipf weights (a few popular routes, a
+long tail). --along-route of the queries instead go between two cells of a
+route served earlier, like pickups along a known line. Three passes over the
+same query list:
+  no cache     A* every time
+  cold cache   an empty PathCache with a disk store in a temporary directory
+  disk only    a fresh PathCache on that directory (a restarted process)
+
+Every answer marked optimal is checked against A*.
+
+    python -m benchmarks.bench_path_cache --scenario 12 --queries 300 --stops 30
+"""
+import argparse
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from grid_file import scenario_window
+from obstacle_field import get_obstacle_field
+from path_cache import PathCache, cached_search, scenario_map_key
+from benchmarks._common import get_scenario, print_table
+
+
+def make_queries(rng, stops, n_queries, along_route, zipf, served_paths):
+    pairs = [(a, b) for a in stops for b in stops if a != b]
+    rng.shuffle(pairs)
+    weights = [1 / (rank + 1) ** zipf for rank in range(len(pairs))]
+    for _ in range(n_queries):
+        if served_paths and rng.random() < along_route:
+            path = rng.choice(served_paths)
+            i, j = sorted(rng.sample(range(len(path)), 2))
+            yield (path[i], path[j]) if rng.random() < 0.5 else (path[j], path[i])
+        else:
+            yield rng.choices(pairs, weights)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", type=int, default=12)
+    parser.add_argument("--margin", type=int, default=128)
+    parser.add_argument("--stops", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--along-route", type=float, default=0.2)
+    parser.add_argument("--zipf", type=float, default=1.0)
+    parser.add_argument("--node-limit", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=15)
+    args = parser.parse_args()
+
+    scenario = get_scenario(args.scenario)
+    dims = scenario['grid_dims']
+    key = scenario_map_key(scenario)
+    field = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density'])
+    (r0, c0), (rows, cols) = scenario_window(scenario, args.margin)
+    rng = random.Random(args.seed)
+    stops = []
+    while len(stops) < args.stops:
+        cell = (r0 + rng.randrange(rows), c0 + rng.randrange(cols))
+        if not field.is_obstacle(cell):
+            stops.append(cell)
+
+    # The query list is fixed up front (along-route picks use the plain A* answers), so all passes see the same traffic
+    queries, expected, served_paths = [], {}, []
+    for start, goal in make_queries(rng, stops, args.queries, args.along_route, args.zipf, served_paths):
+        queries.append((start, goal))
+        if (start, goal) not in expected:
+            result = a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal), args.node_limit)
+            expected[(start, goal)] = result
+            if len(result['path']) > 2:
+                served_paths.append(result['path'])
+
+    def search(start, goal):
+        return lambda: a_star_search_implicit(dims, start, goal, heuristic_manhattan, field.bind(start, goal), args.node_limit)
+
+    rows_out = []
+    latencies = []
+    started = time.perf_counter()
+    for start, goal in queries:
+        query_started = time.perf_counter()
+        search(start, goal)()
+        latencies.append(time.perf_counter() - query_started)
+    rows_out.append(["no cache", f"{time.perf_counter() - started:.2f}", *_latency_columns(latencies), "-", "-", "-", "-"])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name in ("cold cache", "disk only"):
+            cache = PathCache(cache_dir=cache_dir)
+            latencies = []
+            started = time.perf_counter()
+            for start, goal in queries:
+                query_started = time.perf_counter()
+                result = cached_search(cache, key, start, goal, search(start, goal))
+                latencies.append(time.perf_counter() - query_started)
+                reference = expected.get((start, goal)) or expected.get((goal, start))
+                if result['optimal'] and reference is not None and reference['path'] and result['score'] != reference['score']:
+                    raise AssertionError(f"cached cost {result['score']} != A* cost {reference['score']} for {start} -> {goal}")
+            total = time.perf_counter() - started
+            stats = cache.stats()
+            cache.close()
+            rows_out.append([name, f"{total:.2f}", *_latency_columns(latencies), f"{stats['hit_rate']:.0%}",
+                             stats['memory_hits'], stats['subpath_hits'], stats['disk_hits']])
+
+    print(f"{scenario['name']}: {len(queries)} queries, {len(expected)} distinct, {args.stops} stops")
+    print_table(["Pass", "Total_s", "p50_ms", "p95_ms", "Hit_rate", "Memory", "Subpath", "Disk"], rows_out)
+
+
+def _latency_columns(latencies):
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    return [f"{p50:.2f}", f"{p95:.2f}"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Load generator for `query_server`: replays `algorithm.scenarios` at a fixed rate.
+
+Requests go out open-loop at --qps (one every 1/qps seconds, whether or not
+earlier ones have been answered), cycling through --scenarios for
+--duration seconds, each with --deadline. Paths are not sent back. With
+--spawn-server a server is started on a free port for the run (with
+--workers processes and no cache unless --cache); otherwise the client
+connects to --port or --unix. Prints per-scenario latency and status counts
+as seen by the client, then the server's own stats.
+
+    python -m benchmarks.bench_query_server --spawn-server --workers 2 --qps 4 --duration 30 --deadline 1.0
+    python -m benchmarks.bench_query_server --port 8765 --scenarios 1,2,3,4,11,12 --qps 20
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from query_server import DEFAULT_PORT, QueryClient
+from benchmarks._common import parse_scenario_numbers, print_table
+
+STATUSES = ("ok", "fallback", "limit", "timeout", "error")
+
+
+async def run_load(client, numbers, qps, duration, deadline, algorithm, beam_width, use_cache):
+    """Send the requests on schedule; returns [(scenario number, client latency, response)]."""
+    records = []
+
+    async def one(number):
+        started = time.perf_counter()
+        response = await client.query(scenario=number, algorithm=algorithm, beam_width=beam_width,
+                                      deadline=deadline, return_path=False, use_cache=use_cache)
+        records.append((number, time.perf_counter() - started, response))
+
+    tasks = []
+    begin = time.perf_counter()
+    for i in range(int(qps * duration)):
+        delay = begin + i / qps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(numbers[i % len(numbers)])))
+    await asyncio.gather(*tasks)
+    return records
+
+
+async def connect(args):
+    # a spawned server needs a moment to bind
+    for _ in range(100):
+        try:
+            return await QueryClient.connect(port=args.port, unix_path=args.unix)
+        except OSError:
+            await asyncio.sleep(0.1)
+    return await QueryClient.connect(port=args.port, unix_path=args.unix)
+
+
+async def run(args):
+    client = await connect(args)
+    try:
+        records = await run_load(client, args.scenarios, args.qps, args.duration, args.deadline,
+                                 args.algorithm, args.beam_width, not args.no_cache)
+        stats = await client.stats()
+    finally:
+        await client.close()
+    return records, stats
+
+
+def _ms(values):
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+    return [f"{p50:.1f}", f"{p95:.1f}", f"{p99:.1f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="connect to this Unix socket instead of TCP")
+    parser.add_argument("--scenarios", type=parse_scenario_numbers, default=[1, 2, 3, 4, 6, 7, 9, 11, 12])
+    parser.add_argument("--qps", type=float, default=4.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    parser.add_argument("--deadline", type=float, default=1.0, help="seconds per request; 0 = none")
+    parser.add_argument("--algorithm", choices=("astar", "beam"), default="astar")
+    parser.add_argument("--beam-width", type=int, default=8)
+    parser.add_argument("--no-cache", action="store_true", help="ask the server not to answer from its cache")
+    parser.add_argument("--spawn-server", action="store_true")
+    parser.add_argument("--workers", type=int, default=2, help="with --spawn-server")
+    parser.add_argument("--cache", action="store_true", help="with --spawn-server, give it a path cache")
+    args = parser.parse_args()
+    if args.qps <= 0:
+        parser.error("--qps must be positive")
+    args.deadline = args.deadline or None
+
+    server = None
+    if args.spawn_server:
+        if args.unix is None:
+            with socket.socket() as probe:
+                probe.bind(("127.0.0.1", 0))
+                args.port = probe.getsockname()[1]
+        command = [sys.executable, "-m", "query_server", "--workers", str(args.workers)]
+        command += ["--unix", args.unix] if args.unix is not None else ["--port", str(args.port)]
+        command += [] if args.cache else ["--no-cache"]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        records, stats = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    rows = []
+    for number in args.scenarios:
+        mine = [record for record in records if record[0] == number]
+        if not mine:
+            continue
+        counts = Counter(response['status'] for _, _, response in mine)
+        rows.append([number, len(mine), *_ms([latency for _, latency, _ in mine]),
+                     *(counts[status] for status in STATUSES), sum(response['coalesced'] for _, _, response in mine)])
+    latencies = [latency for _, latency, _ in records]
+    counts = Counter(response['status'] for _, _, response in records)
+    rows.append(["all", len(records), *_ms(latencies), *(counts[status] for status in STATUSES),
+                 sum(response['coalesced'] for _, _, response in records)])
+
+    deadline = f"{args.deadline} s deadline" if args.deadline is not None else "no deadline"
+    print(f"{len(records)} {args.algorithm} requests at {args.qps} QPS over {args.duration} s, {deadline} (client-side latency)")
+    print_table(["Scenario", "Requests", "p50_ms", "p95_ms", "p99_ms", *(s.capitalize() for s in STATUSES), "Coalesced"], rows)
+    print(f"\nServer: {stats['workers']} workers, max queue depth {stats['max_queue_depth']}, "
+          f"{stats['coalesced']} coalesced, {stats['cache_hits']} cache hits")
+    print_table(["Server_ms", "p50", "p95", "p99", "mean"],
+                [[name, *(f"{stats[name][p] * 1000:.1f}" for p in ("p50", "p95", "p99", "mean"))]
+                 for name in ("latency", "queue_wait", "search_time")])
+
+
+if __name__ == "__main__":
+    main()
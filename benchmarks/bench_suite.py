@@ -0,0 +1,418 @@
+"""
+Statistical benchmark suite: repeated timings, baselines and regression checks.
+
+`run` times every case with --warmup untimed runs, then --repeats timed
+ones. It records the median and p95 of the search time, nodes/second, the
+path cost, and peak traced memory from one extra run under tracemalloc. The
+results go to a JSON file together with the machine, Python and git commit
+they came from. There are two kinds of cases:
+  scenario  every scenario in `algorithm.scenarios`: A* and BSA at each of its
+            `beam_widths_to_test`
+  random    fixed-seed generated queries, sweeping one parameter at a time
+            around 20% density and 300 cells of distance: density
+            (0-0.35), distance (50-800) and grid size (64-2048 square,
+            corner to corner). A* and BSA at --random-widths.
+Every search uses --node-limit (lower than the 5M of `run_experiments.py`
+so that the dense and huge scenarios take seconds, not minutes), and all
+runs of a case share one warm `ObstacleField`.
+
+Before its timed runs, each case also times `calibration_workload`, a fixed
+heap-and-dict loop that uses no repo code. On shared or throttled machines
+the whole machine drifts by 10-30% between runs minutes apart, and a
+significance test on raw times reports that drift as a regression. So
+`compare` divides each case's times by its calibration first (--raw turns
+that off).
+
+`compare BASELINE CURRENT` matches the cases of two result files. A
+slowdown is flagged when the current times are significantly slower by a
+two-sided Mann-Whitney U test (p < --alpha) and the median grew by more
+than --threshold. `run` needs at least 5 --repeats, the fewest for which
+the exact test can reach the default alpha of 0.01, and `compare` warns
+when two files' repeats cannot reach --alpha. Speedups are reported the same way. Any change in path
+cost or in whether a path was found is flagged as well, because the
+searches are deterministic. So is a peak-memory growth above
+--memory-threshold. The exit status is 1 when anything regressed, for use
+in CI.
+
+    python -m benchmarks.bench_suite run --out baseline.json
+    python -m benchmarks.bench_suite run --out current.json --filter scenario
+    python -m benchmarks.bench_suite compare baseline.json current.json
+"""
+import argparse
+import functools
+import gc
+import heapq
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithm import HUGE_DIM, a_star_search_implicit, beam_search_astar_pruning_implicit, heuristic_manhattan, scenarios
+from obstacle_field import get_obstacle_field
+from stats import percentiles
+from benchmarks._common import parse_scenario_numbers, print_table
+
+FORMAT_VERSION = 1
+MIN_REPEATS = 5 # fewer timed runs per side cannot reach p < 0.01 (smallest two-sided p at n=4: 2/70)
+
+# Random sweeps: one parameter varies, the others stay at these values
+BASE_DENSITY = 0.2
+BASE_DISTANCE = 300
+DENSITIES = (0.0, 0.1, 0.2, 0.3, 0.35)
+DISTANCES = (50, 100, 200, 400, 800)
+GRID_SIZES = (64, 256, 1024, 2048)
+CALIBRATION_ROUNDS = 5
+
+
+# --- Cases ---
+def scenario_cases():
+    cases = []
+    for index, scenario in enumerate(scenarios):
+        query = {
+            "kind": "scenario", "grid_dims": list(scenario['grid_dims']),
+            "start": list(scenario['start']), "goal": list(scenario['goal']),
+            "scenario_seed": scenario['scenario_seed'], "obstacle_density": scenario['obstacle_density'],
+        }
+        for width in [None] + scenario['beam_widths_to_test']:
+            cases.append(dict(query, id=_case_id(f"scenario-{index + 1:02d}", width), beam_width=width))
+    return cases
+
+
+def random_cases(widths, seed=0):
+    """Fixed-seed queries for the density, distance and grid-size sweeps."""
+    queries = []
+    for density in DENSITIES:
+        queries.append((f"density-{density:.2f}", HUGE_DIM, density, BASE_DISTANCE))
+    for distance in DISTANCES:
+        queries.append((f"distance-{distance:04d}", HUGE_DIM, BASE_DENSITY, distance))
+    for size in GRID_SIZES:
+        queries.append((f"grid-{size:04d}", size, BASE_DENSITY, None))
+
+    cases = []
+    for name, size, density, distance in queries:
+        rng = random.Random(f"{name}-{seed}")
+        if distance is None: # corner to corner of a small grid
+            start, goal = (size // 16, size // 16), (size - 1 - size // 16, size - 1 - size // 16)
+        else:
+            start = (rng.randrange(1_000, 50_000), rng.randrange(1_000, 50_000))
+            dr = rng.randint(0, distance)
+            goal = (start[0] + rng.choice((-1, 1)) * dr, start[1] + rng.choice((-1, 1)) * (distance - dr))
+        query = {
+            "kind": "random", "grid_dims": [size, size], "start": list(start), "goal": list(goal),
+            "scenario_seed": rng.randrange(1_000_000), "obstacle_density": density,
+        }
+        for width in [None] + list(widths):
+            cases.append(dict(query, id=_case_id(name, width), beam_width=width))
+    return cases
+
+
+def _case_id(name, beam_width):
+    return f"{name}/A*" if beam_width is None else f"{name}/BSA-W{beam_width:02d}"
+
+
+# --- Measuring ---
+def calibration_workload():
+    """Fixed interpreter-bound work (heap and dict operations, like a search) that uses no repo code."""
+    heap, seen = [], {}
+    state = 12345
+    for i in range(20_000):
+        state = (state * 1103515245 + 12345) & 0x7FFFFFFF
+        key = (state & 1023, state >> 20)
+        if key not in seen:
+            seen[key] = i
+            heapq.heappush(heap, (state & 0xFFFF, i, key))
+        if len(heap) > 512:
+            heapq.heappop(heap)
+    return len(seen)
+
+
+def calibrate(rounds=CALIBRATION_ROUNDS):
+    """Median seconds of `calibration_workload`: this machine's speed right now."""
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        calibration_workload()
+        times.append(time.perf_counter() - started)
+    return float(np.median(times))
+
+
+def _search(case, node_limit):
+    dims, start, goal = tuple(case['grid_dims']), tuple(case['start']), tuple(case['goal'])
+    is_obstacle_func = get_obstacle_field(case['scenario_seed'], case['obstacle_density']).bind(start, goal)
+    if case['beam_width'] is None:
+        return functools.partial(a_star_search_implicit, dims, start, goal, heuristic_manhattan, is_obstacle_func,
+                                 node_limit)
+    return functools.partial(beam_search_astar_pruning_implicit, dims, start, goal, heuristic_manhattan,
+                             is_obstacle_func, case['beam_width'], node_limit)
+
+
+def measure(case, node_limit, warmup, repeats, memory=True):
+    """Run one case; returns its record for the results file."""
+    search = _search(case, node_limit)
+    for _ in range(warmup):
+        search()
+    calibration = calibrate()
+    times = []
+    outcomes = set()
+    for _ in range(repeats):
+        gc.collect()
+        result = search()
+        times.append(result['time'])
+        outcomes.add((result['score'], result['nodes_explored'], result['limit_reached']))
+    if len(outcomes) > 1:
+        raise AssertionError(f"{case['id']}: results differ between repeats: {sorted(outcomes)}")
+
+    peak_kib = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            search()
+            peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    summary = percentiles(times)
+    median = summary['p50']
+    return dict(case, **{
+        "algorithm": result['algorithm'],
+        "times": times,
+        "calibration": calibration,
+        "median": median,
+        "p95": summary['p95'],
+        "nodes": result['nodes_explored'],
+        "nodes_per_s": result['nodes_explored'] / median if median > 0 else None,
+        "peak_kib": peak_kib,
+        "found": bool(result['path']),
+        "cost": result['score'] if result['path'] else None,
+        "limit_reached": result['limit_reached'],
+    })
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# --- Statistics ---
+@functools.lru_cache(maxsize=None)
+def _u_counts(n1, n2):
+    """Number of orderings of n1 + n2 distinct values for each value of U (exact null distribution)."""
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    # Either the largest value is from sample 1 (it beats all n2 values) or from sample 2 (it adds nothing)
+    counts = [0] * (n1 * n2 + 1)
+    for u, ways in enumerate(_u_counts(n1 - 1, n2)):
+        counts[u + n2] += ways
+    for u, ways in enumerate(_u_counts(n1, n2 - 1)):
+        counts[u] += ways
+    return tuple(counts)
+
+
+def mann_whitney_u(a, b):
+    """
+    Two-sided Mann-Whitney U test of samples `a` and `b`; returns (U of a, p).
+    The p-value is exact for small samples without ties and uses the normal
+    approximation (with tie correction) otherwise.
+    """
+    n1, n2 = len(a), len(b)
+    values = np.concatenate([np.asarray(a, dtype=float), np.asarray(b, dtype=float)])
+    order = values.argsort(kind="stable")
+    ranks = np.empty(len(values))
+    sorted_values = values[order]
+    i = 0
+    while i < len(values): # average ranks over ties
+        j = i
+        while j + 1 < len(values) and sorted_values[j + 1] == sorted_values[i]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2 + 1
+        i = j + 1
+    u1 = float(ranks[:n1].sum() - n1 * (n1 + 1) / 2)
+    tied = len(np.unique(values)) < len(values)
+
+    if not tied and n1 * n2 <= 400:
+        counts = _u_counts(n1, n2)
+        total = math.comb(n1 + n2, n1)
+        low = min(u1, n1 * n2 - u1)
+        p = 2 * sum(counts[:int(low) + 1]) / total
+        return u1, min(1.0, p)
+
+    _, tie_sizes = np.unique(values, return_counts=True)
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - float((tie_sizes ** 3 - tie_sizes).sum()) / (n * (n - 1)))
+    if variance <= 0:
+        return u1, 1.0
+    z = (abs(u1 - n1 * n2 / 2) - 0.5) / math.sqrt(variance) # continuity correction
+    return u1, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def compare_case(base, current, alpha, threshold, memory_threshold, calibrated=True):
+    """Verdicts for one case present in both files; returns (row, regressed)."""
+    base_times, current_times = np.asarray(base['times']), np.asarray(current['times'])
+    if calibrated:
+        base_times = base_times / base['calibration']
+        current_times = current_times / current['calibration']
+    base_median, current_median = float(np.median(base_times)), float(np.median(current_times))
+    ratio = current_median / base_median if base_median > 0 else float('inf')
+    _, p = mann_whitney_u(current_times, base_times)
+    verdicts = []
+    regressed = False
+    if p < alpha and ratio > 1 + threshold:
+        verdicts.append("SLOWER")
+        regressed = True
+    elif p < alpha and ratio < 1 - threshold:
+        verdicts.append("faster")
+    if (base['found'], base['cost']) != (current['found'], current['cost']):
+        verdicts.append(f"COST {base['cost']}->{current['cost']}")
+        regressed = True
+    elif base['nodes'] != current['nodes']:
+        verdicts.append(f"nodes {base['nodes']}->{current['nodes']}")
+    if base.get('peak_kib') and current.get('peak_kib') and current['peak_kib'] > base['peak_kib'] * (1 + memory_threshold):
+        verdicts.append(f"MEMORY +{100 * (current['peak_kib'] / base['peak_kib'] - 1):.0f}%")
+        regressed = True
+    row = [base['id'], f"{1000 * base['median']:.2f}", f"{1000 * current['median']:.2f}",
+           f"{current['median'] / base['median']:.2f}" if base['median'] > 0 else "inf", f"{ratio:.2f}", f"{p:.3f}", ", ".join(verdicts) or "same"]
+    return row, regressed
+
+
+# --- Commands ---
+def command_run(args):
+    cases = []
+    if not args.no_scenarios:
+        cases += scenario_cases()
+    if not args.no_random:
+        cases += random_cases(args.random_widths, args.seed)
+    if args.filter:
+        cases = [case for case in cases if any(part in case['id'] for part in args.filter.split(","))]
+    if args.scenarios:
+        keep = {f"scenario-{number:02d}/" for number in args.scenarios}
+        cases = [case for case in cases if case['kind'] != "scenario" or case['id'][:12] in keep]
+
+    records = {}
+    rows = []
+    started = time.perf_counter()
+    for number, case in enumerate(cases, 1):
+        record = measure(case, args.node_limit, args.warmup, args.repeats, not args.no_memory)
+        records[case['id']] = record
+        rows.append(_summary_row(record))
+        print(f"[{number}/{len(cases)}] {case['id']}: median {1000 * record['median']:.2f} ms, "
+              f"p95 {1000 * record['p95']:.2f} ms", file=sys.stderr)
+
+    results = {
+        "format": FORMAT_VERSION,
+        "environment": environment(),
+        "settings": {"node_limit": args.node_limit, "warmup": args.warmup, "repeats": args.repeats, "seed": args.seed},
+        "cases": records,
+    }
+    with open(args.out, "w") as results_file:
+        json.dump(results, results_file, indent=1)
+    print_table(["Case", "Median_ms", "p95_ms", "Nodes", "Nodes_per_s", "Peak_KiB", "Cost"], rows)
+    print(f"\n{len(cases)} cases in {time.perf_counter() - started:.1f} s, written to {args.out}")
+
+
+def _summary_row(record):
+    nodes_per_s = f"{record['nodes_per_s']:.0f}" if record['nodes_per_s'] else "-"
+    peak = f"{record['peak_kib']:.0f}" if record['peak_kib'] is not None else "-"
+    cost = record['cost'] if record['found'] else ("limit" if record['limit_reached'] else "-")
+    return [record['id'], f"{1000 * record['median']:.2f}", f"{1000 * record['p95']:.2f}", record['nodes'],
+            nodes_per_s, peak, cost]
+
+
+def command_compare(args):
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current) as current_file:
+        current = json.load(current_file)
+    for key in ("node_limit",):
+        if baseline['settings'][key] != current['settings'][key]:
+            print(f"warning: {key} differs ({baseline['settings'][key]} vs {current['settings'][key]}); "
+                  f"costs and times are not comparable")
+    for key in ("platform", "python", "cpu_count"):
+        if baseline['environment'].get(key) != current['environment'].get(key):
+            print(f"note: {key} differs ({baseline['environment'].get(key)} vs {current['environment'].get(key)})")
+    n1, n2 = baseline['settings']['repeats'], current['settings']['repeats']
+    if 2 / math.comb(n1 + n2, n1) >= args.alpha:
+        print(f"warning: with {n1} and {n2} repeats no p-value can fall below alpha {args.alpha}; "
+              f"timing changes cannot be flagged")
+
+    rows, regressions = [], 0
+    shared = [case_id for case_id in baseline['cases'] if case_id in current['cases']]
+    for case_id in shared:
+        row, regressed = compare_case(baseline['cases'][case_id], current['cases'][case_id],
+                                      args.alpha, args.threshold, args.memory_threshold, not args.raw)
+        regressions += regressed
+        if args.all or row[-1] != "same":
+            rows.append(row)
+    only_base = sorted(set(baseline['cases']) - set(current['cases']))
+    only_current = sorted(set(current['cases']) - set(baseline['cases']))
+
+    print(f"Baseline {args.baseline} ({baseline['environment'].get('commit')}) vs "
+          f"current {args.current} ({current['environment'].get('commit')}): {len(shared)} shared cases, "
+          f"alpha {args.alpha}, threshold {100 * args.threshold:.0f}%, "
+          f"{'raw times' if args.raw else 'times relative to each case calibration'}")
+    if rows:
+        print_table(["Case", "Base_ms", "Current_ms", "Raw_ratio", "Ratio", "p", "Verdict"], rows)
+    else:
+        print("No significant changes.")
+    if only_base or only_current:
+        print(f"Only in baseline: {len(only_base)}, only in current: {len(only_current)}")
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time the cases and write a results file")
+    run.add_argument("--out", default="bench_results.json")
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--repeats", type=int, default=7)
+    run.add_argument("--node-limit", type=int, default=200_000)
+    run.add_argument("--scenarios", type=parse_scenario_numbers, default=None, help="only these scenario numbers")
+    run.add_argument("--filter", default=None, help="comma separated substrings; keep cases whose id contains one")
+    run.add_argument("--random-widths", type=parse_scenario_numbers, default=[8])
+    run.add_argument("--seed", type=int, default=0, help="seed of the random cases")
+    run.add_argument("--no-scenarios", action="store_true")
+    run.add_argument("--no-random", action="store_true")
+    run.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+
+    compare = commands.add_parser("compare", help="flag regressions between two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--alpha", type=float, default=0.01)
+    compare.add_argument("--threshold", type=float, default=0.05, help="smallest median change worth flagging")
+    compare.add_argument("--memory-threshold", type=float, default=0.10)
+    compare.add_argument("--raw", action="store_true", help="compare raw times, without the calibration")
+    compare.add_argument("--all", action="store_true", help="list unchanged cases too")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        if args.repeats < MIN_REPEATS:
+            parser.error(f"--repeats must be at least {MIN_REPEATS}")
+        command_run(args)
+    else:
+        sys.exit(command_compare(args))
+
+
+if __name__ == "__main__":
+    main()
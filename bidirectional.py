@@ -0,0 +1,119 @@
+"""
+Bidirectional A* for long-haul queries.
+
+One A* grows from `start_pos` towards the goal, another from `goal_pos` towards
+the start (moves are reversible on the 4-connected grid, so both share the
+same `is_obstacle_func`). Each step expands the side with the smaller open set.
+Whenever a relaxed cell is already labelled by the other side, the two
+half-paths form a candidate path and the best cost so far, mu, is kept.
+
+Termination: every path that has not been found yet has to leave through both
+open sets, so its cost is at least the smallest f on either side. Once
+mu <= max(min f forward, min f backward) no cheaper path can exist, and the
+answer is optimal for any consistent heuristic (like `heuristic_manhattan`).
+
+`nodes_explored` counts pops on both sides together, and
+`max_nodes_explored_limit` caps that total, so it compares directly with
+`a_star_search_implicit`.
+"""
+import heapq
+import time
+
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class _Frontier:
+    """Open set, g values, parents and closed set for one search direction."""
+
+    def __init__(self, root, target, heuristic_func):
+        self.target = target
+        self.heuristic_func = heuristic_func
+        root_h = heuristic_func(root, target)
+        self.open_set = [(root_h, root_h, root)]
+        self.g_costs = {root: 0}
+        self.parents = {root: None}
+        self.closed_set = set()
+
+    def min_f(self):
+        return self.open_set[0][0] if self.open_set else float('inf')
+
+    def path_to(self, position):
+        """Cells from this frontier's root to `position`, root first."""
+        path = []
+        current = position
+        while current is not None:
+            path.append(current)
+            current = self.parents[current]
+        return path[::-1]
+
+
+def bidirectional_a_star_search_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit):
+    start_time = time.perf_counter()
+
+    forward = _Frontier(start_pos, goal_pos, heuristic_func)
+    backward = _Frontier(goal_pos, start_pos, heuristic_func)
+    best_cost = 0 if start_pos == goal_pos else float('inf')
+    meeting_pos = start_pos if start_pos == goal_pos else None
+    nodes_explored_count = 0
+    limit_reached = False
+
+    while forward.open_set and backward.open_set:
+        if best_cost <= max(forward.min_f(), backward.min_f()):
+            break
+        if nodes_explored_count >= max_nodes_explored_limit:
+            limit_reached = True
+            break
+
+        # Cardinality rule: grow the smaller frontier
+        if len(forward.open_set) <= len(backward.open_set):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+
+        _, _, position = heapq.heappop(side.open_set)
+        nodes_explored_count += 1
+        if position in side.closed_set:
+            continue # superseded duplicate
+        side.closed_set.add(position)
+
+        tentative_g_score = side.g_costs[position] + 1
+        for dr, dc in DIRECTIONS:
+            neighbor_pos = (position[0] + dr, position[1] + dc)
+            if not (0 <= neighbor_pos[0] < grid_dims[0] and 0 <= neighbor_pos[1] < grid_dims[1]):
+                continue
+            if neighbor_pos in side.closed_set:
+                continue
+            if tentative_g_score >= side.g_costs.get(neighbor_pos, float('inf')):
+                continue
+            if is_obstacle_func(neighbor_pos):
+                continue
+
+            side.g_costs[neighbor_pos] = tentative_g_score
+            side.parents[neighbor_pos] = position
+            h_score = side.heuristic_func(neighbor_pos, side.target)
+            heapq.heappush(side.open_set, (tentative_g_score + h_score, h_score, neighbor_pos))
+
+            other_g = other.g_costs.get(neighbor_pos)
+            if other_g is not None and tentative_g_score + other_g < best_cost:
+                best_cost = tentative_g_score + other_g
+                meeting_pos = neighbor_pos
+
+    end_time = time.perf_counter()
+    if meeting_pos is not None and not limit_reached:
+        path = forward.path_to(meeting_pos) + backward.path_to(meeting_pos)[::-1][1:]
+        return {
+            "path": path,
+            "score": best_cost,
+            "time": end_time - start_time,
+            "nodes_explored": nodes_explored_count,
+            "limit_reached": False,
+            "algorithm": "Bidirectional A*"
+        }
+    return {
+        "path": [],
+        "score": float('inf'),
+        "time": end_time - start_time,
+        "nodes_explored": nodes_explored_count,
+        "limit_reached": limit_reached,
+        "algorithm": "Bidirectional A*"
+    }
@@ -0,0 +1,208 @@
+"""
+Compact search state for A* on the implicit grid.
+
+`a_star_search_implicit` allocates a `Node` (plus a position tuple, a closed-set
+entry and a g_costs entry) for every push. Here the open set only holds plain
+`(f, h, packed_pos)` tuples with `packed_pos = r * W + c`, and g, parent and
+closed flags live in typed arrays. The grid is far too large for one dense
+array, so the arrays are paged: the grid is split into 32x32 pages, and a page
+(a 4 KiB `array('i')` of g values plus a 1 KiB `bytearray` of flags) is only
+allocated when the search first touches it. That is about 5 bytes per cell in
+a touched page instead of hundreds of bytes per Node; what is left per explored
+node is mostly the open set itself.
+
+The result dict has the same schema and semantics as `a_star_search_implicit`,
+including counting duplicate pops in `nodes_explored`. The open set is
+pluggable (see `open_sets`), and each one breaks ties between entries with
+equal (f, h) its own way rather than by heap insertion order, so on ties the
+explored count and the (equally short) path can differ.
+"""
+import time
+from array import array
+
+from algorithm import heuristic_manhattan
+from open_sets import HeapOpenSet
+
+PAGE_SHIFT = 5
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+PAGE_CELLS = PAGE_SIZE * PAGE_SIZE
+
+# Same neighbor order as the Node-based searches; the parent link stores the index of the move
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+# Flag bits in the per-cell bytearray
+DIR_MASK = 0b0011    # index into DIRECTIONS of the move that reached the cell
+HAS_PARENT = 0b0100
+CLOSED = 0b1000
+BLOCKED = 0b1_0000   # cached obstacle check
+
+_EMPTY_G_PAGE = array('i', [-1]) * PAGE_CELLS
+_EMPTY_FLAGS_PAGE = bytes(PAGE_CELLS)
+
+
+class PagedGridState:
+    """
+    g values and parent links for the cells one search has touched.
+
+    The search loops inline the page arithmetic for speed and only use `pages`,
+    `new_page` and `page_key` directly; the methods here are for everything off
+    the hot path (path reconstruction, inspection, reuse between searches).
+    """
+
+    def __init__(self, grid_dims):
+        self.grid_dims = grid_dims
+        self.pages_per_row = (grid_dims[1] + PAGE_MASK) >> PAGE_SHIFT
+        self.pages = {}
+
+    def page_key(self, r, c):
+        return (r >> PAGE_SHIFT) * self.pages_per_row + (c >> PAGE_SHIFT)
+
+    def new_page(self, key):
+        page = (array('i', _EMPTY_G_PAGE), bytearray(_EMPTY_FLAGS_PAGE))
+        self.pages[key] = page
+        return page
+
+    def _locate(self, position):
+        r, c = position
+        page = self.pages.get(self.page_key(r, c))
+        return page, ((r & PAGE_MASK) << PAGE_SHIFT) | (c & PAGE_MASK)
+
+    def get_g(self, position, default=None):
+        page, offset = self._locate(position)
+        if page is None or page[0][offset] < 0:
+            return default
+        return page[0][offset]
+
+    def set_start(self, position):
+        r, c = position
+        g_page, flags_page = self.pages.get(self.page_key(r, c)) or self.new_page(self.page_key(r, c))
+        offset = ((r & PAGE_MASK) << PAGE_SHIFT) | (c & PAGE_MASK)
+        g_page[offset] = 0
+        flags_page[offset] = 0
+
+    def is_closed(self, position):
+        page, offset = self._locate(position)
+        return page is not None and bool(page[1][offset] & CLOSED)
+
+    def parent_of(self, position):
+        page, offset = self._locate(position)
+        if page is None or not page[1][offset] & HAS_PARENT:
+            return None
+        dr, dc = DIRECTIONS[page[1][offset] & DIR_MASK]
+        return (position[0] - dr, position[1] - dc)
+
+    def reconstruct_path(self, position):
+        path = []
+        current = position
+        while current is not None:
+            path.append(current)
+            current = self.parent_of(current)
+        return path[::-1]
+
+    def cells_touched(self):
+        return len(self.pages) * PAGE_CELLS
+
+    def nbytes(self):
+        """Approximate memory held by the pages (array payloads plus the page dict)."""
+        per_page = PAGE_CELLS * _EMPTY_G_PAGE.itemsize + PAGE_CELLS
+        return len(self.pages) * per_page + self.pages.__sizeof__()
+
+
+# --- A* with compact search state ---
+def a_star_search_compact(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit,
+                          open_set_factory=HeapOpenSet):
+    """
+    `open_set_factory` builds the open set (see `open_sets`); `BucketOpenSet`
+    replaces the O(log n) heap with a bucket queue for integer f values.
+    """
+    start_time = time.perf_counter()
+
+    rows, cols = grid_dims
+    goal_r, goal_c = goal_pos
+    goal_packed = goal_r * cols + goal_c
+    inline_manhattan = heuristic_func is heuristic_manhattan
+
+    state = PagedGridState(grid_dims)
+    state.set_start(start_pos)
+    pages = state.pages
+    pages_per_row = state.pages_per_row
+    new_page = state.new_page
+
+    start_h = heuristic_func(start_pos, goal_pos)
+    open_set = open_set_factory()
+    open_set.push(start_h, start_h, start_pos[0] * cols + start_pos[1])
+    open_push = open_set.push
+    open_pop = open_set.pop
+
+    nodes_explored_count = 0
+    limit_reached = False
+
+    while open_set:
+        if nodes_explored_count >= max_nodes_explored_limit:
+            limit_reached = True
+            break
+
+        f, h, packed = open_pop()
+        nodes_explored_count += 1
+
+        if packed == goal_packed:
+            end_time = time.perf_counter()
+            return {
+                "path": state.reconstruct_path(goal_pos),
+                "score": f - h,
+                "time": end_time - start_time,
+                "nodes_explored": nodes_explored_count,
+                "limit_reached": False,
+                "algorithm": "A*"
+            }
+
+        r, c = divmod(packed, cols)
+        g_page, flags_page = pages[(r >> PAGE_SHIFT) * pages_per_row + (c >> PAGE_SHIFT)]
+        offset = ((r & PAGE_MASK) << PAGE_SHIFT) | (c & PAGE_MASK)
+        flags = flags_page[offset]
+        if flags & CLOSED:
+            # Superseded duplicate: still counted, as in the Node version, but it has nothing left to relax
+            continue
+        flags_page[offset] = flags | CLOSED
+
+        tentative_g_score = f - h + 1
+        for direction, (dr, dc) in enumerate(DIRECTIONS):
+            nr = r + dr
+            nc = c + dc
+            if not (0 <= nr < rows and 0 <= nc < cols):
+                continue
+
+            key = (nr >> PAGE_SHIFT) * pages_per_row + (nc >> PAGE_SHIFT)
+            page = pages.get(key)
+            if page is None:
+                page = new_page(key)
+            n_g_page, n_flags_page = page
+            n_offset = ((nr & PAGE_MASK) << PAGE_SHIFT) | (nc & PAGE_MASK)
+            n_flags = n_flags_page[n_offset]
+            if n_flags & (CLOSED | BLOCKED):
+                continue
+            old_g = n_g_page[n_offset]
+            if 0 <= old_g <= tentative_g_score:
+                continue
+            if old_g < 0 and is_obstacle_func((nr, nc)):
+                n_flags_page[n_offset] = BLOCKED
+                continue
+
+            n_g_page[n_offset] = tentative_g_score
+            n_flags_page[n_offset] = HAS_PARENT | direction
+            if inline_manhattan:
+                h_score = abs(nr - goal_r) + abs(nc - goal_c)
+            else:
+                h_score = heuristic_func((nr, nc), goal_pos)
+            open_push(tentative_g_score + h_score, h_score, nr * cols + nc)
+
+    end_time = time.perf_counter()
+    return {
+        "path": [],
+        "score": float('inf'),
+        "time": end_time - start_time,
+        "nodes_explored": nodes_explored_count,
+        "limit_reached": limit_reached,
+        "algorithm": "A*"
+    }
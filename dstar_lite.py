@@ -0,0 +1,218 @@
+"""
+Incremental replanning with D* Lite on an `ObstacleOverlay`.
+
+`DStarLite(grid_dims, start_pos, goal_pos, heuristic_func, overlay)` keeps its
+search between calls. It searches backwards from the goal, so g(s) is the
+cost from s to the goal and the heuristic is measured to the (possibly
+moving) start. The planner subscribes to the overlay. After a batch of
+edits, `replan()` recomputes rhs only for the edited cells and their four
+neighbours and repairs from there; cells whose costs did not change are
+never touched again. With a single fixed start this is LPA* run in
+reverse. `move_to(position)` adds the D* Lite key modifier km, so the robot
+can walk the path and keep replanning from where it stands.
+
+Obstacle semantics match `overlay.bind(start, goal)` for the current start:
+edits win over the terrain, and the current start and the goal are always
+open. A blocked cell has no edges. Every move costs 1, as in
+`a_star_search_implicit`.
+
+Each `replan()` pops at most `max_nodes_explored_limit` cells. If it hits
+the limit, it returns no path but keeps the open set, so the next call
+carries on where this one stopped.
+"""
+import heapq
+import time
+
+INF = float('inf')
+
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class DStarLite:
+    def __init__(self, grid_dims, start_pos, goal_pos, heuristic_func, overlay):
+        self.grid_dims = grid_dims
+        self.start = start_pos
+        self.goal = goal_pos
+        self.heuristic_func = heuristic_func
+        self.overlay = overlay
+        self.km = 0
+        self.g = {}
+        self.rhs = {goal_pos: 0}
+        self.open_set = []
+        self.open_keys = {} # cell -> its live key; heap entries with any other key are stale
+        self._pending = set() # cells whose blocked state changed since the last replan
+        self._push(goal_pos, (heuristic_func(start_pos, goal_pos), 0))
+        overlay.subscribe(self._on_edit)
+        # counters over the planner's lifetime
+        self.replans = 0
+        self.total_nodes_explored = 0
+        self.cells_updated = 0
+
+    def close(self):
+        """Stop listening to the overlay."""
+        self.overlay.unsubscribe(self._on_edit)
+
+    def _on_edit(self, changed_cells):
+        self._pending.update(changed_cells)
+
+    # --- Graph ---
+    def _blocked(self, position):
+        if position == self.start or position == self.goal:
+            return False
+        return self.overlay.is_blocked(position)
+
+    def _neighbors(self, position):
+        rows, cols = self.grid_dims
+        r, c = position
+        for dr, dc in DIRECTIONS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                yield (nr, nc)
+
+    def _best_successor_cost(self, position):
+        """min over open neighbours of 1 + g; the rhs of a non-goal cell."""
+        if self._blocked(position):
+            return INF
+        g = self.g
+        best = INF
+        for neighbor_pos in self._neighbors(position):
+            neighbor_g = g.get(neighbor_pos, INF)
+            if neighbor_g + 1 < best and not self._blocked(neighbor_pos):
+                best = neighbor_g + 1
+        return best
+
+    # --- Priority queue ---
+    def _key(self, position):
+        # Ties on k1 go to under-consistent cells first, so a raised cost reaches the cells that
+        # leaned on it before they settle; among the rest, the cell furthest from the goal (closest
+        # to the start) wins, like A* preferring the smaller h.
+        g_value, rhs_value = self.g.get(position, INF), self.rhs.get(position, INF)
+        best = min(g_value, rhs_value)
+        k1 = best + self.heuristic_func(self.start, position) + self.km
+        return (k1, -INF) if g_value < rhs_value else (k1, -best)
+
+    def _push(self, position, key):
+        self.open_keys[position] = key
+        heapq.heappush(self.open_set, (key[0], key[1], position))
+
+    def _update_vertex(self, position):
+        """Queue `position` iff it is inconsistent (g != rhs)."""
+        if self.g.get(position, INF) != self.rhs.get(position, INF):
+            self._push(position, self._key(position))
+        else:
+            self.open_keys.pop(position, None)
+
+    def _recompute_rhs(self, position):
+        if position != self.goal:
+            best = self._best_successor_cost(position)
+            if best == INF:
+                self.rhs.pop(position, None)
+            else:
+                self.rhs[position] = best
+        self._update_vertex(position)
+
+    # --- Search ---
+    def _apply_pending(self):
+        changed = self._pending
+        self._pending = set()
+        touched = set()
+        for position in changed:
+            touched.add(position)
+            touched.update(self._neighbors(position))
+        for position in touched:
+            self._recompute_rhs(position)
+        self.cells_updated += len(changed)
+
+    def _compute_shortest_path(self, max_nodes_explored_limit):
+        g, rhs, open_set, open_keys = self.g, self.rhs, self.open_set, self.open_keys
+        start = self.start
+        nodes_explored_count = 0
+        while open_set:
+            k1, k2, position = open_set[0]
+            if open_keys.get(position) != (k1, k2):
+                heapq.heappop(open_set) # stale entry
+                continue
+            start_g, start_rhs = g.get(start, INF), rhs.get(start, INF)
+            start_best = min(start_g, start_rhs)
+            if (k1, k2) >= (start_best + self.km, -start_best) and start_g == start_rhs:
+                break
+            if nodes_explored_count >= max_nodes_explored_limit:
+                return nodes_explored_count, True
+            heapq.heappop(open_set)
+            nodes_explored_count += 1
+
+            new_key = self._key(position)
+            if (k1, k2) < new_key:
+                self._push(position, new_key) # km grew since it was queued
+                continue
+            del open_keys[position]
+            g_old = g.get(position, INF)
+            position_rhs = rhs.get(position, INF)
+            if g_old > position_rhs:
+                # over-consistent: settle it and offer it to the neighbours
+                g[position] = position_rhs
+                if self._blocked(position):
+                    continue
+                offer = position_rhs + 1
+                for neighbor_pos in self._neighbors(position):
+                    if neighbor_pos != self.goal and offer < rhs.get(neighbor_pos, INF) and not self._blocked(neighbor_pos):
+                        rhs[neighbor_pos] = offer
+                        self._update_vertex(neighbor_pos)
+            else:
+                # under-consistent: raise it and re-derive everything that leaned on it
+                g.pop(position, None)
+                self._recompute_rhs(position)
+                for neighbor_pos in self._neighbors(position):
+                    if rhs.get(neighbor_pos, INF) == g_old + 1:
+                        self._recompute_rhs(neighbor_pos)
+        return nodes_explored_count, False
+
+    def _extract_path(self):
+        """Follow the cheapest successor from the start; [] if the start cannot reach the goal."""
+        g = self.g
+        if self.rhs.get(self.start, INF) == INF:
+            return []
+        path = [self.start]
+        position = self.start
+        seen = {position}
+        while position != self.goal:
+            best_pos, best = None, INF
+            for neighbor_pos in self._neighbors(position):
+                neighbor_g = g.get(neighbor_pos, INF)
+                if neighbor_g < best and not self._blocked(neighbor_pos):
+                    best_pos, best = neighbor_pos, neighbor_g
+            if best_pos is None or best_pos in seen:
+                return [] # cannot happen once the start is consistent; guard against looping anyway
+            position = best_pos
+            seen.add(position)
+            path.append(position)
+        return path
+
+    def replan(self, max_nodes_explored_limit):
+        """Apply pending overlay edits, repair the search and return a result dict for the current start."""
+        start_time = time.perf_counter()
+        self._apply_pending()
+        nodes_explored_count, limit_reached = self._compute_shortest_path(max_nodes_explored_limit)
+        path = [] if limit_reached else self._extract_path()
+        self.replans += 1
+        self.total_nodes_explored += nodes_explored_count
+        return {
+            "path": path,
+            "score": len(path) - 1 if path else float('inf'),
+            "time": time.perf_counter() - start_time,
+            "nodes_explored": nodes_explored_count,
+            "limit_reached": limit_reached,
+            "algorithm": "D* Lite"
+        }
+
+    def move_to(self, position):
+        """Move the start (normally one step along the last path); the search is kept."""
+        if position == self.start:
+            return
+        old_start = self.start
+        self.km += self.heuristic_func(old_start, position)
+        self.start = position
+        # the start is always open, so both cells may have changed state
+        for cell in (old_start, position):
+            if self.overlay.is_blocked(cell):
+                self._pending.add(cell)
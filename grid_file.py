@@ -0,0 +1,347 @@
+"""
+Explicit obstacle grids in a bit-packed, tiled, memory-mapped file.
+
+The procedural map hashes every cell it looks at, and real benchmark maps
+are not procedural at all. A grid file stores one bit per cell (1 = obstacle),
+so a 4096x4096 window is 2 MiB. Cells are grouped in square tiles
+(`tile_size` rows of `tile_size / 8` bytes, tiles in row-major order), so a
+search that stays in one area touches few pages. Cells past the right and
+bottom edges of the last tiles are stored as obstacles.
+
+Layout: a 64-byte header, then the tiles.
+
+    magic, version, flags, tile size, rows, cols, origin row, origin col, seed, density
+
+`origin` is where the window sits on the procedural map it was exported
+from; seed and density are only meaningful when `flags & FLAG_PROCEDURAL`.
+Positions in the file are local, from (0, 0) to `grid_dims`:
+`to_local`/`to_global` translate.
+
+`GridFile(path)` maps the file read-only. Single-cell lookups index the mmap
+directly, and batch lookups are `np.frombuffer` views, so nothing is copied.
+It offers the same lookups as `ObstacleField` (`is_obstacle`,
+`is_obstacle_batch`, `row_bytes`, `bind`), so a bound grid file plugs into
+every search function, including the row scans of `jps`:
+
+    grid = GridFile("scenario12.grid")
+    a_star_search_implicit(grid.grid_dims, start, goal, heuristic_manhattan, grid.bind(start, goal), limit)
+
+Writers: `write_grid_file` (any bool mask), `export_procedural_window` (a
+rectangle of a procedural map, computed one band of tiles at a time) and
+`import_movingai_map` (MovingAI `.map` benchmark files). Also usable as a
+script: `python -m grid_file export|import|info ...`.
+"""
+import argparse
+import math
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from obstacle_field import obstacle_mask
+
+DEFAULT_GRID_TILE_SIZE = 64 # 64 rows of 8 bytes = 512 bytes per tile
+
+FLAG_PROCEDURAL = 1
+
+_FILE_MAGIC = b"GRIDBITS"
+_FILE_VERSION = 1
+# magic, version, flags, tile size, rows, cols, origin row, origin col, seed, density
+_FILE_HEADER = struct.Struct("<8sHHIqqqqqd")
+_FILE_HEADER_SIZE = 64
+
+# MovingAI terrain a 4-connected ground agent can stand on: open ground, grass, swamp
+MOVINGAI_PASSABLE = b".GS"
+
+# Each byte value unpacked to its 8 cells, lowest bit first, as row_bytes returns them
+_UNPACKED_BYTES = [bytes((value >> bit) & 1 for bit in range(8)) for value in range(256)]
+
+
+def _check_tile_size(tile_size):
+    if tile_size < 8 or tile_size & (tile_size - 1):
+        raise ValueError(f"tile_size must be a power of two of at least 8, got {tile_size}")
+
+
+# --- Reading ---
+class GridFile:
+    """A read-only, memory-mapped grid file. Off-grid cells count as obstacles."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_FILE_HEADER_SIZE)
+            if len(header) < _FILE_HEADER_SIZE or header[:8] != _FILE_MAGIC:
+                raise ValueError(f"{path} is not a grid file")
+            (_, version, flags, tile_size, rows, cols,
+             origin_r, origin_c, seed, density) = _FILE_HEADER.unpack_from(header)
+            if version != _FILE_VERSION:
+                raise ValueError(f"{path} has grid file version {version}, expected {_FILE_VERSION}")
+            _check_tile_size(tile_size)
+            self.tile_size = tile_size
+            self.tiles_r = -(-rows // tile_size)
+            self.tiles_c = -(-cols // tile_size)
+            expected = _FILE_HEADER_SIZE + self.tiles_r * self.tiles_c * tile_size * tile_size // 8
+            if os.fstat(f.fileno()).st_size != expected:
+                raise ValueError(f"{path} is truncated or corrupt ({expected} bytes expected)")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.grid_dims = (rows, cols)
+        self.origin = (origin_r, origin_c)
+        self.procedural = bool(flags & FLAG_PROCEDURAL)
+        self.scenario_seed = seed if self.procedural else None
+        self.obstacle_density = density if self.procedural else None
+        self._shift = tile_size.bit_length() - 1
+        self._mask = tile_size - 1
+        self._row_shift = self._shift - 3 # bytes per tile row = tile_size / 8
+        self._tile_shift = 2 * self._shift - 3 # bytes per tile = tile_size**2 / 8
+        self._bits = np.frombuffer(self._mmap, dtype=np.uint8, offset=_FILE_HEADER_SIZE)
+
+    def _byte_offset(self, r, c):
+        shift = self._shift
+        mask = self._mask
+        return (_FILE_HEADER_SIZE + ((((r >> shift) * self.tiles_c + (c >> shift)) << self._tile_shift)
+                | ((r & mask) << self._row_shift) | ((c & mask) >> 3)))
+
+    def is_obstacle(self, position):
+        """Single-cell lookup (no start/goal exception)."""
+        r, c = position
+        if not (0 <= r < self.grid_dims[0] and 0 <= c < self.grid_dims[1]):
+            return True
+        return (self._mmap[self._byte_offset(r, c)] >> (c & 7)) & 1 == 1
+
+    def is_obstacle_batch(self, rows, cols):
+        """Lookup for arrays of coordinates, returning a bool array (no start/goal exception)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        inside = (rows >= 0) & (rows < self.grid_dims[0]) & (cols >= 0) & (cols < self.grid_dims[1])
+        r = np.where(inside, rows, 0)
+        c = np.where(inside, cols, 0)
+        shift = self._shift
+        mask = self._mask
+        offsets = ((((r >> shift) * self.tiles_c + (c >> shift)) << self._tile_shift)
+                   | ((r & mask) << self._row_shift) | ((c & mask) >> 3))
+        blocked = (self._bits[offsets] >> (c & 7).astype(np.uint8)) & 1 == 1
+        return blocked | ~inside
+
+    def row_bytes(self, r, c0, c1):
+        """Row r, columns [c0, c1) inside the grid, as bytes (1 = obstacle, no start/goal exception)."""
+        shift = self._shift
+        mask = self._mask
+        row_offset = _FILE_HEADER_SIZE + (((r >> shift) * self.tiles_c << self._tile_shift)
+                                          | ((r & mask) << self._row_shift))
+        buffer = self._mmap
+        parts = []
+        c = c0 & ~7
+        while c < c1:
+            # the packed bytes of this row from column c to the end of c's tile (or to c1)
+            tile_end = min(((c >> shift) + 1) << shift, c1 + 7 & ~7)
+            start = row_offset + ((c >> shift) << self._tile_shift) + ((c & mask) >> 3)
+            parts.extend(map(_UNPACKED_BYTES.__getitem__, buffer[start:start + ((tile_end - c) >> 3)]))
+            c = tile_end
+        lo = c0 & 7
+        return b"".join(parts)[lo:lo + (c1 - c0)]
+
+    def bind(self, start_pos, goal_pos):
+        """Callable with the `is_obstacle_func(position)` signature the search functions expect."""
+        return bind_grid_file(self, start_pos, goal_pos)
+
+    def to_local(self, position):
+        return (position[0] - self.origin[0], position[1] - self.origin[1])
+
+    def to_global(self, position):
+        return (position[0] + self.origin[0], position[1] + self.origin[1])
+
+    def close(self):
+        self._bits = None
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def bind_grid_file(grid, start_pos, goal_pos):
+    """
+    `is_obstacle_func(position)` for one query on a `GridFile`, with the
+    start/goal exception of `is_obstacle_procedural`. Like
+    `bind_obstacle_field`, it is a closure over locals and carries `field`,
+    `start_pos`, `goal_pos` and a vectorized `batch(rows, cols)`.
+    """
+    buffer = grid._mmap
+    rows, cols = grid.grid_dims
+    tiles_c = grid.tiles_c
+    shift = grid._shift
+    mask = grid._mask
+    row_shift = grid._row_shift
+    tile_shift = grid._tile_shift
+    blocked_endpoints = [position for position in (start_pos, goal_pos) if grid.is_obstacle(position)]
+
+    def is_obstacle_func(position):
+        if position == start_pos or position == goal_pos:
+            return False
+        r, c = position
+        if not (0 <= r < rows and 0 <= c < cols):
+            return True
+        byte = buffer[_FILE_HEADER_SIZE + ((((r >> shift) * tiles_c + (c >> shift)) << tile_shift)
+                                           | ((r & mask) << row_shift) | ((c & mask) >> 3))]
+        return (byte >> (c & 7)) & 1 == 1
+
+    def batch(rows_, cols_):
+        """Vectorized `is_obstacle_func` over coordinate arrays."""
+        rows_ = np.asarray(rows_, dtype=np.int64)
+        cols_ = np.asarray(cols_, dtype=np.int64)
+        blocked = grid.is_obstacle_batch(rows_, cols_)
+        for r, c in blocked_endpoints:
+            blocked &= ~((rows_ == r) & (cols_ == c))
+        return blocked
+
+    is_obstacle_func.field = grid
+    is_obstacle_func.start_pos = start_pos
+    is_obstacle_func.goal_pos = goal_pos
+    is_obstacle_func.batch = batch
+    return is_obstacle_func
+
+
+# --- Writing ---
+def _write_grid(path, shape, band_func, tile_size, origin=(0, 0), scenario_seed=None, obstacle_density=None):
+    """
+    Write a grid file band by band: `band_func(r0, r1)` returns the (r1 - r0, cols)
+    bool mask of local rows [r0, r1). Only one band of tiles is held in memory.
+    The file is written next to `path` and renamed into place.
+    """
+    _check_tile_size(tile_size)
+    rows, cols = shape
+    if rows <= 0 or cols <= 0:
+        raise ValueError(f"grid shape must be positive, got {shape}")
+    procedural = scenario_seed is not None
+    header = _FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, FLAG_PROCEDURAL if procedural else 0, tile_size,
+                               rows, cols, origin[0], origin[1],
+                               scenario_seed if procedural else 0,
+                               obstacle_density if procedural else math.nan)
+    tiles_c = -(-cols // tile_size)
+    padded_cols = tiles_c * tile_size
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(_FILE_HEADER_SIZE, b"\0"))
+        for r0 in range(0, rows, tile_size):
+            r1 = min(r0 + tile_size, rows)
+            band = np.ones((tile_size, padded_cols), dtype=bool) # padding reads as obstacle
+            band[:r1 - r0, :cols] = band_func(r0, r1)
+            # (rows, tile cols, cols in tile) -> (tile cols, rows, cols in tile): tiles in row-major order
+            tiles = band.reshape(tile_size, tiles_c, tile_size).transpose(1, 0, 2)
+            f.write(np.packbits(tiles, axis=-1, bitorder="little").tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_grid_file(path, mask, tile_size=DEFAULT_GRID_TILE_SIZE, origin=(0, 0)):
+    """Write a 2-D bool array (True = obstacle) as a grid file."""
+    mask = np.asarray(mask, dtype=bool)
+    if mask.ndim != 2:
+        raise ValueError(f"mask must be 2-D, got shape {mask.shape}")
+    return _write_grid(path, mask.shape, lambda r0, r1: mask[r0:r1], tile_size, origin)
+
+
+def export_procedural_window(path, scenario_seed, obstacle_density, origin, shape, tile_size=DEFAULT_GRID_TILE_SIZE):
+    """
+    Materialize the procedural terrain of rows [origin[0], origin[0] + shape[0])
+    and the matching columns (no start/goal exception; `bind` adds it back).
+    """
+    origin_r, origin_c = origin
+    cols = np.arange(origin_c, origin_c + shape[1], dtype=np.int64)[None, :]
+
+    def band(r0, r1):
+        rows = np.arange(origin_r + r0, origin_r + r1, dtype=np.int64)[:, None]
+        return obstacle_mask(rows, cols, scenario_seed, obstacle_density)
+
+    return _write_grid(path, shape, band, tile_size, origin, scenario_seed, obstacle_density)
+
+
+def scenario_window(scenario, margin):
+    """(origin, shape) of the box around a scenario's start and goal, grown by `margin` and clipped to the grid."""
+    (start_r, start_c), (goal_r, goal_c) = scenario['start'], scenario['goal']
+    rows, cols = scenario['grid_dims']
+    r0, c0 = max(min(start_r, goal_r) - margin, 0), max(min(start_c, goal_c) - margin, 0)
+    r1, c1 = min(max(start_r, goal_r) + margin + 1, rows), min(max(start_c, goal_c) + margin + 1, cols)
+    return (r0, c0), (r1 - r0, c1 - c0)
+
+
+def export_scenario_window(path, scenario, margin=256, tile_size=DEFAULT_GRID_TILE_SIZE):
+    """Export `scenario_window(scenario, margin)` of a scenario's map (a dict from `algorithm.scenarios`)."""
+    origin, shape = scenario_window(scenario, margin)
+    return export_procedural_window(path, scenario['scenario_seed'], scenario['obstacle_density'],
+                                    origin, shape, tile_size)
+
+
+def read_movingai_map(map_path):
+    """
+    Obstacle mask (True = blocked) of a MovingAI `.map` file. Cells in
+    `MOVINGAI_PASSABLE` are open; trees, water and out-of-bounds cells are not.
+    """
+    with open(map_path, "rb") as f:
+        header = {}
+        for line in f:
+            line = line.strip()
+            if line == b"map":
+                break
+            key, _, value = line.partition(b" ")
+            header[key.decode()] = value.decode()
+        else:
+            raise ValueError(f"{map_path}: no 'map' line")
+        try:
+            height, width = int(header["height"]), int(header["width"])
+        except (KeyError, ValueError):
+            raise ValueError(f"{map_path}: missing or bad height/width") from None
+        lines = [line.rstrip(b"\r\n") for line in f]
+    lines = [line for line in lines if line][:height]
+    if len(lines) < height or any(len(line) < width for line in lines):
+        raise ValueError(f"{map_path}: expected {height} rows of {width} cells")
+    cells = np.frombuffer(b"".join(line[:width] for line in lines), dtype=np.uint8).reshape(height, width)
+    return ~np.isin(cells, np.frombuffer(MOVINGAI_PASSABLE, dtype=np.uint8))
+
+
+def import_movingai_map(map_path, path, tile_size=DEFAULT_GRID_TILE_SIZE):
+    """Convert a MovingAI `.map` file into a grid file (rows are the map's y, columns its x)."""
+    return write_grid_file(path, read_movingai_map(map_path), tile_size)
+
+
+# --- Command line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create and inspect bit-packed grid files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="materialize the window around a scenario's start and goal")
+    export.add_argument("scenario", type=int, help="scenario number, from 1")
+    export.add_argument("output")
+    export.add_argument("--margin", type=int, default=256, help="cells kept around the start/goal box")
+    export.add_argument("--tile-size", type=int, default=DEFAULT_GRID_TILE_SIZE)
+    imported = commands.add_parser("import", help="convert a MovingAI .map file")
+    imported.add_argument("map")
+    imported.add_argument("output")
+    imported.add_argument("--tile-size", type=int, default=DEFAULT_GRID_TILE_SIZE)
+    info = commands.add_parser("info", help="print a grid file's header")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from algorithm import scenarios
+        if not 1 <= args.scenario <= len(scenarios):
+            parser.error(f"scenario must be 1-{len(scenarios)}, got {args.scenario}")
+        scenario = scenarios[args.scenario - 1]
+        export_scenario_window(args.output, scenario, args.margin, args.tile_size)
+        path = args.output
+    elif args.command == "import":
+        path = import_movingai_map(args.map, args.output, args.tile_size)
+    else:
+        path = args.path
+    with GridFile(path) as grid:
+        rows, cols = grid.grid_dims
+        print(f"{path}: {rows}x{cols} cells, tile size {grid.tile_size}, origin {grid.origin}, "
+              f"{os.path.getsize(path):,} bytes")
+        if grid.procedural:
+            print(f"  procedural: seed {grid.scenario_seed}, density {grid.obstacle_density}")
+
+
+if __name__ == "__main__":
+    main()
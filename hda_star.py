@@ -0,0 +1,323 @@
+"""
+Hash-distributed A* (HDA*): one optimal query searched by several worker processes.
+
+Every cell has an owner worker, picked by hashing the `block_size` x
+`block_size` block it lies in. Blocks rather than single cells keep most
+neighbours on the same worker, so fewer nodes have to be sent. Each worker
+keeps its own open heap and g/parent tables for the cells it owns, and
+builds its own `ObstacleField` from the seed and density. It expands its
+best node and keeps successors it owns. Successors owned by another worker
+are buffered and sent in batches after every `batch_size` expansions.
+
+Nodes travel through shared memory: one single-producer, single-consumer
+ring of (r, c, g, parent r, parent c) int32 records per ordered pair of
+workers. They live in an anonymous shared mapping inherited through fork,
+so the module needs the fork start method. A sender writes the records and
+then advances the ring's tail; the receiver reads up to the tail and then
+advances the head. These are plain NumPy stores with no barriers: the data
+is written before the counter, and x86 (TSO) keeps stores in program order
+as every other core sees them. The termination check below relies on the
+same ordering. Weakly ordered CPUs (ARM, including Apple silicon) make no
+such promise, so `hda_star_search` only runs on x86.
+
+Expansion order is only best-first within a worker, so a node can be
+expanded before its best g arrives. Like A* without a closed set, a worker
+then re-opens it. The goal's owner keeps the incumbent cost C in shared
+memory, and nodes with f >= C are dropped. The search is finished when no
+worker holds a node with f < C and no node is in transit. Then every cell
+that could lie on a cheaper path has been expanded with its final g, so C
+is optimal. The parent process checks this with two consecutive snapshots.
+Each snapshot records every worker's idle flag and activity epoch, and
+every ring's head and tail. The search ends when both snapshots show all
+workers idle, every sent record received, and nothing changed in between.
+An idle worker has flushed its buffers, and a worker bumps its epoch
+before it takes in new nodes. So a node that was in flight during the
+first snapshot either shows as unreceived or changes the second one.
+
+The path is then traced back along the parent tables, worker by worker,
+over each worker's control pipe. A search stopped by the node limit
+returns no path, like the other searches: the incumbent is unproven, and
+parent tables abandoned mid-update can disagree with its cost. The result
+is the usual result dict labelled `HDA*`. It adds `workers`, `worker_nodes`
+(expansions per worker), `messages` (nodes sent between workers) and
+`worker_cpu_times`. `nodes_explored` sums all workers, re-expansions
+included.
+"""
+import heapq
+import mmap
+import multiprocessing
+import platform
+import time
+
+import numpy as np
+
+from algorithm import MAX_NODES_TO_EXPLORE_ASTAR
+
+DEFAULT_BLOCK_SIZE = 32
+DEFAULT_BATCH_SIZE = 16 # expansions between flushes of the outgoing buffers
+RING_CAPACITY = 1 << 15 # records per (sender, receiver) ring
+IDLE_SLEEP = 0.0002 # seconds an idle worker sleeps between inbox checks
+POLL_INTERVAL = 0.0005 # seconds between termination checks in the parent
+NO_COST = 1 << 62 # incumbent cost before a path is known
+
+_RECORD = 5 # r, c, g, parent r, parent c
+_DONE, _ABORT, _BEST = range(3) # control words
+_IDLE, _EPOCH, _EXPANDED = range(3) # per-worker words
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+X86_MACHINES = ("x86_64", "amd64", "i386", "i686", "x86") # platform.machine(), lowercased
+
+
+def owner_of(position, n_workers, block_size=DEFAULT_BLOCK_SIZE):
+    """Worker that owns `position`."""
+    return ((position[0] // block_size) * 73856093 ^ (position[1] // block_size) * 19349663) % n_workers
+
+
+class _SharedState:
+    """Rings, ring counters, control words and per-worker words in one anonymous shared mapping."""
+
+    def __init__(self, n_workers, ring_capacity):
+        shapes = [
+            ("rings", np.int32, (n_workers, n_workers, ring_capacity, _RECORD)),
+            ("heads", np.int64, (n_workers, n_workers)), # [sender, receiver] records consumed
+            ("tails", np.int64, (n_workers, n_workers)), # [sender, receiver] records published
+            ("control", np.int64, (3,)),
+            ("workers", np.int64, (n_workers, 3)),
+        ]
+        size = sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, dtype, shape in shapes)
+        self._map = mmap.mmap(-1, size) # MAP_SHARED: children see the same pages after fork
+        offset = 0
+        for name, dtype, shape in shapes:
+            count = int(np.prod(shape))
+            setattr(self, name, np.frombuffer(self._map, dtype, count, offset).reshape(shape))
+            offset += count * np.dtype(dtype).itemsize
+        self.control[_BEST] = NO_COST
+
+    def snapshot(self):
+        """Worker flags first, then the counters (see the module docstring)."""
+        return self.workers[:, :_EXPANDED].copy(), self.tails.copy(), self.heads.copy()
+
+    def close(self):
+        del self.rings, self.heads, self.tails, self.control, self.workers
+        self._map.close()
+
+
+# --- Worker ---
+def _worker(me, n, shared, grid_dims, start_pos, goal_pos, scenario_seed, obstacle_density,
+            block_size, batch_size, limit, connection):
+    from obstacle_field import get_obstacle_field
+
+    is_obstacle = get_obstacle_field(scenario_seed, obstacle_density).bind(start_pos, goal_pos)
+    rows, cols = grid_dims
+    goal_r, goal_c = goal_pos
+    capacity = shared.rings.shape[2]
+    control, states, heads, tails = shared.control, shared.workers, shared.heads, shared.tails
+    inboxes = [(j, shared.rings[j, me]) for j in range(n) if j != me]
+    outboxes = [shared.rings[me, o] for o in range(n)]
+    outgoing = [[] for _ in range(n)] # flat r, c, g, pr, pc per destination
+    g_costs = {}
+    parents = {}
+    open_heap = []
+    expanded = 0
+    idle = False
+
+    def owner(r, c):
+        return ((r // block_size) * 73856093 ^ (c // block_size) * 19349663) % n
+
+    def accept(r, c, g, parent, best):
+        """Take a node this worker owns; returns the (possibly lowered) incumbent."""
+        if g >= g_costs.get((r, c), NO_COST):
+            return best
+        if r == goal_r and c == goal_c:
+            g_costs[(r, c)] = g
+            parents[(r, c)] = parent
+            control[_BEST] = g # only the goal's owner writes it
+            return g
+        f = g + abs(r - goal_r) + abs(c - goal_c)
+        if f < best:
+            g_costs[(r, c)] = g
+            parents[(r, c)] = parent
+            heapq.heappush(open_heap, (f, -g, r, c))
+        return best
+
+    def flush():
+        """Publish as much of the outgoing buffers as the rings take; True if anything is left."""
+        left = False
+        for o, buffer in enumerate(outgoing):
+            if not buffer:
+                continue
+            tail = int(tails[me, o])
+            count = min(len(buffer) // _RECORD, capacity - (tail - int(heads[me, o])))
+            if count:
+                records = np.array(buffer[:count * _RECORD], dtype=np.int32).reshape(count, _RECORD)
+                ring, slot = outboxes[o], tail % capacity
+                first = min(count, capacity - slot)
+                ring[slot:slot + first] = records[:first]
+                ring[:count - first] = records[first:]
+                tails[me, o] = tail + count # after the data
+                del buffer[:count * _RECORD]
+            left = left or bool(buffer)
+        return left
+
+    if owner(*start_pos) == me:
+        accept(start_pos[0], start_pos[1], 0, None, NO_COST)
+
+    while not control[_DONE]:
+        best = int(control[_BEST])
+        received = False
+        for j, ring in inboxes:
+            tail = int(tails[j, me])
+            head = int(heads[j, me])
+            if tail == head:
+                continue
+            if idle:
+                states[me, _EPOCH] += 1 # before taking anything in
+                states[me, _IDLE] = 0
+                idle = False
+            received = True
+            slot, count = head % capacity, tail - head
+            first = min(count, capacity - slot)
+            records = ring[slot:slot + first].tolist()
+            if count > first:
+                records += ring[:count - first].tolist()
+            heads[j, me] = tail
+            for r, c, g, pr, pc in records:
+                best = accept(r, c, g, (pr, pc), best)
+
+        if open_heap and open_heap[0][0] < best:
+            if idle:
+                states[me, _EPOCH] += 1
+                states[me, _IDLE] = 0
+                idle = False
+            for _ in range(batch_size):
+                if not open_heap or open_heap[0][0] >= best:
+                    break
+                _, negative_g, r, c = heapq.heappop(open_heap)
+                g = -negative_g
+                if g != g_costs[(r, c)]:
+                    continue # superseded by a cheaper copy
+                expanded += 1
+                successor_g = g + 1
+                for dr, dc in DIRECTIONS:
+                    nr, nc = r + dr, c + dc
+                    if not (0 <= nr < rows and 0 <= nc < cols) or is_obstacle((nr, nc)):
+                        continue
+                    if successor_g + abs(nr - goal_r) + abs(nc - goal_c) >= best:
+                        continue
+                    o = owner(nr, nc)
+                    if o == me:
+                        best = accept(nr, nc, successor_g, (r, c), best)
+                    else:
+                        outgoing[o].extend((nr, nc, successor_g, r, c))
+            states[me, _EXPANDED] = expanded
+            if states[:, _EXPANDED].sum() >= limit:
+                control[_ABORT] = 1
+            flush()
+        elif not flush() and not received and not idle:
+            states[me, _IDLE] = 1 # buffers empty, inbox was empty, nothing left under the incumbent
+            idle = True
+        elif idle:
+            time.sleep(IDLE_SLEEP)
+
+    # Searching is over; answer path tracing requests until told to stop
+    while True:
+        message = connection.recv()
+        if message[0] == "trace":
+            position, chain = message[1], []
+            while True:
+                chain.append(position)
+                position = parents[position]
+                if position is None or owner(*position) != me:
+                    break
+            connection.send((chain, position)) # position: the next owner's cell, None at the start
+        else:
+            connection.send({"expanded": expanded, "cpu_time": time.process_time(),
+                             "sent": int(tails[me].sum()), "open": len(open_heap)})
+            connection.close()
+            return
+
+
+# --- Search ---
+def _quiescent(shared):
+    workers, tails, heads = shared.snapshot()
+    if not workers[:, _IDLE].all() or tails.sum() != heads.sum():
+        return False
+    later = shared.snapshot()
+    return all(np.array_equal(a, b) for a, b in zip((workers, tails, heads), later))
+
+
+def hda_star_search(grid_dims, start_pos, goal_pos, scenario_seed, obstacle_density, n_workers,
+                    max_nodes_explored_limit=MAX_NODES_TO_EXPLORE_ASTAR, block_size=DEFAULT_BLOCK_SIZE,
+                    batch_size=DEFAULT_BATCH_SIZE, ring_capacity=RING_CAPACITY):
+    """
+    Shortest path from `start_pos` to `goal_pos` on the procedural map
+    (`scenario_seed`, `obstacle_density`) with `n_workers` processes and the
+    Manhattan heuristic. `max_nodes_explored_limit` caps the expansions of
+    all workers together; when it is hit, `limit_reached` is set and no
+    path is returned. x86 only (see the module docstring).
+    """
+    if n_workers < 1:
+        raise ValueError(f"n_workers must be at least 1, got {n_workers}")
+    if platform.machine().lower() not in X86_MACHINES:
+        raise RuntimeError(f"HDA* relies on x86 store ordering; {platform.machine()} is not supported")
+    start_time = time.perf_counter()
+    start_pos, goal_pos = tuple(start_pos), tuple(goal_pos)
+    context = multiprocessing.get_context("fork")
+    shared = _SharedState(n_workers, ring_capacity if n_workers > 1 else 1)
+    connections, processes = [], []
+    try:
+        for me in range(n_workers):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_worker, daemon=True, args=(
+                me, n_workers, shared, grid_dims, start_pos, goal_pos, scenario_seed, obstacle_density,
+                block_size, batch_size, max_nodes_explored_limit, child_end))
+            process.start()
+            child_end.close()
+            connections.append(parent_end)
+            processes.append(process)
+
+        while not (shared.control[_ABORT] or _quiescent(shared)):
+            if not all(process.is_alive() for process in processes):
+                raise RuntimeError("an HDA* worker died")
+            time.sleep(POLL_INTERVAL)
+        shared.control[_DONE] = 1
+        limit_reached = bool(shared.control[_ABORT])
+        score = int(shared.control[_BEST])
+
+        path = []
+        if score < NO_COST and not limit_reached:
+            position = goal_pos
+            while True:
+                connection = connections[owner_of(position, n_workers, block_size)]
+                connection.send(("trace", position))
+                chain, position = connection.recv()
+                path.extend(chain)
+                if position is None:
+                    break
+            path.reverse()
+        stats = []
+        for connection in connections:
+            connection.send(("stop",))
+            stats.append(connection.recv())
+        messages = int(shared.tails.sum()) if n_workers > 1 else 0
+    finally:
+        shared.control[_DONE] = 1
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        for connection in connections:
+            connection.close()
+        shared.close()
+
+    return {
+        "path": path,
+        "score": score if path else float('inf'),
+        "time": time.perf_counter() - start_time,
+        "nodes_explored": sum(s['expanded'] for s in stats),
+        "limit_reached": limit_reached,
+        "algorithm": "HDA*",
+        "workers": n_workers,
+        "worker_nodes": [s['expanded'] for s in stats],
+        "messages": messages,
+        "worker_cpu_times": [s['cpu_time'] for s in stats],
+    }
@@ -0,0 +1,552 @@
+"""
+Hierarchical pathfinding (HPA*-style) with a persisted cluster graph.
+
+The grid is split into square clusters. Where two neighboring clusters share a
+border, runs of open cell pairs across it become transitions: one pair of
+cells per run (the longest runs win if a border has more than
+`max_transitions` of them), linked by a cost-1 edge. Inside a cluster every
+pair of its transition cells is linked by their exact shortest distance
+through that cluster. Together these form the abstract graph.
+
+The procedural map is fully defined by `(scenario_seed, obstacle_density)`, so
+a cluster's record (transition cells, intra-cluster distances, cross-border
+partners) never changes. Records are computed lazily, the first time a query
+touches the cluster, and appended to a `ClusterGraphStore` file keyed by seed,
+density, grid size and clustering parameters. The file is memory-mapped on
+open, so later queries, and later processes, read records without copying
+and without recomputing; processes running at once append under a file lock.
+
+A query inserts start and goal into their clusters (and links them to their
+open neighbors across a border, which the records miss when the start or goal
+is blocked in the terrain but opened by the query), runs a (lightly weighted)
+A* on the abstract graph, then refines each abstract edge into cells with a
+shortest-path search fenced into that one cluster. Like HPA*, the path is
+near-optimal, not guaranteed optimal: it has to pass through the chosen
+transitions.
+"""
+import fcntl
+import heapq
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from obstacle_field import obstacle_mask
+
+DEFAULT_CLUSTER_SIZE = 64 # at most 64 so a cluster row fits one uint64 bit row
+DEFAULT_MAX_TRANSITIONS = 3
+DEFAULT_CACHE_DIR = ".hpa_cache"
+# Weight on the abstract search's heuristic (1.0 = plain A* on the abstract graph). See hpa_star_search.
+DEFAULT_ABSTRACT_WEIGHT = 1.1
+
+UNREACHABLE = np.iinfo(np.uint32).max
+
+_FILE_MAGIC = b"HPAGRAPH"
+_FILE_VERSION = 1
+# magic, version, cluster size, max transitions, seed, density, grid rows, grid cols
+_FILE_HEADER = struct.Struct("<8sIIIqdqq")
+_FILE_HEADER_SIZE = 64
+# cluster id, node count, cross-border edge count
+_RECORD_HEADER = struct.Struct("<qII")
+
+
+# --- Cluster geometry and terrain ---
+def _cluster_bounds(cluster, cluster_size, grid_dims):
+    cr, cc = cluster
+    r0 = cr * cluster_size
+    c0 = cc * cluster_size
+    return r0, min(r0 + cluster_size, grid_dims[0]), c0, min(c0 + cluster_size, grid_dims[1])
+
+
+def _terrain_with_ring(bounds, grid_dims, scenario_seed, obstacle_density):
+    """Free-cell mask of a cluster plus a one-cell ring around it (off-grid cells count as blocked)."""
+    r0, r1, c0, c1 = bounds
+    rows = np.arange(r0 - 1, r1 + 1, dtype=np.int64)[:, None]
+    cols = np.arange(c0 - 1, c1 + 1, dtype=np.int64)[None, :]
+    free = ~obstacle_mask(rows, cols, scenario_seed, obstacle_density)
+    free &= (rows >= 0) & (rows < grid_dims[0]) & (cols >= 0) & (cols < grid_dims[1])
+    return free
+
+
+def _select_transitions(pair_free, max_transitions):
+    """Indices along a border where transitions go: the middle of each run of open pairs."""
+    runs = []
+    run_start = None
+    for i, is_free in enumerate(pair_free.tolist() + [False]):
+        if is_free and run_start is None:
+            run_start = i
+        elif not is_free and run_start is not None:
+            runs.append((i - run_start, run_start))
+            run_start = None
+    if max_transitions is not None and len(runs) > max_transitions:
+        runs = sorted(runs, key=lambda run: (-run[0], run[1]))[:max_transitions]
+    return sorted(start + (length - 1) // 2 for length, start in runs)
+
+
+def cluster_distances(free, sources, targets):
+    """
+    Shortest 4-connected distances inside one cluster, from every source to
+    every target (local (r, c) coordinates), as a uint32 matrix with
+    UNREACHABLE where there is no path inside the cluster.
+
+    All sources run at once as a bit-parallel BFS: each row of the cluster is
+    one uint64 bit mask, so a BFS wave for every source is a handful of shifts
+    and ANDs over an (n_sources, n_rows) array.
+    """
+    n_rows, n_cols = free.shape
+    dist = np.full((len(sources), len(targets)), UNREACHABLE, dtype=np.uint32)
+    if not sources or not targets:
+        return dist
+    weights = np.uint64(1) << np.arange(n_cols, dtype=np.uint64)
+    free_bits = np.bitwise_or.reduce(np.where(free, weights, np.uint64(0)), axis=1)
+
+    frontier = np.zeros((len(sources), n_rows), dtype=np.uint64)
+    for k, (r, c) in enumerate(sources):
+        frontier[k, r] |= np.uint64(1) << np.uint64(c)
+    frontier &= free_bits
+    unvisited = free_bits & ~frontier
+
+    target_rows = np.array([r for r, _ in targets], dtype=np.int64)
+    target_bits = np.array([1 << c for _, c in targets], dtype=np.uint64)
+    one = np.uint64(1)
+    remaining = dist.size
+    wave = 0
+    while True:
+        hits = frontier[:, target_rows] & target_bits
+        n_hits = np.count_nonzero(hits)
+        if n_hits:
+            dist[hits != 0] = wave
+            remaining -= n_hits
+            if not remaining:
+                return dist
+        wave += 1
+        grown = frontier << one
+        grown |= frontier >> one
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        grown &= unvisited
+        if not np.count_nonzero(grown):
+            return dist
+        unvisited ^= grown
+        frontier = grown
+
+
+def build_cluster_record(cluster, cluster_size, grid_dims, scenario_seed, obstacle_density, max_transitions):
+    """
+    Transition cells of one cluster, their pairwise distances through it and
+    their partners across each border, as (nodes, dist, edges) arrays:
+    nodes int64 (n, 2) absolute cells, dist uint32 (n, n), edges int64 (e, 3)
+    rows of (node index, partner row, partner col).
+    """
+    bounds = _cluster_bounds(cluster, cluster_size, grid_dims)
+    r0, r1, c0, c1 = bounds
+    ring = _terrain_with_ring(bounds, grid_dims, scenario_seed, obstacle_density)
+    free = ring[1:-1, 1:-1]
+    height, width = free.shape
+
+    # (local cell on our side, partner offset) for each border, ordered along the border so that
+    # both clusters sharing it pick the same transitions
+    borders = [
+        (ring[1, 1:-1] & ring[0, 1:-1], lambda i: (0, i), (-1, 0)),                    # north
+        (ring[-2, 1:-1] & ring[-1, 1:-1], lambda i: (height - 1, i), (1, 0)),          # south
+        (ring[1:-1, 1] & ring[1:-1, 0], lambda i: (i, 0), (0, -1)),                    # west
+        (ring[1:-1, -2] & ring[1:-1, -1], lambda i: (i, width - 1), (0, 1)),           # east
+    ]
+    node_index = {}
+    edges = []
+    for pair_free, local_cell, (dr, dc) in borders:
+        for i in _select_transitions(pair_free, max_transitions):
+            lr, lc = local_cell(i)
+            index = node_index.setdefault((lr, lc), len(node_index))
+            edges.append((index, r0 + lr + dr, c0 + lc + dc))
+
+    local_nodes = list(node_index)
+    dist = cluster_distances(free, local_nodes, local_nodes)
+    nodes = np.array([(r0 + lr, c0 + lc) for lr, lc in local_nodes], dtype=np.int64).reshape(-1, 2)
+    return nodes, dist, np.array(edges, dtype=np.int64).reshape(-1, 3)
+
+
+# --- Persisted store ---
+class ClusterGraphStore:
+    """
+    Append-only file of cluster records for one map and clustering.
+
+    Existing records are served straight out of an mmap (the arrays returned
+    are views into it); new records are appended to the file and kept in
+    memory until the store is reopened. The file name and header carry every
+    parameter the records depend on, and a header mismatch is an error rather
+    than a silent reuse.
+
+    Several processes can share a file: each record goes out as a single
+    write on an O_APPEND descriptor under an exclusive `flock`, so records
+    from different writers never interleave. Two processes that build the
+    same cluster both append it; the copies are identical and the last one
+    wins.
+    """
+
+    def __init__(self, path, grid_dims, scenario_seed, obstacle_density, cluster_size, max_transitions):
+        self.path = path
+        self._header = _FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, cluster_size, max_transitions or 0,
+                                         scenario_seed, obstacle_density, grid_dims[0], grid_dims[1])
+        self._offsets = {}
+        self._new_records = {}
+        self._mmap = None
+        self._append_fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        with self._locked():
+            if os.fstat(self._append_fd).st_size == 0:
+                _write_all(self._append_fd, self._header.ljust(_FILE_HEADER_SIZE, b"\0"))
+            end = self._map_existing()
+            if end < os.fstat(self._append_fd).st_size:
+                # A writer died mid-record: drop the torn tail so later records line up again
+                os.ftruncate(self._append_fd, end)
+
+    def _locked(self):
+        return _FileLock(self._append_fd)
+
+    def _map_existing(self):
+        """Map the file and index its complete records; returns where the last one ends."""
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            header = f.read(_FILE_HEADER.size)
+            if header != self._header:
+                raise ValueError(f"{self.path} was built for a different map or clustering")
+            if size > _FILE_HEADER_SIZE:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = _FILE_HEADER_SIZE
+        while self._mmap is not None and offset + _RECORD_HEADER.size <= size:
+            cluster_id, n_nodes, n_edges = _RECORD_HEADER.unpack_from(self._mmap, offset)
+            record_size = _record_size(n_nodes, n_edges)
+            if offset + record_size > size:
+                break # torn write at the end of the file: ignore, it gets recomputed
+            self._offsets[cluster_id] = offset
+            offset += record_size
+        return offset
+
+    def __contains__(self, cluster_id):
+        return cluster_id in self._offsets or cluster_id in self._new_records
+
+    def __len__(self):
+        return len(self._offsets) + len(self._new_records)
+
+    def get(self, cluster_id):
+        record = self._new_records.get(cluster_id)
+        if record is not None:
+            return record
+        offset = self._offsets.get(cluster_id)
+        if offset is None:
+            return None
+        _, n_nodes, n_edges = _RECORD_HEADER.unpack_from(self._mmap, offset)
+        offset += _RECORD_HEADER.size
+        nodes = np.frombuffer(self._mmap, dtype=np.int64, count=2 * n_nodes, offset=offset).reshape(n_nodes, 2)
+        offset += 16 * n_nodes
+        dist = np.frombuffer(self._mmap, dtype=np.uint32, count=n_nodes * n_nodes, offset=offset).reshape(n_nodes, n_nodes)
+        offset += _padded(4 * n_nodes * n_nodes)
+        edges = np.frombuffer(self._mmap, dtype=np.int64, count=3 * n_edges, offset=offset).reshape(n_edges, 3)
+        return nodes, dist, edges
+
+    def put(self, cluster_id, record):
+        nodes, dist, edges = record
+        dist_bytes = dist.astype(np.uint32).tobytes()
+        data = b"".join([
+            _RECORD_HEADER.pack(cluster_id, len(nodes), len(edges)),
+            nodes.astype(np.int64).tobytes(),
+            dist_bytes.ljust(_padded(len(dist_bytes)), b"\0"),
+            edges.astype(np.int64).tobytes(),
+        ])
+        with self._locked():
+            _write_all(self._append_fd, data)
+        self._new_records[cluster_id] = record
+
+    def close(self):
+        os.close(self._append_fd)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class _FileLock:
+    """Exclusive `flock` on a descriptor for the duration of a with block."""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def __enter__(self):
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _padded(n_bytes):
+    return (n_bytes + 7) & ~7
+
+
+def _record_size(n_nodes, n_edges):
+    return _RECORD_HEADER.size + 16 * n_nodes + _padded(4 * n_nodes * n_nodes) + 24 * n_edges
+
+
+def cluster_graph_path(cache_dir, grid_dims, scenario_seed, obstacle_density, cluster_size, max_transitions):
+    name = (f"hpa_seed{scenario_seed}_density{obstacle_density:.4f}_{grid_dims[0]}x{grid_dims[1]}"
+            f"_c{cluster_size}_t{max_transitions or 'all'}.bin")
+    return os.path.join(cache_dir, name)
+
+
+# --- Cluster graph ---
+class ClusterGraph:
+    """
+    The abstract graph of one procedural map, built lazily cluster by cluster
+    and backed by a `ClusterGraphStore` (pass `cache_dir=None` to keep it in
+    memory only).
+    """
+
+    def __init__(self, grid_dims, scenario_seed, obstacle_density, cluster_size=DEFAULT_CLUSTER_SIZE,
+                 max_transitions=DEFAULT_MAX_TRANSITIONS, cache_dir=DEFAULT_CACHE_DIR):
+        if not 1 <= cluster_size <= 64:
+            raise ValueError(f"cluster_size must be between 1 and 64, got {cluster_size}")
+        self.grid_dims = grid_dims
+        self.scenario_seed = scenario_seed
+        self.obstacle_density = obstacle_density
+        self.cluster_size = cluster_size
+        self.max_transitions = max_transitions
+        self.clusters_per_row = -(-grid_dims[1] // cluster_size)
+        self.store = None
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = cluster_graph_path(cache_dir, grid_dims, scenario_seed, obstacle_density, cluster_size, max_transitions)
+            self.store = ClusterGraphStore(path, grid_dims, scenario_seed, obstacle_density, cluster_size, max_transitions)
+        self._parsed = {}
+        self.clusters_built = 0
+        self.clusters_loaded = 0
+
+    def cluster_of(self, position):
+        return (position[0] // self.cluster_size, position[1] // self.cluster_size)
+
+    def bounds(self, cluster):
+        return _cluster_bounds(cluster, self.cluster_size, self.grid_dims)
+
+    def cluster(self, cluster):
+        """
+        Parsed record of a cluster: (nodes, index of each node, distance rows,
+        cross-border partners per node), loading or building it on first use.
+        """
+        parsed = self._parsed.get(cluster)
+        if parsed is not None:
+            return parsed
+        cluster_id = cluster[0] * self.clusters_per_row + cluster[1]
+        record = self.store.get(cluster_id) if self.store is not None else None
+        if record is None:
+            record = build_cluster_record(cluster, self.cluster_size, self.grid_dims, self.scenario_seed,
+                                          self.obstacle_density, self.max_transitions)
+            if self.store is not None:
+                self.store.put(cluster_id, record)
+            self.clusters_built += 1
+        else:
+            self.clusters_loaded += 1
+        nodes, dist, edges = record
+        node_list = [tuple(node) for node in nodes.tolist()]
+        partners = [[] for _ in node_list]
+        for index, partner_r, partner_c in edges.tolist():
+            partners[index].append((partner_r, partner_c))
+        parsed = (node_list, {node: i for i, node in enumerate(node_list)}, dist.tolist(), partners)
+        self._parsed[cluster] = parsed
+        return parsed
+
+    def local_distances(self, cluster, source, targets, is_obstacle_func):
+        """Distances from `source` to `targets` inside one cluster, under the query's obstacle callable."""
+        r0, r1, c0, c1 = self.bounds(cluster)
+        free = _query_free_mask((r0, r1, c0, c1), is_obstacle_func)
+        free[source[0] - r0, source[1] - c0] = True
+        local_targets = [(r - r0, c - c0) for r, c in targets]
+        return cluster_distances(free, [(source[0] - r0, source[1] - c0)], local_targets)[0].tolist()
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+
+
+# --- HPA* query ---
+def _query_free_mask(bounds, is_obstacle_func):
+    """Free-cell mask of a cluster under the query's obstacle callable (batched when it supports it)."""
+    r0, r1, c0, c1 = bounds
+    rows = np.repeat(np.arange(r0, r1, dtype=np.int64), c1 - c0)
+    cols = np.tile(np.arange(c0, c1, dtype=np.int64), r1 - r0)
+    batch = getattr(is_obstacle_func, "batch", None)
+    if batch is not None:
+        blocked = batch(rows, cols)
+    else:
+        blocked = np.fromiter((is_obstacle_func((r, c)) for r, c in zip(rows.tolist(), cols.tolist())),
+                              dtype=bool, count=rows.size)
+    return ~blocked.reshape(r1 - r0, c1 - c0)
+
+
+def _refine(cluster_graph, a, b, is_obstacle_func):
+    """
+    A shortest path from a to b inside their cluster, and the number of cells
+    the search reached.
+
+    The cluster is one Python int with a bit per cell (plus an always-blocked
+    guard column so shifts cannot wrap between rows). A BFS wave is four shifts
+    and an AND; the path is read back by stepping from b to any neighbor in the
+    previous wave.
+    """
+    r0, r1, c0, c1 = cluster_graph.bounds(cluster_graph.cluster_of(a))
+    row_bits = c1 - c0 + 1
+    free = np.zeros((r1 - r0, row_bits), dtype=bool)
+    free[:, :-1] = _query_free_mask((r0, r1, c0, c1), is_obstacle_func)
+    free_bits = int.from_bytes(np.packbits(free, bitorder='little').tobytes(), 'little')
+
+    source = (a[0] - r0) * row_bits + (a[1] - c0)
+    target = (b[0] - r0) * row_bits + (b[1] - c0)
+    frontier = 1 << source
+    unvisited = (free_bits | 1 << target) & ~frontier
+    layers = [frontier]
+    while not frontier >> target & 1:
+        frontier = ((frontier << 1) | (frontier >> 1) | (frontier << row_bits) | (frontier >> row_bits)) & unvisited
+        if not frontier:
+            return [], sum(layer.bit_count() for layer in layers)
+        unvisited ^= frontier
+        layers.append(frontier)
+
+    cell = target
+    cells = [cell]
+    for layer in reversed(layers[:-1]):
+        for neighbor in (cell - 1, cell + 1, cell - row_bits, cell + row_bits):
+            if neighbor >= 0 and layer >> neighbor & 1:
+                cell = neighbor
+                break
+        cells.append(cell)
+    path = [(r0 + cell // row_bits, c0 + cell % row_bits) for cell in reversed(cells)]
+    return path, sum(layer.bit_count() for layer in layers)
+
+
+def hpa_star_search(cluster_graph, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit,
+                    abstract_weight=DEFAULT_ABSTRACT_WEIGHT):
+    """
+    Abstract A* over `cluster_graph`, then per-cluster refinement. Returns the
+    usual result dict; `nodes_explored` is abstract pops plus cells reached by
+    the refinement searches, and `max_nodes_explored_limit` caps the abstract
+    search.
+
+    With only a few transitions per border the abstract path often has to
+    step sideways, which raises f a little; plain A* then goes back and
+    settles every cheaper abstract node behind it, and on a 500k map that is
+    a huge band of clusters. `abstract_weight` > 1 trades a bounded amount of
+    path quality for staying on course (1.0 gives plain A*).
+    """
+    start_time = time.perf_counter()
+    cluster_of = cluster_graph.cluster_of
+
+    def cross_border_neighbors(cell):
+        return [(cell[0] + dr, cell[1] + dc) for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0))
+                if 0 <= cell[0] + dr < cluster_graph.grid_dims[0] and 0 <= cell[1] + dc < cluster_graph.grid_dims[1]
+                and cluster_of((cell[0] + dr, cell[1] + dc)) != cluster_of(cell)
+                and not is_obstacle_func((cell[0] + dr, cell[1] + dc))]
+
+    # Cluster records follow the procedural terrain, which blocks a start or goal that the query opens, and
+    # they only cross a border at transitions. So the start and goal also step straight across a border when
+    # they lie on one: those neighbors join the abstract graph like the start does, and the goal's neighbors
+    # are linked to the goal at cost 1.
+    goal_links = set(cross_border_neighbors(goal_pos))
+    extra_targets = {} # cluster -> cells the abstract search must reach inside it besides its transitions
+    for cell in [goal_pos, *goal_links]:
+        extra_targets.setdefault(cluster_of(cell), []).append(cell)
+
+    # Transitions reach the extra targets of their cluster (distances are symmetric)
+    entry_edges = {}
+    for cluster, targets in extra_targets.items():
+        nodes = cluster_graph.cluster(cluster)[0]
+        for target in targets:
+            distances = cluster_graph.local_distances(cluster, target, nodes, is_obstacle_func)
+            for node, d in zip(nodes, distances):
+                if d != UNREACHABLE and node != target:
+                    entry_edges.setdefault(node, []).append((target, d))
+
+    def local_successors(position):
+        """Edges of a cell that is not a transition of its cluster: the start, or a neighbor across a border."""
+        cluster = cluster_of(position)
+        targets = cluster_graph.cluster(cluster)[0] + extra_targets.get(cluster, [])
+        distances = cluster_graph.local_distances(cluster, position, targets, is_obstacle_func)
+        return [(node, d) for node, d in zip(targets, distances) if d != UNREACHABLE and node != position]
+
+    start_h = heuristic_func(start_pos, goal_pos)
+    open_set = [(abstract_weight * start_h, start_h, start_pos)]
+    g_costs = {start_pos: 0}
+    parents = {start_pos: None}
+    closed_set = set()
+    nodes_explored_count = 0
+    limit_reached = False
+    abstract_path = None
+
+    while open_set:
+        if nodes_explored_count >= max_nodes_explored_limit:
+            limit_reached = True
+            break
+        _, _, position = heapq.heappop(open_set)
+        nodes_explored_count += 1
+        if position == goal_pos:
+            abstract_path = []
+            while position is not None:
+                abstract_path.append(position)
+                position = parents[position]
+            abstract_path.reverse()
+            break
+        if position in closed_set:
+            continue
+        closed_set.add(position)
+
+        g = g_costs[position]
+        nodes, node_index, dist, partners = cluster_graph.cluster(cluster_of(position))
+        index = node_index.get(position)
+        if position == start_pos or index is None:
+            successors = local_successors(position)
+        else:
+            successors = [(node, d) for node, d in zip(nodes, dist[index]) if d != UNREACHABLE and node != position]
+            successors += entry_edges.get(position, [])
+        if index is not None:
+            successors += [(partner, 1) for partner in partners[index]]
+        if position == start_pos:
+            successors += [(neighbor, 1) for neighbor in cross_border_neighbors(start_pos)]
+        if position in goal_links:
+            successors.append((goal_pos, 1))
+
+        for successor, cost in successors:
+            if successor in closed_set:
+                continue
+            tentative_g_score = g + cost
+            if tentative_g_score < g_costs.get(successor, float('inf')):
+                g_costs[successor] = tentative_g_score
+                parents[successor] = position
+                h_score = heuristic_func(successor, goal_pos)
+                heapq.heappush(open_set, (tentative_g_score + abstract_weight * h_score, h_score, successor))
+
+    path = []
+    if abstract_path is not None:
+        path = [start_pos]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1:
+                path.append(b)
+                continue
+            segment, refine_reached = _refine(cluster_graph, a, b, is_obstacle_func)
+            nodes_explored_count += refine_reached
+            if not segment:
+                path = [] # the obstacle callable disagrees with the procedural terrain here
+                break
+            path.extend(segment[1:])
+
+    end_time = time.perf_counter()
+    return {
+        "path": path,
+        "score": len(path) - 1 if path else float('inf'),
+        "time": end_time - start_time,
+        "nodes_explored": nodes_explored_count,
+        "limit_reached": limit_reached,
+        "algorithm": "HPA*"
+    }
@@ -0,0 +1,246 @@
+"""
+Jump Point Search for the 4-connected, uniform-cost implicit grid.
+
+On open terrain A* pushes huge numbers of symmetric, equal-cost cells. JPS
+only puts "jump points" on the open set: cells where a straight scan meets the
+goal, a forced neighbor (an obstacle that ends right behind the scan), or,
+for vertical scans, a row whose horizontal scan finds a jump point. This is
+the 4-connected variant (vertical moves play the role diagonal moves have in
+8-connected JPS), so path costs are the same as A*.
+
+Horizontal scans are the bulk of the work. When `is_obstacle_func` is a bound
+`ObstacleField` they read whole tile rows and look for the forced-neighbor
+pattern with `bytes.find`; any other callable is scanned one cell at a time.
+
+Scans are capped at `max_jump` cells: the last cell of a capped scan is treated
+as a jump point, which keeps the search optimal (it is an extra stop, not a
+skipped cell) and keeps scans on the 500k-wide, almost empty maps bounded.
+The horizontal probes inside a vertical scan would hit the cap on every row of
+open terrain, and stopping there puts a jump point on every row. Instead,
+when the jump point's own horizontal scan that way pushed a jump point j
+cells along, the probes that way only cover those j cells and let the scan
+go on when they find nothing: anything further along the row is reached at
+the same cost down that jump point's column. Once a probe that way hits a
+wall, that column may be cut off, and the probes go back to full capped scans
+that stop the vertical scan at the cap. The side a jump point was reached
+from is covered the same way by its parent's column.
+
+`nodes_explored` counts expanded jump points, and the returned path is
+expanded back to every cell, so the result dict matches `a_star_search_implicit`.
+"""
+import heapq
+import time
+
+DEFAULT_MAX_JUMP = 1024
+# Scans read rows in chunks that start small (most scans stop after a few cells) and double
+FIRST_SCAN_CHUNK = 16
+MAX_SCAN_CHUNK = 256
+
+_BLOCKED = b"\x01"
+_FORCED_PATTERN = b"\x01\x00" # side cell blocked behind the scan, open beside the current cell
+
+ALL_DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class _GridScanner:
+    """Bounds-aware obstacle access for one query (1 = blocked, including off-grid cells)."""
+
+    def __init__(self, grid_dims, start_pos, goal_pos, is_obstacle_func):
+        self.n_rows, self.n_cols = grid_dims
+        self.is_obstacle_func = is_obstacle_func
+        field = getattr(is_obstacle_func, "field", None)
+        self.field = field
+        if field is not None:
+            self.blocked_endpoints = [p for p in (start_pos, goal_pos) if field.is_obstacle(p)]
+
+    def blocked(self, r, c):
+        if not (0 <= r < self.n_rows and 0 <= c < self.n_cols):
+            return True
+        return self.is_obstacle_func((r, c))
+
+    def row(self, r, lo, hi):
+        """Blocked flags of row r, columns [lo, hi), as bytes."""
+        if not (0 <= r < self.n_rows):
+            return _BLOCKED * (hi - lo)
+        in_lo = max(lo, 0)
+        in_hi = min(hi, self.n_cols)
+        if self.field is None:
+            body = bytes(1 if self.is_obstacle_func((r, c)) else 0 for c in range(in_lo, in_hi))
+        else:
+            body = self.field.row_bytes(r, in_lo, in_hi)
+            for er, ec in self.blocked_endpoints:
+                if er == r and in_lo <= ec < in_hi:
+                    patched = bytearray(body)
+                    patched[ec - in_lo] = 0
+                    body = bytes(patched)
+        if in_lo > lo or in_hi < hi:
+            body = _BLOCKED * (in_lo - lo) + body + _BLOCKED * (hi - in_hi)
+        return body
+
+
+# --- Jumps ---
+def _jump_horizontal(scanner, r, c, dc, goal_pos, max_jump):
+    """Scan from (r, c) in column direction dc; (r, c - dc) is the open cell we came from.
+
+    Returns (jump point or None, whether the scan stopped at the cap).
+    """
+    goal_r, goal_c = goal_pos
+    travelled = 0
+    chunk = FIRST_SCAN_CHUNK
+    while travelled < max_jump:
+        span = min(chunk, max_jump - travelled)
+        chunk = min(chunk * 2, MAX_SCAN_CHUNK)
+        # Index 0 is the column behind the first cell, index i + 1 is the i-th scanned cell
+        if dc == 1:
+            lo, hi = c - 1, c + span
+            current, above, below = scanner.row(r, lo, hi), scanner.row(r - 1, lo, hi), scanner.row(r + 1, lo, hi)
+        else:
+            lo, hi = c - span + 1, c + 2
+            current = scanner.row(r, lo, hi)[::-1]
+            above = scanner.row(r - 1, lo, hi)[::-1]
+            below = scanner.row(r + 1, lo, hi)[::-1]
+
+        wall = current.find(_BLOCKED, 1)
+        end = wall if wall != -1 else span + 1 # indices [1, end) are open cells
+        stops = [above.find(_FORCED_PATTERN, 0, end), below.find(_FORCED_PATTERN, 0, end)]
+        if r == goal_r:
+            goal_index = (goal_c - c) * dc
+            if 0 <= goal_index < end - 1:
+                stops.append(goal_index)
+        stops = [i for i in stops if i != -1]
+        if stops:
+            return (r, c + min(stops) * dc), False
+        if wall != -1:
+            return None, False
+        travelled += span
+        c += span * dc
+    return (r, c - dc), True # capped: the last open cell becomes a jump point
+
+
+def _jump_vertical(scanner, r, c, dr, goal_pos, max_jump, side_reach):
+    """Scan from (r, c) in row direction dr, probing each row horizontally.
+
+    side_reach maps each column direction to how far that way the probes need
+    to look (0 = a full, capped scan; see the module docstring).
+    """
+    blocked = scanner.blocked
+    side_reach = dict(side_reach)
+    for _ in range(max_jump):
+        if blocked(r, c):
+            return None
+        if (r, c) == goal_pos:
+            return (r, c)
+        if ((not blocked(r, c - 1) and blocked(r - dr, c - 1)) or
+                (not blocked(r, c + 1) and blocked(r - dr, c + 1))):
+            return (r, c)
+        for dc in (1, -1):
+            reach = side_reach[dc]
+            jump_point, capped = _jump_horizontal(scanner, r, c + dc, dc, goal_pos, reach or max_jump)
+            if jump_point is None:
+                side_reach[dc] = 0
+            elif not (capped and reach):
+                return (r, c)
+        r += dr
+    return (r - dr, c) # capped
+
+
+def _pruned_directions(position, parent):
+    if parent is None:
+        return ALL_DIRECTIONS
+    dr = (position[0] > parent[0]) - (position[0] < parent[0])
+    dc = (position[1] > parent[1]) - (position[1] < parent[1])
+    if dc: # arrived horizontally: keep going, or turn up/down
+        return ((0, dc), (1, 0), (-1, 0))
+    return ((dr, 0), (0, 1), (0, -1))
+
+
+def _expand_path(jump_points):
+    """Fill in the straight segments between consecutive jump points."""
+    path = [jump_points[0]]
+    for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        r, c = r0, c0
+        while (r, c) != (r1, c1):
+            r += dr
+            c += dc
+            path.append((r, c))
+    return path
+
+
+# --- Jump Point Search ---
+def jump_point_search_implicit(grid_dims, start_pos, goal_pos, heuristic_func, is_obstacle_func, max_nodes_explored_limit,
+                               max_jump=DEFAULT_MAX_JUMP):
+    start_time = time.perf_counter()
+    scanner = _GridScanner(grid_dims, start_pos, goal_pos, is_obstacle_func)
+
+    start_h = heuristic_func(start_pos, goal_pos)
+    open_set = [(start_h, start_h, start_pos)]
+    g_costs = {start_pos: 0}
+    parents = {start_pos: None}
+    closed_set = set()
+    nodes_explored_count = 0
+    limit_reached = False
+
+    while open_set:
+        if nodes_explored_count >= max_nodes_explored_limit:
+            limit_reached = True
+            break
+
+        f, h, position = heapq.heappop(open_set)
+        nodes_explored_count += 1
+
+        if position == goal_pos:
+            jump_points = []
+            current = position
+            while current is not None:
+                jump_points.append(current)
+                current = parents[current]
+            end_time = time.perf_counter()
+            return {
+                "path": _expand_path(jump_points[::-1]),
+                "score": g_costs[position],
+                "time": end_time - start_time,
+                "nodes_explored": nodes_explored_count,
+                "limit_reached": False,
+                "algorithm": "JPS"
+            }
+
+        if position in closed_set:
+            continue # superseded duplicate
+        closed_set.add(position)
+
+        r, c = position
+        g = g_costs[position]
+        parent = parents[position]
+        directions = _pruned_directions(position, parent)
+        jump_points = []
+        # The side we came from is covered by the parent's column
+        side_reach = {1: 0, -1: 0} if parent is None else {1: max(parent[1] - c, 0), -1: max(c - parent[1], 0)}
+        for dr, dc in directions: # horizontal scans come first, the vertical ones need their outcome
+            if dc:
+                jump_point, _ = _jump_horizontal(scanner, r, c + dc, dc, goal_pos, max_jump)
+                side_reach[dc] = 0 if jump_point is None else abs(jump_point[1] - c)
+                jump_points.append(jump_point)
+        for dr, dc in directions:
+            if dr:
+                jump_points.append(_jump_vertical(scanner, r + dr, c, dr, goal_pos, max_jump, side_reach))
+        for jump_point in jump_points:
+            if jump_point is None or jump_point in closed_set:
+                continue
+            tentative_g_score = g + abs(jump_point[0] - r) + abs(jump_point[1] - c)
+            if tentative_g_score < g_costs.get(jump_point, float('inf')):
+                g_costs[jump_point] = tentative_g_score
+                parents[jump_point] = position
+                h_score = heuristic_func(jump_point, goal_pos)
+                heapq.heappush(open_set, (tentative_g_score + h_score, h_score, jump_point))
+
+    end_time = time.perf_counter()
+    return {
+        "path": [],
+        "score": float('inf'),
+        "time": end_time - start_time,
+        "nodes_explored": nodes_explored_count,
+        "limit_reached": limit_reached,
+        "algorithm": "JPS"
+    }
@@ -0,0 +1,373 @@
+"""
+ALT (A*, landmarks, triangle inequality) heuristics for one region of a map.
+
+Manhattan distance knows nothing about obstacles, so at 25-40% density A*
+pops far more cells than the path is long. With exact distances D(L, .) from
+a few landmark cells L, the triangle inequality gives a lower bound
+|D(L, b) - D(L, a)| on d(a, b), which already includes the detours.
+
+The maps are unbounded, so the tables cover one rectangular region (for
+example `grid_file.scenario_window` around a scenario) and D is the BFS
+distance *inside* it. That can exceed the true distance when the best path
+leaves the region, but a path that leaves costs at least e(a) + e(b), where
+e(x) is the cost of stepping out of the region from x. So the landmark
+bound is capped at e(a) + e(b), and the heuristic is
+
+    max(manhattan(a, b), min(max_L |D(L, b) - D(L, a)|, e(a) + e(b)))
+
+which is admissible and consistent. Outside the region it is plain Manhattan.
+The tables are BFS over the terrain, but searches open their start and goal
+even when the terrain blocks them, and a path through such a cell can be
+shorter than the table says. So when no landmark reaches the start or the
+goal (it is blocked, or walled into a pocket), the heuristic is plain
+Manhattan for that query.
+Sides of the region on the edge of the grid cannot be left, so a region
+covering the whole grid (a `GridFile`, say) gives the uncapped ALT bound.
+
+Landmarks are picked by farthest-point selection inside the region's main
+component: each one is the free cell whose nearest landmark is furthest
+away, which tends to put them on the region's rim behind obstacles. Distances
+are stored cell-major (all landmarks of a cell next to each other) as uint16,
+or uint32 when a distance does not fit. Tables for a procedural region can be
+cached in `cache_dir`, one file per seed, density, region and landmark
+count. The file is memory-mapped when it is reopened.
+
+    table = get_landmark_table(seed, density, origin, shape, n_landmarks=8, cache_dir=".alt_cache")
+    a_star_search_implicit(dims, start, goal, table.heuristic_for(start, goal), is_obstacle_func, limit)
+"""
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from obstacle_field import obstacle_mask
+
+DEFAULT_LANDMARKS = 8
+DEFAULT_ALT_CACHE_DIR = ".alt_cache"
+HEURISTIC_BLOCK = 32 # cells per side of the blocks the heuristic is computed in
+HEURISTIC_GOALS_CACHED = 16
+_NO_EXIT = 1 << 40 # exit cost of a region that cannot be left
+
+_FILE_MAGIC = b"ALTTABLE"
+_FILE_VERSION = 1
+# magic, version, landmark count, bytes per distance, seed, density, origin row, origin col, rows, cols
+_FILE_HEADER = struct.Struct("<8sHHIqdqqqq")
+_FILE_HEADER_SIZE = 64
+
+
+# --- Distance tables ---
+def bfs_distances(free, source, dtype=np.uint32):
+    """
+    BFS distances from `source` (local (row, col)) over the 4-connected `free`
+    mask, as a flat array; unreachable and blocked cells hold the dtype's max.
+    Works wave by wave on flat index arrays with a blocked border, so each
+    wave is a few NumPy calls however large the region.
+    """
+    rows, cols = free.shape
+    width = cols + 2
+    open_cells = np.zeros((rows + 2, width), dtype=bool)
+    open_cells[1:-1, 1:-1] = free
+    open_cells = open_cells.ravel()
+    unreached = np.iinfo(dtype).max
+    dist = np.full(open_cells.size, unreached, dtype=dtype)
+    frontier = np.array([(source[0] + 1) * width + source[1] + 1], dtype=np.int64)
+    if not open_cells[frontier[0]]:
+        return dist.reshape(rows + 2, width)[1:-1, 1:-1].ravel() # blocked source reaches nothing
+    dist[frontier] = 0
+    open_cells[frontier] = False # open_cells doubles as "not reached yet"
+    offsets = np.array([1, -1, width, -width], dtype=np.int64)
+    wave = 0
+    while frontier.size:
+        wave += 1
+        if wave >= unreached:
+            raise OverflowError(f"distances do not fit {np.dtype(dtype).name}")
+        neighbors = (frontier[:, None] + offsets).ravel()
+        neighbors = np.unique(neighbors[open_cells[neighbors]])
+        open_cells[neighbors] = False
+        dist[neighbors] = wave
+        frontier = neighbors
+    return dist.reshape(rows + 2, width)[1:-1, 1:-1].ravel()
+
+
+def select_landmarks(free, n_landmarks, seed_tries=8):
+    """
+    Farthest-point landmarks on `free`: [(local position, uint32 distance array)].
+    Dense maps are full of small enclosed pockets, so selection stays in one
+    big component: the free cell nearest the centre whose BFS reaches the
+    most cells (of `seed_tries` candidates) seeds it, and the first landmark
+    is the cell farthest from that seed.
+    """
+    rows, cols = free.shape
+    free_cells = np.flatnonzero(free)
+    if free_cells.size == 0:
+        return []
+    unreached = np.iinfo(np.uint32).max
+    central = free_cells[np.argsort(np.abs(free_cells // cols - rows // 2) + np.abs(free_cells % cols - cols // 2))]
+    nearest = None
+    for cell in central[:seed_tries].tolist():
+        dist = bfs_distances(free, (cell // cols, cell % cols))
+        if nearest is None or np.count_nonzero(dist != unreached) > np.count_nonzero(nearest != unreached):
+            nearest = dist
+        if np.count_nonzero(nearest != unreached) * 2 > free_cells.size:
+            break
+    nearest = nearest.astype(np.int64)
+    outside = nearest == unreached # blocked, or another component: never a landmark
+    landmarks = []
+    while len(landmarks) < n_landmarks:
+        score = np.where(outside, -1, nearest)
+        pick = int(np.argmax(score))
+        if score[pick] <= 0:
+            break
+        position = (pick // cols, pick % cols)
+        dist = bfs_distances(free, position)
+        landmarks.append((position, dist))
+        nearest = np.minimum(nearest, dist)
+    return landmarks
+
+
+# --- Tables and heuristic ---
+class LandmarkTable:
+    """
+    Landmark distances for one region: `origin` (global top-left cell), `shape`,
+    `landmarks` (global positions) and `distances`, a (cells, landmarks) array,
+    cell-major, where the dtype max means unreachable. `grid_dims` tells
+    which region sides lie on the grid edge (they cannot be left).
+    """
+
+    def __init__(self, origin, shape, landmarks, distances, grid_dims=None):
+        self.origin = tuple(origin)
+        self.shape = tuple(shape)
+        self.landmarks = [tuple(position) for position in landmarks]
+        self.distances = distances
+        self.unreachable = int(np.iinfo(distances.dtype).max)
+        self._flat = memoryview(np.ascontiguousarray(distances).reshape(-1)) # plain ints per index
+        r0, c0 = self.origin
+        rows, cols = self.shape
+        if grid_dims is None:
+            self.open_sides = (True, True, True, True)
+        else:
+            self.open_sides = (r0 > 0, r0 + rows < grid_dims[0], c0 > 0, c0 + cols < grid_dims[1])
+
+    @classmethod
+    def build(cls, free, origin, n_landmarks=DEFAULT_LANDMARKS, grid_dims=None):
+        """Pick landmarks on the `free` mask of a region and store their distances compactly."""
+        picked = select_landmarks(free, n_landmarks)
+        if not picked:
+            raise ValueError("the region has no free cell to put a landmark on")
+        distances = np.stack([dist for _, dist in picked], axis=1)
+        unreached = np.iinfo(np.uint32).max
+        longest = int(distances[distances != unreached].max())
+        if longest < np.iinfo(np.uint16).max:
+            distances = np.where(distances == unreached, np.iinfo(np.uint16).max, distances).astype(np.uint16)
+        landmarks = [(origin[0] + r, origin[1] + c) for (r, c), _ in picked]
+        return cls(origin, free.shape, landmarks, distances, grid_dims)
+
+    def distances_at(self, position):
+        """Distances from every landmark to a global position, or None outside the region."""
+        r, c = position[0] - self.origin[0], position[1] - self.origin[1]
+        if not (0 <= r < self.shape[0] and 0 <= c < self.shape[1]):
+            return None
+        k = len(self.landmarks)
+        base = (r * self.shape[1] + c) * k
+        return list(self._flat[base:base + k])
+
+    def exit_cost(self, position):
+        """Lower bound on the cost of any path from `position` that leaves the region (inf if none can)."""
+        r, c = position[0] - self.origin[0], position[1] - self.origin[1]
+        top, bottom, left, right = self.open_sides
+        rows, cols = self.shape
+        cost = float('inf')
+        if top:
+            cost = r + 1
+        if bottom:
+            cost = min(cost, rows - r)
+        if left:
+            cost = min(cost, c + 1)
+        if right:
+            cost = min(cost, cols - c)
+        return cost
+
+    def lower_bound(self, a, b, landmark_indices=None):
+        """The capped landmark bound on d(a, b), without the Manhattan term (0 if there is no information)."""
+        da, db = self.distances_at(a), self.distances_at(b)
+        if da is None or db is None:
+            return 0
+        best = 0
+        for k in (range(len(self.landmarks)) if landmark_indices is None else landmark_indices):
+            if da[k] != self.unreachable and db[k] != self.unreachable:
+                best = max(best, abs(da[k] - db[k]))
+        return min(best, self.exit_cost(a) + self.exit_cost(b))
+
+    def heuristic_for(self, start_pos, goal_pos, n_active=None):
+        """
+        `heuristic_func(a, b)` using the `n_active` landmarks with the best bound
+        between start and goal (None = all of them). It remembers the last `b`,
+        so the searches' one-goal calls cost one table read per landmark.
+        Fewer active landmarks make each call cheaper, but on these maps the
+        bound at the start is a poor guide and all 8 usually pay for themselves.
+        When no landmark reaches the start or the goal it is plain Manhattan.
+        """
+        indices = list(range(len(self.landmarks)))
+        ds, dg = self.distances_at(start_pos), self.distances_at(goal_pos)
+        if any(d is not None and all(x == self.unreachable for x in d) for d in (ds, dg)):
+            return _manhattan # an endpoint the tables cannot see past (see the module docstring)
+        if n_active is not None and ds is not None and dg is not None:
+            unreachable = self.unreachable
+            indices.sort(key=lambda k: -abs(ds[k] - dg[k]) if unreachable not in (ds[k], dg[k]) else 0)
+            indices = indices[:n_active]
+        return self._make_heuristic(indices)
+
+    def _bound_block(self, block_r, block_c, goal_distances, landmark_indices, goal_exit):
+        """
+        The capped landmark bound (no Manhattan term) for one HEURISTIC_BLOCK-square
+        block of the region, row-major and padded to the full block, as a memoryview.
+        """
+        size = HEURISTIC_BLOCK
+        rows, cols = self.shape
+        r = np.arange(block_r * size, min((block_r + 1) * size, rows), dtype=np.int64)[:, None]
+        c = np.arange(block_c * size, min((block_c + 1) * size, cols), dtype=np.int64)[None, :]
+        cells = self.distances[(r * cols + c).ravel()][:, landmark_indices].astype(np.int64)
+        diffs = np.abs(cells - np.asarray(goal_distances, dtype=np.int64))
+        diffs[cells == self.unreachable] = 0
+        best = diffs.max(axis=1).reshape(r.size, c.size)
+        top, bottom, left, right = self.open_sides
+        exit_costs = np.full(best.shape, _NO_EXIT, dtype=np.int64)
+        if top:
+            exit_costs = np.minimum(exit_costs, r + 1)
+        if bottom:
+            exit_costs = np.minimum(exit_costs, rows - r)
+        if left:
+            exit_costs = np.minimum(exit_costs, c + 1)
+        if right:
+            exit_costs = np.minimum(exit_costs, cols - c)
+        padded = np.zeros((size, size), dtype=np.int64)
+        padded[:r.size, :c.size] = np.minimum(best, exit_costs + min(goal_exit, _NO_EXIT))
+        return memoryview(padded.ravel())
+
+    def _make_heuristic(self, indices):
+        """
+        The search loops call the heuristic for every pushed cell, so the bound is
+        worked out with NumPy a block at a time, the first time a search touches
+        the block, and each call is a dict get plus an index, as with the tiles of
+        `ObstacleField`. Blocks are kept per goal, for the last few goals.
+        """
+        r0, c0 = self.origin
+        rows, cols = self.shape
+        shift = HEURISTIC_BLOCK.bit_length() - 1
+        mask = HEURISTIC_BLOCK - 1
+        per_goal = {} # goal -> block dict, or None when the landmarks say nothing about that goal
+        last_goal = None
+        blocks = None
+
+        def goal_blocks(goal):
+            distances = self.distances_at(goal)
+            if distances is None:
+                return None
+            usable = [k for k in indices if distances[k] != self.unreachable]
+            if not usable:
+                return None
+            if len(per_goal) >= HEURISTIC_GOALS_CACHED:
+                per_goal.clear()
+            state = {}
+            goal_distances = [distances[k] for k in usable]
+            goal_exit = self.exit_cost(goal)
+
+            def load(key):
+                state[key] = block = self._bound_block(key >> 32, key & 0xFFFFFFFF, goal_distances, usable, goal_exit)
+                return block
+
+            state["load"] = load
+            return state
+
+        def heuristic_func(a, b):
+            nonlocal last_goal, blocks
+            manhattan = abs(a[0] - b[0]) + abs(a[1] - b[1])
+            if b != last_goal:
+                last_goal = b
+                if b not in per_goal:
+                    per_goal[b] = goal_blocks(b)
+                blocks = per_goal[b]
+            ar, ac = a[0] - r0, a[1] - c0
+            if blocks is None or not (0 <= ar < rows and 0 <= ac < cols):
+                return manhattan
+            key = (ar >> shift) << 32 | (ac >> shift)
+            block = blocks.get(key)
+            if block is None:
+                block = blocks["load"](key)
+            bound = block[(ar & mask) << shift | (ac & mask)]
+            return bound if bound > manhattan else manhattan
+
+        heuristic_func.landmark_table = self
+        return heuristic_func
+
+    # --- Files ---
+    def save(self, path, scenario_seed=0, obstacle_density=0.0):
+        header = _FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, len(self.landmarks), self.distances.dtype.itemsize,
+                                   scenario_seed, obstacle_density, self.origin[0], self.origin[1],
+                                   self.shape[0], self.shape[1])
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(header.ljust(_FILE_HEADER_SIZE, b"\0"))
+            f.write(np.asarray(self.landmarks, dtype=np.int64).tobytes())
+            f.write(np.ascontiguousarray(self.distances).tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, grid_dims=None):
+        """Open a saved table; the distances are a view into a read-only mmap of the file."""
+        with open(path, "rb") as f:
+            header = f.read(_FILE_HEADER_SIZE)
+            if len(header) < _FILE_HEADER_SIZE or header[:8] != _FILE_MAGIC:
+                raise ValueError(f"{path} is not a landmark table")
+            (_, version, n_landmarks, itemsize, _, _, origin_r, origin_c,
+             rows, cols) = _FILE_HEADER.unpack_from(header)
+            if version != _FILE_VERSION:
+                raise ValueError(f"{path} has landmark table version {version}, expected {_FILE_VERSION}")
+            expected = _FILE_HEADER_SIZE + 16 * n_landmarks + rows * cols * n_landmarks * itemsize
+            if os.fstat(f.fileno()).st_size != expected:
+                raise ValueError(f"{path} is truncated or corrupt ({expected} bytes expected)")
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        landmarks = np.frombuffer(buffer, dtype=np.int64, count=2 * n_landmarks, offset=_FILE_HEADER_SIZE)
+        distances = np.frombuffer(buffer, dtype=np.uint16 if itemsize == 2 else np.uint32,
+                                  offset=_FILE_HEADER_SIZE + 16 * n_landmarks).reshape(rows * cols, n_landmarks)
+        return cls((origin_r, origin_c), (rows, cols), landmarks.reshape(n_landmarks, 2).tolist(), distances, grid_dims)
+
+
+def _manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def landmark_table_path(cache_dir, scenario_seed, obstacle_density, origin, shape, n_landmarks):
+    name = (f"alt_s{scenario_seed}_d{obstacle_density:.4f}_o{origin[0]}x{origin[1]}"
+            f"_r{shape[0]}x{shape[1]}_l{n_landmarks}.bin")
+    return os.path.join(cache_dir, name)
+
+
+def get_landmark_table(scenario_seed, obstacle_density, origin, shape, n_landmarks=DEFAULT_LANDMARKS,
+                       grid_dims=None, cache_dir=None):
+    """
+    Landmark table for a region of a procedural map. With `cache_dir`, a table
+    saved earlier is memory-mapped instead of rebuilt, and a new one is saved.
+    The table's `build_time` is the seconds spent building or loading it.
+    """
+    started = time.perf_counter()
+    path = None
+    if cache_dir is not None:
+        path = landmark_table_path(cache_dir, scenario_seed, obstacle_density, origin, shape, n_landmarks)
+        if os.path.exists(path):
+            table = LandmarkTable.load(path, grid_dims)
+            table.loaded = True
+            table.build_time = time.perf_counter() - started
+            return table
+    rows = np.arange(origin[0], origin[0] + shape[0], dtype=np.int64)[:, None]
+    cols = np.arange(origin[1], origin[1] + shape[1], dtype=np.int64)[None, :]
+    free = ~obstacle_mask(rows, cols, scenario_seed, obstacle_density)
+    table = LandmarkTable.build(free, origin, n_landmarks, grid_dims)
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        table.save(path, scenario_seed, obstacle_density)
+    table.loaded = False
+    table.build_time = time.perf_counter() - started
+    return table
@@ -0,0 +1,277 @@
+"""
+Tile-cached, NumPy-vectorized version of the procedural obstacle map.
+
+`is_obstacle_procedural` hashes one cell at a time in pure Python, and the
+same cells get hashed again by A*, by every beam width and by every scenario
+that shares a seed. `ObstacleField` computes whole tiles at once with the
+exact same LCG/XOR mixing as `get_deterministic_pseudo_random_for_pos` and
+keeps them in a bounded LRU cache.
+
+A bound field is a drop-in replacement for the `functools.partial` of
+`is_obstacle_procedural` used by the experiment driver:
+
+    field = get_obstacle_field(seed, density)
+    is_obstacle_func = field.bind(start, goal)
+    a_star_search_implicit(dims, start, goal, heuristic_manhattan, is_obstacle_func, limit)
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+# Same constants as get_deterministic_pseudo_random_for_pos
+_LCG_A = np.uint64(1664525)
+_LCG_C = np.uint64(1013904223)
+_MASK_32 = np.uint64(0xFFFFFFFF)
+_HASH_R = np.uint64(2654435761)
+_HASH_C = np.uint64(334214459)
+
+DEFAULT_TILE_SIZE = 256
+DEFAULT_MAX_TILES = 1024 # 1024 tiles of 256x256 bytes = 64 MiB
+
+
+# --- Vectorized hashing ---
+def pseudo_random_lcg_values(rows, cols, scenario_seed):
+    """
+    Vectorized `get_deterministic_pseudo_random_for_pos`, returning the raw
+    32-bit LCG output (divide by 2**32 for the float the scalar version returns).
+
+    Only the low 32 bits of the mixed state survive the `& (m - 1)` mask, and the
+    low 32 bits of products, sums and XORs only depend on the low 32 bits of their
+    operands, so wrapping uint64 arithmetic is bit-for-bit identical to Python's
+    unbounded ints (negative coordinates included, via two's complement).
+    """
+    r = np.asarray(rows, dtype=np.int64).astype(np.uint64)
+    c = np.asarray(cols, dtype=np.int64).astype(np.uint64)
+    seed = np.uint64(scenario_seed & 0xFFFFFFFFFFFFFFFF)
+
+    with np.errstate(over='ignore'): # wrap-around is intended, see above
+        val_r = r * _HASH_R
+        val_c = c * _HASH_C
+        initial_state = (val_r ^ val_c ^ seed) + (val_r + seed) + (val_c + seed)
+        initial_state &= _MASK_32
+        return ((_LCG_A * initial_state + _LCG_C) & _MASK_32).astype(np.uint32)
+
+
+def obstacle_threshold(obstacle_density):
+    """
+    Integer form of `random_val < obstacle_density`.
+
+    random_val is lcg_val / 2**32 and both the division and density * 2**32 are
+    exact in float64, so the comparison can be done on the raw LCG values.
+    """
+    if obstacle_density <= 0:
+        return 0
+    return min(int(np.ceil(obstacle_density * 2**32)), 2**32)
+
+
+def obstacle_mask(rows, cols, scenario_seed, obstacle_density):
+    """Boolean obstacle mask for arbitrary coordinate arrays (start/goal not excluded)."""
+    lcg_vals = pseudo_random_lcg_values(rows, cols, scenario_seed)
+    return lcg_vals.astype(np.uint64) < np.uint64(obstacle_threshold(obstacle_density))
+
+
+def compute_tile(tile_r, tile_c, tile_size, scenario_seed, obstacle_density):
+    """Obstacle mask of one tile as a (tile_size, tile_size) bool array."""
+    r0 = tile_r * tile_size
+    c0 = tile_c * tile_size
+    rows = np.arange(r0, r0 + tile_size, dtype=np.int64)[:, None]
+    cols = np.arange(c0, c0 + tile_size, dtype=np.int64)[None, :]
+    return obstacle_mask(rows, cols, scenario_seed, obstacle_density)
+
+
+# --- Tile cache ---
+class ObstacleField:
+    """
+    Procedural terrain for one (scenario_seed, obstacle_density) pair.
+
+    Tiles are stored as `bytes` (one byte per cell) so single-cell lookups from
+    the search loops are a plain index instead of a NumPy scalar access; batch
+    lookups wrap the same buffer with `np.frombuffer` without copying.
+    The field itself does not know about start/goal; use `bind` for that.
+    """
+
+    def __init__(self, scenario_seed, obstacle_density, tile_size=DEFAULT_TILE_SIZE, max_tiles=DEFAULT_MAX_TILES):
+        if tile_size <= 0 or tile_size & (tile_size - 1):
+            raise ValueError(f"tile_size must be a positive power of two, got {tile_size}")
+        if max_tiles < 1:
+            raise ValueError(f"max_tiles must be at least 1, got {max_tiles}")
+        self.scenario_seed = scenario_seed
+        self.obstacle_density = obstacle_density
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self._shift = tile_size.bit_length() - 1
+        self._mask = tile_size - 1
+        self._tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load_tile(self, key):
+        tile_r, tile_c = key
+        tile = compute_tile(tile_r, tile_c, self.tile_size, self.scenario_seed, self.obstacle_density)
+        data = tile.astype(np.uint8).tobytes()
+        self._tiles[key] = data
+        self.misses += 1
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+            self.evictions += 1
+        return data
+
+    def get_tile(self, tile_r, tile_c):
+        """Return the tile at tile coordinates (tile_r, tile_c) as bytes, computing it if needed."""
+        key = (tile_r, tile_c)
+        data = self._tiles.get(key)
+        if data is None:
+            return self._load_tile(key)
+        self.hits += 1
+        self._tiles.move_to_end(key)
+        return data
+
+    def is_obstacle(self, position):
+        """Terrain lookup for a single cell, equal to the procedural hash (no start/goal exception)."""
+        r, c = position
+        shift = self._shift
+        key = (r >> shift, c >> shift)
+        data = self._tiles.get(key)
+        if data is None:
+            data = self._load_tile(key)
+        else:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+        return data[((r & self._mask) << shift) | (c & self._mask)] == 1
+
+    def row_bytes(self, r, c0, c1):
+        """Terrain of row r, columns [c0, c1), as bytes (1 = obstacle, no start/goal exception)."""
+        shift = self._shift
+        mask = self._mask
+        row_offset = (r & mask) << shift
+        if c0 >> shift == (c1 - 1) >> shift: # within one tile
+            start = row_offset + (c0 & mask)
+            return self.get_tile(r >> shift, c0 >> shift)[start:start + (c1 - c0)]
+        parts = []
+        c = c0
+        while c < c1:
+            tile_end = ((c >> shift) + 1) << shift
+            c_end = min(c1, tile_end)
+            tile = self.get_tile(r >> shift, c >> shift)
+            parts.append(tile[row_offset + (c & mask):row_offset + (c & mask) + (c_end - c)])
+            c = c_end
+        return b"".join(parts)
+
+    def is_obstacle_batch(self, rows, cols):
+        """Terrain lookup for arrays of coordinates, returning a bool array (no start/goal exception)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        if rows.size == 0:
+            return np.zeros(rows.shape, dtype=bool)
+        shift = self._shift
+        tile_span = 1 << 31 # more tile columns than any grid has
+        tile_ids = ((rows >> shift) * tile_span + (cols >> shift)).ravel()
+        offsets = (((rows & self._mask) << shift) | (cols & self._mask)).ravel()
+        first_id = int(tile_ids[0])
+        if first_id == tile_ids.min() == tile_ids.max():
+            # Search batches are local, so they usually fall in a single tile
+            tile = np.frombuffer(self.get_tile(*divmod(first_id, tile_span)), dtype=np.uint8)
+            return (tile[offsets] == 1).reshape(rows.shape)
+        result = np.empty(offsets.size, dtype=bool)
+        unique_ids, inverse = np.unique(tile_ids, return_inverse=True)
+        for i, tile_id in enumerate(unique_ids.tolist()):
+            selector = inverse == i
+            tile = np.frombuffer(self.get_tile(*divmod(tile_id, tile_span)), dtype=np.uint8)
+            result[selector] = tile[offsets[selector]] == 1
+        return result.reshape(rows.shape)
+
+    def bind(self, start_pos, goal_pos):
+        """Callable with the `is_obstacle_func(position)` signature the search functions expect."""
+        return bind_obstacle_field(self, start_pos, goal_pos)
+
+    def cache_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "tiles_cached": len(self._tiles),
+            "max_tiles": self.max_tiles,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self._tiles.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+def bind_obstacle_field(field, start_pos, goal_pos):
+    """
+    Build the `is_obstacle_func(position)` callable for one query: `field` plus
+    the start/goal exception of `is_obstacle_procedural`.
+
+    This runs once per neighbor check in the search loops, so it is a closure
+    over locals rather than a method, and it remembers the last tile it used:
+    consecutive checks in the same tile skip the LRU bookkeeping entirely, and
+    the field's hit/miss counters count tile switches rather than single cells.
+    The returned function also carries `field`, `start_pos`, `goal_pos` and a
+    vectorized `batch(rows, cols)` as attributes.
+    """
+    tiles = field._tiles
+    load_tile = field._load_tile
+    shift = field._shift
+    mask = field._mask
+    last_key = None
+    last_data = None
+    # The start/goal exception only changes batch results for endpoints the terrain would block
+    blocked_endpoints = [position for position in (start_pos, goal_pos) if field.is_obstacle(position)]
+
+    def is_obstacle_func(position):
+        nonlocal last_key, last_data
+        if position == start_pos or position == goal_pos:
+            return False
+        r, c = position
+        key = (r >> shift, c >> shift)
+        if key != last_key:
+            data = tiles.get(key)
+            if data is None:
+                data = load_tile(key)
+            else:
+                field.hits += 1
+                tiles.move_to_end(key)
+            last_key = key
+            last_data = data
+        return last_data[((r & mask) << shift) | (c & mask)] == 1
+
+    def batch(rows, cols):
+        """Vectorized `is_obstacle_func` over coordinate arrays."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        blocked = field.is_obstacle_batch(rows, cols)
+        for r, c in blocked_endpoints:
+            blocked &= ~((rows == r) & (cols == c))
+        return blocked
+
+    is_obstacle_func.field = field
+    is_obstacle_func.start_pos = start_pos
+    is_obstacle_func.goal_pos = goal_pos
+    is_obstacle_func.batch = batch
+    return is_obstacle_func
+
+
+# --- Shared fields ---
+_shared_fields = {}
+
+def get_obstacle_field(scenario_seed, obstacle_density, tile_size=DEFAULT_TILE_SIZE, max_tiles=DEFAULT_MAX_TILES):
+    """
+    Return the process-wide field for (scenario_seed, obstacle_density), so A*,
+    every beam width and every scenario on the same map share one tile cache.
+    """
+    key = (scenario_seed, obstacle_density, tile_size)
+    field = _shared_fields.get(key)
+    if field is None:
+        field = ObstacleField(scenario_seed, obstacle_density, tile_size, max_tiles)
+        _shared_fields[key] = field
+    return field
+
+
+def clear_shared_fields():
+    _shared_fields.clear()
@@ -0,0 +1,80 @@
+"""
+Dynamic cell edits on top of a static obstacle map.
+
+`ObstacleOverlay(field)` keeps a dict of edited cells (True = blocked,
+False = cleared) over an `ObstacleField` (or any terrain callable). Edits win
+over the terrain; the start/goal exception of `is_obstacle_procedural` still
+applies to whatever `bind(start, goal)` is given.
+
+Edits are reported to listeners as the cells whose blocked state actually
+changed. This is how an incremental planner like `dstar_lite.DStarLite`
+learns what to repair.
+"""
+
+
+class ObstacleOverlay:
+    def __init__(self, field):
+        self.field = field
+        self._terrain = field.is_obstacle if hasattr(field, "is_obstacle") else field
+        self.edits = {}
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """Call `listener(changed_cells)` after every edit batch that changes something."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def is_blocked(self, position):
+        """Current state of a cell, terrain plus edits (no start/goal exception)."""
+        blocked = self.edits.get(position)
+        if blocked is None:
+            return self._terrain(position)
+        return blocked
+
+    def set_cells(self, cells, blocked):
+        """Mark `cells` blocked (or cleared); returns the cells whose state changed."""
+        changed = []
+        for position in cells:
+            if self.is_blocked(position) != blocked:
+                changed.append(position)
+            if self._terrain(position) == blocked:
+                self.edits.pop(position, None) # back to the terrain value: no edit needed
+            else:
+                self.edits[position] = blocked
+        if changed:
+            for listener in self._listeners:
+                listener(changed)
+        return changed
+
+    def block(self, cells):
+        return self.set_cells(cells, True)
+
+    def clear(self, cells):
+        return self.set_cells(cells, False)
+
+    def reset(self):
+        """Drop every edit (listeners are told about the cells that change back)."""
+        changed = [position for position, blocked in self.edits.items() if self._terrain(position) != blocked]
+        self.edits.clear()
+        if changed:
+            for listener in self._listeners:
+                listener(changed)
+        return changed
+
+    def bind(self, start_pos, goal_pos):
+        """`is_obstacle_func(position)` for one query: edits, then the terrain, start and goal always open."""
+        edits = self.edits
+        terrain = self.field.bind(start_pos, goal_pos) if hasattr(self.field, "bind") else self._terrain
+
+        def is_obstacle_func(position):
+            if position == start_pos or position == goal_pos:
+                return False
+            blocked = edits.get(position)
+            if blocked is None:
+                return terrain(position)
+            return blocked
+
+        is_obstacle_func.overlay = self
+        return is_obstacle_func
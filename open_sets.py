@@ -0,0 +1,106 @@
+"""
+Open-set implementations for the compact A* (`compact_search.a_star_search_compact`).
+
+An open set stores `(f, h, item)` entries and pops the one with the lowest f,
+breaking ties on the lowest h, like `Node.__lt__`. Both implementations here
+share one tiny interface:
+
+    open_set.push(f, h, item)
+    f, h, item = open_set.pop()
+    len(open_set)
+
+Neither supports decrease-key or removal. When a cell's g improves the search
+pushes it again, and the superseded entry is dropped when it surfaces (lazy
+deletion): the compact A* recognises it by the cell's closed flag.
+"""
+import heapq
+
+
+class HeapOpenSet:
+    """Binary heap of `(f, h, item)` tuples; ties on (f, h) go to the smaller item."""
+
+    def __init__(self):
+        self._heap = []
+
+    def push(self, f, h, item):
+        heapq.heappush(self._heap, (f, h, item))
+
+    def pop(self):
+        return heapq.heappop(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BucketOpenSet:
+    """
+    Bucket queue keyed on f for integer f, as in unit-cost grid A*. `push`
+    raises ValueError for a non-integer f (e.g. from a weighted heuristic),
+    which the cursor, stepping through whole numbers, would never reach.
+
+    With unit edges and the Manhattan heuristic a neighbor's f is either the
+    parent's f or f + 2, so the live f values form a narrow band and the
+    smallest one is found by walking a cursor upwards instead of paying
+    O(log n) per operation. Inside a bucket the h tie-break is kept with a
+    small heap of the distinct h values present (one entry per value, not per
+    item), and entries sharing both f and h are popped last-in first-out,
+    which continues the most recent line of the search.
+    """
+
+    def __init__(self):
+        self._buckets = {} # f -> (heap of distinct h, {h: [items]})
+        self._min_f = None
+        self._size = 0
+
+    def push(self, f, h, item):
+        bucket = self._buckets.get(f)
+        if bucket is None:
+            if f != int(f):
+                raise ValueError(f"BucketOpenSet needs integer f values, got {f!r}")
+            bucket = self._buckets[f] = ([], {})
+            if self._min_f is None or f < self._min_f:
+                self._min_f = f
+        h_values, items_by_h = bucket
+        items = items_by_h.get(h)
+        if items is None:
+            items_by_h[h] = [item]
+            heapq.heappush(h_values, h)
+        else:
+            items.append(item)
+        self._size += 1
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop from an empty open set")
+        f = self._min_f
+        h_values, items_by_h = self._buckets[f]
+        h = h_values[0]
+        items = items_by_h[h]
+        item = items.pop()
+        if not items:
+            del items_by_h[h]
+            heapq.heappop(h_values)
+            if not h_values:
+                del self._buckets[f]
+                self._advance_min_f(f)
+        self._size -= 1
+        return f, h, item
+
+    def _advance_min_f(self, emptied_f):
+        buckets = self._buckets
+        if not buckets:
+            self._min_f = None
+            return
+        f = emptied_f + 1
+        while f not in buckets:
+            f += 1
+        self._min_f = f
+
+    def __len__(self):
+        return self._size
+
+
+OPEN_SETS = {
+    "heap": HeapOpenSet,
+    "bucket": BucketOpenSet,
+}
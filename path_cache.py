@@ -0,0 +1,333 @@
+"""
+Two-level cache of search results, keyed by map identity.
+
+A procedural map is fully defined by `(scenario_seed, obstacle_density,
+grid_dims)` (`map_key`), so a result for `(start, goal)` on it never goes
+stale. `PathCache` keeps the result dicts of the search functions in an
+in-process LRU and, with `cache_dir`, in a SQLite file shared by every
+process that opens it. Each `(map, start, goal)` holds its best known
+answer. An entry records whether its path is proven optimal (A* and the
+other exact searches, when they did not hit their node limit) or only
+approximate (BSA, HPA*, ...). A proven answer replaces an approximate one,
+and a shorter approximate path replaces a longer one.
+
+Grid moves are reversible, so an entry also answers the reversed query. It
+answers more than that. Any stretch of a cached path between two of its
+cells is a path between them, and a stretch of an optimal path is itself
+optimal, also under the start/goal exception: the inner cells of a path are
+open in every query. So every cell of every path held in memory is indexed,
+and a query whose start and goal both lie on one cached path is answered by
+slicing it. Cells of an approximate path give an approximate answer, which
+is still a valid path and an upper bound on the cost.
+
+A hit is the stored result dict with the answered path, `nodes_explored` 0,
+`time` set to the lookup time, and two extra keys: `cached` (`"memory"`,
+`"subpath"` or `"disk"`) and `optimal`. Results that hit a node limit are
+not cached; they say more about the limit than about the map. Neither is an
+approximate "no path": a pruned search that dead-ends proves nothing.
+`cached_search` wraps any search call, and `stats()` reports hit rates per
+level and lookup/search latency percentiles.
+"""
+import os
+import sqlite3
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from stats import percentiles
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_CACHE_FILE = "path_cache.sqlite"
+LATENCY_SAMPLES = 10_000 # most recent lookups/searches kept for the percentiles
+
+# Result labels of searches that return a shortest path whenever they do not hit their limit
+OPTIMAL_ALGORITHMS = {"A*", "Bidirectional A*", "JPS", "Batch A*", "D* Lite", "HDA*"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS paths (
+    seed INTEGER, density REAL, rows INTEGER, cols INTEGER,
+    start_r INTEGER, start_c INTEGER, goal_r INTEGER, goal_c INTEGER,
+    optimal INTEGER, score REAL, nodes_explored INTEGER, time REAL, algorithm TEXT, path BLOB,
+    PRIMARY KEY (seed, density, rows, cols, start_r, start_c, goal_r, goal_c)
+)
+"""
+# Keep the better of the stored and the new row: proven beats approximate, then lower cost
+_UPSERT = """
+INSERT INTO paths VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT DO UPDATE SET optimal = excluded.optimal, score = excluded.score,
+    nodes_explored = excluded.nodes_explored, time = excluded.time,
+    algorithm = excluded.algorithm, path = excluded.path
+WHERE excluded.optimal > paths.optimal OR (excluded.optimal = paths.optimal AND excluded.score < paths.score)
+"""
+_SELECT = """
+SELECT optimal, score, nodes_explored, time, algorithm, path FROM paths
+WHERE seed = ? AND density = ? AND rows = ? AND cols = ? AND start_r = ? AND start_c = ? AND goal_r = ? AND goal_c = ?
+"""
+
+
+def map_key(scenario_seed, obstacle_density, grid_dims):
+    return (scenario_seed, obstacle_density, tuple(grid_dims))
+
+
+def scenario_map_key(scenario):
+    """`map_key` of a dict from `algorithm.scenarios`."""
+    return map_key(scenario['scenario_seed'], scenario['obstacle_density'], scenario['grid_dims'])
+
+
+def is_proven_optimal(result):
+    """Whether a result dict's path (or its "no path") is proven optimal."""
+    if result['limit_reached']:
+        return False
+    if "optimal" in result: # anytime results say so themselves
+        return bool(result['optimal'])
+    return result['algorithm'] in OPTIMAL_ALGORITHMS
+
+
+class _Entry:
+    __slots__ = ("key", "result", "optimal", "positions")
+
+    def __init__(self, key, result, optimal):
+        self.key = key
+        self.result = result
+        self.optimal = optimal
+        self.positions = None # cell -> index on the path, while the entry is in the subpath index
+
+
+class PathCache:
+    """
+    In-process LRU of up to `max_entries` results, plus an optional SQLite store
+    under `cache_dir`. `reuse_subpaths=False` turns the cell index off (it
+    costs one dict entry per cached path cell).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=None, reuse_subpaths=True):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.reuse_subpaths = reuse_subpaths
+        self._entries = OrderedDict() # (map key, start, goal) -> _Entry
+        self._cells = {} # map key -> {cell: [entry keys of paths through it]}
+        self._db = None
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(cache_dir, DEFAULT_CACHE_FILE), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+            self._db.commit()
+        self.reset_stats()
+
+    # --- Metrics ---
+    def reset_stats(self):
+        self.lookups = 0
+        self.hits = {"memory": 0, "subpath": 0, "disk": 0}
+        self.approximate_hits = 0
+        self.misses = 0
+        self._lookup_latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._search_latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def stats(self):
+        hits = sum(self.hits.values())
+        return {
+            "entries": len(self._entries),
+            "indexed_cells": sum(len(cells) for cells in self._cells.values()),
+            "lookups": self.lookups,
+            "hits": hits,
+            "memory_hits": self.hits["memory"],
+            "subpath_hits": self.hits["subpath"],
+            "disk_hits": self.hits["disk"],
+            "approximate_hits": self.approximate_hits,
+            "misses": self.misses,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            "lookup_latency": percentiles(self._lookup_latencies),
+            "search_latency": percentiles(self._search_latencies),
+        }
+
+    # --- Lookup ---
+    def get(self, key, start_pos, goal_pos, require_optimal=False):
+        """
+        Best cached answer for `start_pos -> goal_pos` on map `key`, or None. With
+        `require_optimal`, approximate answers count as misses.
+        """
+        started = time.perf_counter()
+        self.lookups += 1
+        found = None # (entry, path, level) of the best answer so far
+        for lookup in (self._memory_lookup, self._subpath_lookup, self._disk_lookup): # cheapest first
+            candidate = lookup(key, start_pos, goal_pos)
+            if candidate is not None and (found is None or _better(candidate, found)):
+                found = candidate
+            if found is not None and found[0].optimal:
+                break
+        if found is None or (require_optimal and not found[0].optimal):
+            self.misses += 1
+            self._lookup_latencies.append(time.perf_counter() - started)
+            return None
+        entry, path, level = found
+        self.hits[level] += 1
+        if not entry.optimal:
+            self.approximate_hits += 1
+        result = dict(entry.result)
+        result['path'] = path
+        result['score'] = len(path) - 1 if path else entry.result['score']
+        result['nodes_explored'] = 0
+        result['cached'] = level
+        result['optimal'] = entry.optimal
+        elapsed = time.perf_counter() - started
+        result['time'] = elapsed
+        self._lookup_latencies.append(elapsed)
+        return result
+
+    def _memory_lookup(self, key, start_pos, goal_pos):
+        for entry_key, reverse in (((key, start_pos, goal_pos), False), ((key, goal_pos, start_pos), True)):
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self._entries.move_to_end(entry_key)
+                path = entry.result['path']
+                return entry, path[::-1] if reverse else list(path), "memory"
+        return None
+
+    def _subpath_lookup(self, key, start_pos, goal_pos):
+        cells = self._cells.get(key)
+        if not cells or start_pos == goal_pos:
+            return None
+        through_start = cells.get(start_pos)
+        through_goal = cells.get(goal_pos)
+        if not through_start or not through_goal:
+            return None
+        best = None
+        for entry_key in set(through_start).intersection(through_goal):
+            entry = self._entries[entry_key]
+            i, j = entry.positions[start_pos], entry.positions[goal_pos]
+            path = entry.result['path']
+            segment = path[i:j + 1] if i <= j else path[j:i + 1][::-1]
+            candidate = (entry, segment, "subpath")
+            if best is None or _better(candidate, best):
+                best = candidate
+        if best is not None:
+            self._entries.move_to_end(best[0].key)
+        return best
+
+    def _disk_lookup(self, key, start_pos, goal_pos):
+        if self._db is None:
+            return None
+        seed, density, (rows, cols) = key
+        for a, b, reverse in ((start_pos, goal_pos, False), (goal_pos, start_pos, True)):
+            row = self._db.execute(_SELECT, (seed, density, rows, cols, a[0], a[1], b[0], b[1])).fetchone()
+            if row is None:
+                continue
+            optimal, score, nodes_explored, search_time, algorithm, blob = row
+            if not optimal and not blob:
+                continue # stored before approximate "no path" answers were turned away
+            path = [tuple(cell) for cell in np.frombuffer(blob, dtype=np.int32).reshape(-1, 2).tolist()]
+            result = {
+                "path": path,
+                "score": score if path else float('inf'),
+                "time": search_time,
+                "nodes_explored": nodes_explored,
+                "limit_reached": False,
+                "algorithm": algorithm
+            }
+            entry = self._remember((key, a, b), result, bool(optimal)) # promote to memory
+            if entry is None:
+                return None # memory already holds this answer or a better one
+            return entry, path[::-1] if reverse else list(path), "disk"
+        return None
+
+    # --- Storing ---
+    def put(self, key, start_pos, goal_pos, result, optimal=None):
+        """
+        Offer a search result for `start_pos -> goal_pos` on map `key`. It is kept
+        if it is better than what the cache holds. `optimal` defaults to
+        `is_proven_optimal(result)`.
+        """
+        if result['limit_reached']:
+            return False
+        if optimal is None:
+            optimal = is_proven_optimal(result)
+        if not optimal and not result['path']:
+            return False # a pruned search that found nothing says nothing about the map
+        stored = {field: result[field] for field in ("path", "score", "time", "nodes_explored", "limit_reached", "algorithm")}
+        stored['path'] = list(stored['path'])
+        kept = self._remember((key, start_pos, goal_pos), stored, optimal)
+        if kept is not None and self._db is not None:
+            seed, density, (rows, cols) = key
+            path_blob = np.asarray(stored['path'], dtype=np.int32).reshape(-1, 2).tobytes()
+            with self._db:
+                self._db.execute(_UPSERT, (seed, density, rows, cols, start_pos[0], start_pos[1], goal_pos[0], goal_pos[1],
+                                           int(optimal), stored['score'] if stored['path'] else float('inf'),
+                                           stored['nodes_explored'], stored['time'], stored['algorithm'], path_blob))
+        return kept is not None
+
+    def _remember(self, entry_key, result, optimal):
+        """Put a result in memory unless the entry already held is at least as good; returns the new entry or None."""
+        new_entry = _Entry(entry_key, result, optimal)
+        old_entry = self._entries.get(entry_key)
+        if old_entry is not None:
+            if not _better((new_entry, result['path'], None), (old_entry, old_entry.result['path'], None)):
+                self._entries.move_to_end(entry_key)
+                return None
+            self._unindex(entry_key, old_entry)
+        self._entries[entry_key] = new_entry
+        self._entries.move_to_end(entry_key)
+        if self.reuse_subpaths and len(result['path']) > 2:
+            self._index(entry_key, new_entry)
+        while len(self._entries) > self.max_entries:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._unindex(evicted_key, evicted)
+        return new_entry
+
+    def _index(self, entry_key, entry):
+        cells = self._cells.setdefault(entry_key[0], {})
+        entry.positions = {}
+        for index, cell in enumerate(entry.result['path']):
+            entry.positions[cell] = index
+            cells.setdefault(cell, []).append(entry_key)
+
+    def _unindex(self, entry_key, entry):
+        if entry.positions is None:
+            return
+        cells = self._cells[entry_key[0]]
+        for cell in entry.positions:
+            through = cells[cell]
+            through.remove(entry_key)
+            if not through:
+                del cells[cell]
+        entry.positions = None
+
+    def clear(self):
+        """Drop the in-memory level (the disk store is kept)."""
+        self._entries.clear()
+        self._cells.clear()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _better(a, b):
+    """Compare (entry, path, level) answers: proven optimal first, then the shorter path."""
+    if a[0].optimal != b[0].optimal:
+        return a[0].optimal
+    a_cost = len(a[1]) if a[1] else float('inf')
+    b_cost = len(b[1]) if b[1] else float('inf')
+    return a_cost < b_cost
+
+
+def cached_search(cache, key, start_pos, goal_pos, search, require_optimal=False, optimal=None):
+    """
+    Answer from `cache` if it can, otherwise call `search()` (a no-argument
+    callable returning a result dict, e.g. a `functools.partial` of a search
+    function), store its result and return it with `cached` set to None.
+    """
+    result = cache.get(key, start_pos, goal_pos, require_optimal)
+    if result is not None:
+        return result
+    started = time.perf_counter()
+    result = search()
+    cache._search_latencies.append(time.perf_counter() - started)
+    cache.put(key, start_pos, goal_pos, result, optimal)
+    result = dict(result)
+    result['cached'] = None
+    result['optimal'] = is_proven_optimal(result) if optimal is None else optimal
+    return result
@@ -0,0 +1,546 @@
+"""
+Asyncio path-query server with per-request deadlines and request coalescing.
+
+The searches are plain blocking functions whose only budget is a node
+limit. `QueryServer` runs them on a pool of worker processes behind a local
+socket (localhost TCP or a Unix socket), so the event loop never blocks and
+several queries run at once. The protocol is one JSON object per line each
+way. A search request:
+
+    {"id": 7, "scenario": 12, "algorithm": "astar", "deadline": 0.5}
+    {"id": 8, "map": [seed, density, [rows, cols]], "start": [r, c], "goal": [r, c],
+     "algorithm": "beam", "beam_width": 16, "node_limit": 200000, "return_path": false}
+
+`scenario` is 1-based; its start and goal can be overridden. `deadline` is
+wall-clock seconds from arrival (None = no deadline). It is turned into a
+`time.monotonic()` instant, which all processes on the machine share. The
+worker checks it from inside the obstacle callable and abandons the search
+once it passes. An A* query gets the first `EXACT_SHARE` of its budget. If A*
+is still running then, it falls back to BSA at `fallback_width` for the
+rest. The response has the usual result fields plus `status`:
+
+    ok        the requested search finished (with a path or proof there is none)
+    limit     it hit its node limit; the result is what it had
+    fallback  the deadline cut A* short; the answer is the BSA path
+    timeout   no answer before the deadline
+    error     bad request or worker failure (`error` says why)
+
+Identical queries (same map, endpoints, algorithm and limits) that arrive
+while one is running share its search. Each waiter still answers by its
+own deadline. The shared search is cut short (a timeout, or an A* fallback)
+at the deadline of the query that started it, so a waiter with a later
+deadline that gets such an answer, and has more time left than that search
+had, runs the query again (under a deadline, only if a worker is free): it
+shares a search that runs at least as long, or starts its own. If that
+does no better it answers with the shared fallback path. With a `PathCache` in front, repeated queries cost a
+lookup; only answers with a path are served from it, never a cached "no path". `{"op": "stats"}` returns request counts, the queue depth (jobs
+waiting for a worker), and latency percentiles: end to end, time queued for
+a worker, and search time.
+
+    python -m query_server --port 8765 --workers 4
+    python -m query_server --unix /tmp/paths.sock --cache-dir .path_cache
+
+`QueryClient` is the matching asyncio client; `benchmarks/bench_query_server.py`
+replays the scenarios against a server at a fixed rate.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithm import (
+    MAX_NODES_TO_EXPLORE_ASTAR, a_star_search_implicit, beam_search_astar_pruning_implicit,
+    heuristic_manhattan, scenarios,
+)
+from path_cache import PathCache, is_proven_optimal, map_key
+from stats import percentiles
+
+DEFAULT_PORT = 8765
+DEFAULT_FALLBACK_WIDTH = 8
+EXACT_SHARE = 0.6 # fraction of an A* query's remaining budget before it falls back to BSA
+DEADLINE_GRACE = 0.05 # seconds the server waits past a deadline for the worker's own answer
+DEADLINE_CHECK_MASK = 1023 # obstacle lookups between clock reads in a worker
+LATENCY_SAMPLES = 10_000
+STREAM_LIMIT = 1 << 26 # responses carry whole paths, far past asyncio's 64 KiB line default
+ALGORITHMS = ("astar", "beam")
+DEADLINE_STATUSES = ("timeout", "fallback") # answers the search's own deadline cut short
+WORKER_FIELDS = 4 # obstacle fields (up to 64 MiB of tiles each) a worker keeps for client-named maps
+
+
+class DeadlineExceeded(Exception):
+    """Raised inside a worker's search when its deadline passes."""
+
+
+# --- Worker side ---
+def _with_deadline(is_obstacle_func, deadline_at):
+    """`is_obstacle_func` that raises `DeadlineExceeded` once `time.monotonic()` passes `deadline_at`."""
+    if deadline_at is None:
+        return is_obstacle_func
+    monotonic = time.monotonic
+    calls = 0
+
+    def guarded(position):
+        nonlocal calls
+        calls += 1
+        if not calls & DEADLINE_CHECK_MASK and monotonic() >= deadline_at:
+            raise DeadlineExceeded
+        return is_obstacle_func(position)
+    return guarded
+
+
+def _timeout_result(query, elapsed):
+    return {
+        "path": [],
+        "score": float('inf'),
+        "time": elapsed,
+        "nodes_explored": 0,
+        "limit_reached": False,
+        "algorithm": "A*" if query['algorithm'] == "astar" else f"Beam Search (W={query['beam_width']})",
+        "status": "timeout",
+    }
+
+
+_worker_fields = OrderedDict() # (seed, density) -> ObstacleField, least recently used first
+
+def _field_for(seed, density):
+    """This worker's field for a map. Clients can name any map, so unlike `get_obstacle_field` it keeps only `WORKER_FIELDS`."""
+    from obstacle_field import ObstacleField
+
+    key = (seed, density)
+    field = _worker_fields.get(key)
+    if field is None:
+        field = _worker_fields[key] = ObstacleField(seed, density)
+        while len(_worker_fields) > WORKER_FIELDS:
+            _worker_fields.popitem(last=False)
+    else:
+        _worker_fields.move_to_end(key)
+    return field
+
+
+def _register_worker(worker_pids):
+    """Pool initializer: record this worker's pid so that `QueryServer.close` can stop it mid-search."""
+    worker_pids.put(os.getpid())
+
+
+def run_query(query):
+    """
+    Answer one normalized query (see `QueryServer._normalize`) in this process.
+    Returns the result dict with `status` and `started` (the monotonic time
+    the worker picked it up) added.
+    """
+    started = time.monotonic()
+    seed, density, dims = query['map']
+    start, goal = query['start'], query['goal']
+    deadline_at = query['deadline_at']
+    if deadline_at is not None and started >= deadline_at:
+        return dict(_timeout_result(query, 0.0), started=started)
+
+    is_obstacle_func = _field_for(seed, density).bind(start, goal)
+    if query['algorithm'] == "astar":
+        exact_until = None if deadline_at is None else started + EXACT_SHARE * (deadline_at - started)
+        try:
+            result = a_star_search_implicit(dims, start, goal, heuristic_manhattan,
+                                            _with_deadline(is_obstacle_func, exact_until), query['node_limit'])
+            return dict(result, status="limit" if result['limit_reached'] else "ok", started=started)
+        except DeadlineExceeded:
+            beam_width, status = query['fallback_width'], "fallback"
+    else:
+        beam_width, status = query['beam_width'], None
+    try:
+        result = beam_search_astar_pruning_implicit(dims, start, goal, heuristic_manhattan,
+                                                    _with_deadline(is_obstacle_func, deadline_at),
+                                                    beam_width, query['node_limit'])
+    except DeadlineExceeded:
+        return dict(_timeout_result(query, time.monotonic() - started), started=started)
+    if status is None:
+        status = "limit" if result['limit_reached'] else "ok"
+    # `time` covers the abandoned A* run too, so it is the worker time spent on the query
+    return dict(result, status=status, time=time.monotonic() - started, started=started)
+
+
+# --- Server ---
+class QueryServer:
+    """
+    Serves search requests on `workers` processes. `cache` is an optional
+    `PathCache` consulted before dispatch and fed with every answer;
+    `node_limit` caps what requests may ask for.
+    """
+
+    def __init__(self, workers=None, cache=None, node_limit=MAX_NODES_TO_EXPLORE_ASTAR,
+                 fallback_width=DEFAULT_FALLBACK_WIDTH):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.node_limit = node_limit
+        self.fallback_width = fallback_width
+        self._worker_pids = multiprocessing.SimpleQueue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_register_worker,
+                                         initargs=(self._worker_pids,))
+        self._in_flight = {} # query key -> (future of the running search, its deadline_at)
+        self._jobs = 0 # searches dispatched and not finished
+        self._server = None
+        self._unix_path = None
+        self.reset_stats()
+
+    # --- Metrics ---
+    def reset_stats(self):
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.active_requests = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.statuses = Counter()
+        self.max_queue_depth = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._queue_waits = deque(maxlen=LATENCY_SAMPLES)
+        self._search_times = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def queue_depth(self):
+        """Searches waiting for a free worker."""
+        return max(0, self._jobs - self.workers)
+
+    def stats(self):
+        return {
+            "uptime": time.monotonic() - self.started_at,
+            "workers": self.workers,
+            "requests": self.requests,
+            "active_requests": self.active_requests,
+            "searches_in_flight": self._jobs,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "statuses": dict(self.statuses),
+            "latency": percentiles(self._latencies),
+            "queue_wait": percentiles(self._queue_waits),
+            "search_time": percentiles(self._search_times),
+        }
+
+    # --- Requests ---
+    def _normalize(self, request, arrived):
+        """Validated query dict for `run_query`; raises ValueError on a bad request."""
+        if "scenario" in request:
+            number = int(request['scenario'])
+            if not 1 <= number <= len(scenarios):
+                raise ValueError(f"scenario must be 1-{len(scenarios)}, got {number}")
+            scenario = scenarios[number - 1]
+            key = map_key(scenario['scenario_seed'], scenario['obstacle_density'], scenario['grid_dims'])
+            start, goal = request.get('start', scenario['start']), request.get('goal', scenario['goal'])
+        elif "map" in request:
+            seed, density, dims = request['map']
+            key = map_key(int(seed), float(density), (int(dims[0]), int(dims[1])))
+            start, goal = request['start'], request['goal']
+        else:
+            raise ValueError("request needs 'scenario' or 'map'")
+        start, goal = (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+        rows, cols = key[2]
+        for name, (r, c) in (("start", start), ("goal", goal)):
+            if not (0 <= r < rows and 0 <= c < cols):
+                raise ValueError(f"{name} {(r, c)} is outside the {rows}x{cols} grid")
+        algorithm = request.get('algorithm', "astar")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {ALGORITHMS}, got {algorithm!r}")
+        beam_width = int(request.get('beam_width', self.fallback_width))
+        if beam_width < 1:
+            raise ValueError(f"beam_width must be at least 1, got {beam_width}")
+        deadline = request.get('deadline')
+        return {
+            "map": key,
+            "start": start,
+            "goal": goal,
+            "algorithm": algorithm,
+            "beam_width": beam_width if algorithm == "beam" else None,
+            "node_limit": min(int(request.get('node_limit', self.node_limit)), self.node_limit),
+            "fallback_width": self.fallback_width,
+            "deadline_at": None if deadline is None else arrived + float(deadline),
+        }
+
+    async def handle_request(self, request):
+        """Answer one decoded request; returns the response dict."""
+        arrived = time.monotonic()
+        if request.get('op', "search") == "stats":
+            return {"id": request.get('id'), "status": "ok", "stats": self.stats()}
+        self.requests += 1
+        self.active_requests += 1
+        try:
+            response = await self._search(request, arrived)
+        except (KeyError, TypeError, ValueError) as error:
+            response = {"status": "error", "error": f"bad request: {error!r}"}
+        except Exception as error: # a worker that died, mostly
+            response = {"status": "error", "error": repr(error)}
+        finally:
+            self.active_requests -= 1
+        latency = time.monotonic() - arrived
+        self._latencies.append(latency)
+        self.statuses[response['status']] += 1
+        response['id'] = request.get('id')
+        response['latency'] = latency
+        return response
+
+    async def _search(self, request, arrived):
+        query = self._normalize(request, arrived)
+        return_path = request.get('return_path', True)
+        key, start, goal = query['map'], query['start'], query['goal']
+
+        if self.cache is not None and request.get('use_cache', True):
+            result = self.cache.get(key, start, goal, require_optimal=query['algorithm'] == "astar")
+            # The cache holds a "no path" only when it is proven, but the search answers that just as well
+            # and a cached hit should always carry a path
+            if result is not None and result['path']:
+                self.cache_hits += 1
+                return _response(result, "ok", return_path, cached=result['cached'])
+
+        query_key = (key, start, goal, query['algorithm'], query['beam_width'], query['node_limit'])
+        deadline_at = query['deadline_at']
+        running = self._in_flight.get(query_key)
+        if running is not None:
+            (future, search_deadline_at), coalesced = running, True
+            self.coalesced += 1
+        else:
+            (future, search_deadline_at), coalesced = self._dispatch(query_key, query), False
+
+        shared_fallback = None # a shared search's fallback answer, kept in case the rerun does no better
+        while True:
+            timeout = None if deadline_at is None else max(0.0, deadline_at - time.monotonic()) + DEADLINE_GRACE
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                result = _timeout_result(query, time.monotonic() - arrived)
+                if shared_fallback is None:
+                    return _response(result, "timeout", return_path, coalesced=coalesced)
+            if result['status'] == "timeout" and shared_fallback is not None:
+                result, coalesced = shared_fallback, True
+            # A shared search stops at the deadline of the query that started it. If that cut it short and
+            # this query has more time left than the search had, run it again (sharing a search that runs at
+            # least as long, if any). Under a deadline, only when a worker is free: a rerun that has to queue
+            # mostly turns a fallback answer into a timeout, and delays everything queued behind it.
+            elif (result['status'] in DEADLINE_STATUSES and coalesced and search_deadline_at is not None
+                    and (deadline_at is None
+                         or (self._jobs < self.workers
+                             and deadline_at - time.monotonic() > search_deadline_at - result['started']))):
+                if result['status'] == "fallback":
+                    shared_fallback = result
+                running = self._in_flight.get(query_key)
+                if running is None or _before(running[1], deadline_at):
+                    running, coalesced = self._dispatch(query_key, query), False
+                future, search_deadline_at = running
+                continue
+            response = _response(result, result['status'], return_path, coalesced=coalesced)
+            response['queue_wait'] = max(0.0, result['started'] - arrived)
+            return response
+
+    def _dispatch(self, query_key, query):
+        future = asyncio.get_running_loop().run_in_executor(self._pool, run_query, query)
+        running = self._in_flight[query_key] = (future, query['deadline_at'])
+        self._jobs += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        submitted = time.monotonic()
+
+        def finished(done):
+            self._jobs -= 1
+            if self._in_flight.get(query_key) is running:
+                del self._in_flight[query_key]
+            if done.cancelled() or done.exception() is not None:
+                return
+            result = done.result()
+            self._queue_waits.append(max(0.0, result['started'] - submitted))
+            if result['status'] != "timeout":
+                self._search_times.append(result['time'])
+                # Only a path, or a proven "no path": a pruned beam that dead-ends says nothing about the map
+                if self.cache is not None and (result['path'] or is_proven_optimal(result)):
+                    self.cache.put(query['map'], query['start'], query['goal'], result)
+        future.add_done_callback(finished)
+        return running
+
+    # --- Connections ---
+    async def _handle_connection(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as error:
+                response = {"id": None, "status": "error", "error": f"bad request: {error}"}
+            else:
+                response = await self.handle_request(request)
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        if unix_path is not None:
+            self._unix_path = unix_path
+            self._server = await asyncio.start_unix_server(self._handle_connection, unix_path, limit=STREAM_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port, limit=STREAM_LIMIT)
+        return self._server
+
+    async def serve_forever(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        """Serve until cancelled or sent SIGINT/SIGTERM."""
+        await self.start(host, port, unix_path)
+        serving = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, serving.cancel)
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    def close(self):
+        """Stop listening and stop the workers, including any still in a search."""
+        if self._server is not None:
+            self._server.close()
+        if self._unix_path is not None and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+        # Workers are still unreaped children here, so their pids cannot have been reused yet
+        while not self._worker_pids.empty():
+            try:
+                os.kill(self._worker_pids.get(), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache is not None:
+            self.cache.close()
+
+
+def _before(deadline_at, other_deadline_at):
+    """Whether `deadline_at` comes before `other_deadline_at` (None = no deadline)."""
+    return deadline_at is not None and (other_deadline_at is None or deadline_at < other_deadline_at)
+
+
+def _response(result, status, return_path, cached=None, coalesced=False):
+    path = result['path']
+    response = {
+        "status": status,
+        "algorithm": result['algorithm'],
+        "score": result['score'] if path else None,
+        "path_length": len(path),
+        "nodes_explored": result['nodes_explored'],
+        "limit_reached": result['limit_reached'],
+        "optimal": status == "ok" and result.get('optimal', result['algorithm'] == "A*"),
+        "search_time": result['time'],
+        "cached": cached,
+        "coalesced": coalesced,
+    }
+    if return_path:
+        response['path'] = [list(position) for position in path]
+    return response
+
+
+# --- Client ---
+class QueryClient:
+    """
+    Asyncio client for `QueryServer`. Requests are pipelined on one
+    connection; responses are matched to callers by id.
+
+        client = await QueryClient.connect(port=8765)
+        response = await client.query(scenario=12, deadline=0.5, return_path=False)
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting = {} # request id -> future
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(unix_path, limit=STREAM_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        error = ConnectionError("connection closed")
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._waiting.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except Exception as exception:
+            error = exception
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+
+    async def request(self, request):
+        """Send any request dict (its `id` is assigned here) and await the response."""
+        request = dict(request, id=next(self._ids))
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request['id']] = future
+        self._writer.write(json.dumps(request).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def query(self, **fields):
+        return await self.request(fields)
+
+    async def stats(self):
+        return (await self.request({"op": "stats"}))['stats']
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
+
+
+# --- Entry point ---
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--node-limit", type=int, default=MAX_NODES_TO_EXPLORE_ASTAR, help="largest limit a request may use")
+    parser.add_argument("--fallback-width", type=int, default=DEFAULT_FALLBACK_WIDTH)
+    parser.add_argument("--no-cache", action="store_true", help="answer every query with a search")
+    parser.add_argument("--cache-dir", default=None, help="keep the path cache on disk here as well")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    cache = None if args.no_cache else PathCache(cache_dir=args.cache_dir)
+    server = QueryServer(args.workers, cache, args.node_limit, args.fallback_width)
+    where = args.unix if args.unix is not None else f"{args.host}:{args.port}"
+    print(f"Serving path queries on {where} with {server.workers} workers")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
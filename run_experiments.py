@@ -0,0 +1,331 @@
+"""
+Experiment driver: A* and every beam width of every scenario in
+`algorithm.scenarios`, run as separate jobs on a pool of worker processes.
+
+Each job runs in its own process so a job that goes over `--timeout` can be
+killed without taking the others down. Results are written to the CSV and
+the verbose log in scenario order (A* first, then the beam widths as listed),
+whatever order the jobs finish in, so the logs look the same for any `--jobs`.
+A scenario's block is written as soon as it and every scenario before it are
+done.
+
+With `--trace` every search runs with a `tracing.SearchTrace`: its counters
+are appended to each CSV row and the full traces (per-depth beam sizes,
+phase times, frontier samples) go to a JSON file next to the logs.
+
+    python run_experiments.py --jobs 4 --timeout 900
+    python run_experiments.py --scenarios 1,4,8 --jobs 2 --trace --trace-sample-interval 10000
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+
+from algorithm import (
+    MAX_NODES_TO_EXPAND_BEAM, MAX_NODES_TO_EXPLORE_ASTAR, a_star_search_implicit,
+    beam_search_astar_pruning_implicit, heuristic_manhattan, scenarios,
+)
+from tracing import TRACE_CSV_HEADER, SearchTrace, csv_columns
+
+CSV_LOG_FILE_NAME = "pathfinding_results.csv"
+TEXT_LOG_FILE_NAME = "pathfinding_verbose_log.txt"
+TRACE_FILE_NAME = "pathfinding_trace.json"
+
+CSV_HEADER = [
+    "Scenario_Name", "Grid_Dims", "Start_Pos", "Goal_Pos", "Scenario_Seed", "Obstacle_Density",
+    "Algorithm", "Beam_Width", "Path_Found", "Path_Score", "Nodes_Processed", "Time_s", "Limit_Reached"
+]
+
+POLL_INTERVAL = 0.1 # seconds between timeout checks while jobs run
+
+
+# --- Jobs ---
+def build_jobs(scenario_indices):
+    """(scenario index, beam width) pairs in log order; beam width None is the A* job."""
+    jobs = []
+    for index in scenario_indices:
+        jobs.append((index, None))
+        jobs.extend((index, beam_width) for beam_width in scenarios[index]['beam_widths_to_test'])
+    return jobs
+
+
+def run_job(scenario_index, beam_width, trace_sample_interval=None):
+    """
+    Run one job in this process. The path itself is dropped (only whether one
+    was found is logged), so the result is cheap to send back. With a
+    `trace_sample_interval` (0 = counters only) the result carries the search
+    trace as a dict under "trace".
+    """
+    from obstacle_field import get_obstacle_field
+
+    scenario = scenarios[scenario_index]
+    dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+    is_obstacle_func = get_obstacle_field(scenario['scenario_seed'], scenario['obstacle_density']).bind(start, goal)
+    trace = SearchTrace(sample_interval=trace_sample_interval) if trace_sample_interval is not None else None
+    if beam_width is None:
+        result = a_star_search_implicit(dims, start, goal, heuristic_manhattan, is_obstacle_func, MAX_NODES_TO_EXPLORE_ASTAR,
+                                        trace=trace)
+    else:
+        result = beam_search_astar_pruning_implicit(dims, start, goal, heuristic_manhattan, is_obstacle_func,
+                                                    beam_width, MAX_NODES_TO_EXPAND_BEAM, trace=trace)
+    result = dict(result, path_found=bool(result['path']), status="ok",
+                  trace=trace.to_dict() if trace is not None else None)
+    del result['path']
+    return result
+
+
+def _job_worker(job, trace_sample_interval, connection):
+    connection.send(run_job(*job, trace_sample_interval))
+    connection.close()
+
+
+def _unfinished_result(job, status, elapsed):
+    _, beam_width = job
+    return {
+        "path_found": False,
+        "score": float('inf'),
+        "time": elapsed,
+        "nodes_explored": None,
+        "limit_reached": False,
+        "algorithm": "A*" if beam_width is None else f"Beam Search (W={beam_width})",
+        "status": status,
+        "trace": None,
+    }
+
+
+def run_jobs(jobs, n_jobs, timeout=None, on_result=None, trace_sample_interval=None):
+    """
+    Run `jobs` on up to `n_jobs` worker processes, one process per job.
+    Returns the results in job order; `on_result(index, result)` is called as
+    each one finishes. A job over `timeout` seconds is terminated and gets a
+    result with status "timeout"; a worker that dies gets status "error".
+    `trace_sample_interval` is passed to `run_job`.
+    """
+    results = [None] * len(jobs)
+    pending = list(range(len(jobs)))
+    pending.reverse() # pop() from the end starts jobs in order
+    running = {} # receiving connection -> (job index, process, start time)
+
+    def finish(index, result):
+        results[index] = result
+        if on_result is not None:
+            on_result(index, result)
+
+    while pending or running:
+        while pending and len(running) < n_jobs:
+            index = pending.pop()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_job_worker, args=(jobs[index], trace_sample_interval, sender), daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = (index, process, time.perf_counter())
+
+        for receiver in multiprocessing.connection.wait(list(running), timeout=POLL_INTERVAL):
+            index, process, started = running.pop(receiver)
+            try:
+                result = receiver.recv()
+            except EOFError:
+                result = _unfinished_result(jobs[index], "error", time.perf_counter() - started)
+            receiver.close()
+            process.join()
+            finish(index, result)
+
+        if timeout is not None:
+            now = time.perf_counter()
+            for receiver, (index, process, started) in list(running.items()):
+                if now - started > timeout:
+                    process.terminate()
+                    process.join()
+                    receiver.close()
+                    del running[receiver]
+                    finish(index, _unfinished_result(jobs[index], "timeout", now - started))
+    return results
+
+
+# --- Logs ---
+def _termination_note(result, limit, limit_text, timeout):
+    if result['status'] == "timeout":
+        return f"      Termination: Timed out after {timeout} seconds (job killed).\n"
+    if result['status'] == "error":
+        return "      Termination: Worker process died without a result.\n"
+    if result['limit_reached']:
+        return f"      Termination: {limit_text} ({limit}) reached.\n"
+    return ""
+
+
+def _csv_row(scenario, result, beam_width, traced):
+    dims, seed, density = scenario['grid_dims'], scenario['scenario_seed'], scenario['obstacle_density']
+    if result['status'] == "ok":
+        limit_reached = "Yes" if result['limit_reached'] else "No"
+    else:
+        limit_reached = result['status'].capitalize()
+    return [
+        scenario['name'], f"{dims[0]}x{dims[1]}", str(scenario['start']), str(scenario['goal']), seed, f"{density:.2f}",
+        result['algorithm'], "N/A" if beam_width is None else beam_width,
+        "Yes" if result['path_found'] else "No",
+        result['score'] if result['path_found'] else "N/A",
+        result['nodes_explored'] if result['nodes_explored'] is not None else "N/A",
+        f"{result['time']:.6f}",
+        limit_reached
+    ] + (csv_columns(result['trace']) if traced else [])
+
+
+def _result_text(result, nodes_label, limit, limit_text, timeout):
+    text = (
+        f"    [{result['algorithm']} Results]\n"
+        f"      Path Found: {'Yes' if result['path_found'] else 'No'}\n"
+    )
+    if result['path_found']:
+        text += f"      Path Score (Cost): {result['score']}\n"
+    nodes = result['nodes_explored'] if result['nodes_explored'] is not None else "N/A"
+    text += (
+        f"      {nodes_label}: {nodes}\n"
+        f"      Wall Clock Time: {result['time']:.6f} seconds\n"
+    )
+    return text + _termination_note(result, limit, limit_text, timeout)
+
+
+def _comparison_text(results_astar, results_beam):
+    comparison_text = "      Comparison: "
+    if results_astar['path_found'] and results_beam['path_found']:
+        if results_astar['score'] < results_beam['score']:
+            comparison_text += "A* found a better (shorter/cheaper) path."
+        elif results_beam['score'] < results_astar['score']:
+            comparison_text += "Beam Search found a better path (A* might have hit limit or Beam got lucky)."
+        else:
+            comparison_text += "Both algorithms found paths of the same quality (or both hit limits similarly)."
+    elif results_astar['path_found'] and not results_beam['path_found']:
+        comparison_text += "A* found a path, but Beam Search did not (possibly due to pruning or hitting limit)."
+    elif not results_astar['path_found'] and results_beam['path_found']:
+        comparison_text += "Beam Search found a path, but A* did not (A* might have hit its limit earlier on a wider search)."
+    else:
+        comparison_text += "Neither algorithm found a path (possibly no path exists, or both hit limits)."
+    return comparison_text
+
+
+def scenario_log(scenario_index, job_results, timeout, traced=False):
+    """CSV rows and verbose-log messages of one scenario; `job_results` is [(beam width, result)], A* first."""
+    scenario = scenarios[scenario_index]
+    dims, start, goal = scenario['grid_dims'], scenario['start'], scenario['goal']
+    messages = [
+        f"\n--- Scenario {scenario_index + 1}: {scenario['name']} ---",
+        f"  Grid Dimensions: {dims[0]}x{dims[1]}, Start: {start}, Goal: {goal}\n"
+        f"  Obstacle Density: {scenario['obstacle_density'] * 100:.1f}%, Scenario Seed: {scenario['scenario_seed']}\n"
+        f"  A* Node Limit: {MAX_NODES_TO_EXPLORE_ASTAR}, Beam Search Node Limit: {MAX_NODES_TO_EXPAND_BEAM}",
+    ]
+    csv_rows = []
+
+    (_, results_astar), *beam_results = job_results
+    csv_rows.append(_csv_row(scenario, results_astar, None, traced))
+    messages.append("\n  Running A*...")
+    messages.append(_result_text(results_astar, "Nodes Explored", MAX_NODES_TO_EXPLORE_ASTAR,
+                                 "Max nodes explored limit", timeout))
+
+    for beam_width, results_beam in beam_results:
+        csv_rows.append(_csv_row(scenario, results_beam, beam_width, traced))
+        messages.append(f"\n  Running Beam Search (W={beam_width})...")
+        messages.append(_result_text(results_beam, "Nodes Expanded from Beam", MAX_NODES_TO_EXPAND_BEAM,
+                                     "Max nodes expanded limit", timeout))
+        messages.append(_comparison_text(results_astar, results_beam))
+
+    messages.append("\n" + "=" * 60 + "\n") # Scenario separator
+    return csv_rows, messages
+
+
+def write_trace_file(jobs, results):
+    """One entry per job, in log order."""
+    entries = []
+    for (scenario_index, beam_width), result in zip(jobs, results):
+        entries.append({
+            "scenario": scenarios[scenario_index]['name'],
+            "algorithm": result['algorithm'],
+            "beam_width": beam_width,
+            "status": result['status'],
+            "nodes_explored": result['nodes_explored'],
+            "time": result['time'],
+            "trace": result['trace'],
+        })
+    with open(TRACE_FILE_NAME, 'w') as trace_file:
+        json.dump(entries, trace_file, indent=1)
+
+
+# --- Entry point ---
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per job before it is killed (default: none)")
+    parser.add_argument("--scenarios", default=None, help="comma separated scenario numbers (default: all)")
+    parser.add_argument("--trace", action="store_true", help=f"add search counters to the CSV and write {TRACE_FILE_NAME}")
+    parser.add_argument("--trace-sample-interval", type=int, default=0,
+                        help="with --trace, sample the frontier every N pops (A*) or depths (beam); 0 = no samples")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    if args.scenarios:
+        try:
+            numbers = [int(part) for part in args.scenarios.split(",") if part.strip()]
+        except ValueError:
+            parser.error(f"--scenarios must be comma separated numbers, got {args.scenarios!r}")
+        for number in numbers:
+            if not 1 <= number <= len(scenarios):
+                parser.error(f"--scenarios must be 1-{len(scenarios)}, got {number}")
+        if len(set(numbers)) != len(numbers):
+            parser.error(f"--scenarios lists a scenario more than once: {args.scenarios!r}")
+        scenario_indices = [number - 1 for number in numbers]
+    else:
+        scenario_indices = list(range(len(scenarios)))
+    jobs = build_jobs(scenario_indices)
+
+    with open(CSV_LOG_FILE_NAME, 'w', newline='') as csv_log_file, \
+         open(TEXT_LOG_FILE_NAME, 'w') as text_log_file:
+
+        csv_writer = csv.writer(csv_log_file)
+        csv_writer.writerow(CSV_HEADER + (TRACE_CSV_HEADER if args.trace else [])) # Write the CSV header
+
+        def write_to_console_and_text_log(message):
+            """Helper function to print to console and write to text log."""
+            print(message)
+            text_log_file.write(message + "\n")
+
+        write_to_console_and_text_log(f"Starting experiments ({len(jobs)} jobs on {args.jobs} worker processes). "
+                                      f"CSV results logged to {CSV_LOG_FILE_NAME}, Verbose log to {TEXT_LOG_FILE_NAME}")
+
+        job_indices_by_scenario = {index: [] for index in scenario_indices}
+        for job_index, (scenario_index, _) in enumerate(jobs):
+            job_indices_by_scenario[scenario_index].append(job_index)
+        finished = [None] * len(jobs)
+        next_scenario = 0
+
+        def on_result(job_index, result):
+            nonlocal next_scenario
+            finished[job_index] = result
+            # Write every scenario block that is now complete, in order
+            while next_scenario < len(scenario_indices):
+                scenario_index = scenario_indices[next_scenario]
+                job_indices = job_indices_by_scenario[scenario_index]
+                if any(finished[i] is None for i in job_indices):
+                    break
+                csv_rows, messages = scenario_log(scenario_index, [(jobs[i][1], finished[i]) for i in job_indices],
+                                                  args.timeout, args.trace)
+                csv_writer.writerows(csv_rows)
+                for message in messages:
+                    write_to_console_and_text_log(message)
+                csv_log_file.flush()
+                text_log_file.flush()
+                next_scenario += 1
+
+        results = run_jobs(jobs, args.jobs, args.timeout, on_result,
+                           trace_sample_interval=args.trace_sample_interval if args.trace else None)
+
+        if args.trace:
+            write_trace_file(jobs, results)
+            write_to_console_and_text_log(f"Search traces written to {TRACE_FILE_NAME}")
+        write_to_console_and_text_log(f"\nAll scenarios processed. CSV log: {CSV_LOG_FILE_NAME}, Verbose log: {TEXT_LOG_FILE_NAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Summary statistics shared by the cache, the query server and the benchmarks.
+"""
+import numpy as np
+
+
+def percentiles(samples):
+    """p50, p95, p99 and mean of a sequence of numbers (all 0.0 when it is empty)."""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    values = np.fromiter(samples, dtype=float)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "mean": float(values.mean())}
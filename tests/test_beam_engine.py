@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+from algorithm import beam_search_astar_pruning_implicit, heuristic_manhattan
+from beam_engine import beam_search_batched
+
+
+def _scaled_heuristic(pos, goal):
+    # Non-integer values: truncating them would reorder the beam
+    return 1.37 * heuristic_manhattan(pos, goal) + 0.06 * ((pos[0] * 7 + pos[1] * 3) % 5)
+
+
+@pytest.mark.parametrize("heuristic_func", [heuristic_manhattan, _scaled_heuristic])
+def test_matches_reference_beam_search(heuristic_func):
+    rng = random.Random(1)
+    for _ in range(300):
+        n = rng.randint(5, 30)
+        blocked = {(r, c) for r in range(n) for c in range(n) if rng.random() < 0.25}
+        start, goal = (rng.randrange(n), rng.randrange(n)), (rng.randrange(n), rng.randrange(n))
+        is_obstacle = lambda pos: pos in blocked and pos != start and pos != goal
+        beam_width = rng.choice((1, 2, 4, 8))
+        expected = beam_search_astar_pruning_implicit((n, n), start, goal, heuristic_func, is_obstacle, beam_width, 10**6)
+        result = beam_search_batched((n, n), start, goal, heuristic_func, is_obstacle, beam_width, 10**6)
+        assert (result['path'], result['nodes_explored']) == (expected['path'], expected['nodes_explored'])
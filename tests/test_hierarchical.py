@@ -0,0 +1,69 @@
+import multiprocessing
+import random
+
+import numpy as np
+import pytest
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from hierarchical import ClusterGraph, ClusterGraphStore, build_cluster_record, hpa_star_search
+from obstacle_field import get_obstacle_field
+
+DIMS = (40, 40)
+
+
+def _check_against_a_star(seed, density, start, goal, cluster_size=8):
+    is_obstacle = get_obstacle_field(seed, density).bind(start, goal)
+    expected = a_star_search_implicit(DIMS, start, goal, heuristic_manhattan, is_obstacle, 10**6)
+    graph = ClusterGraph(DIMS, seed, density, cluster_size, None, cache_dir=None)
+    result = hpa_star_search(graph, start, goal, heuristic_manhattan, is_obstacle, 10**6)
+    path = result['path']
+    assert bool(path) == bool(expected['path']), (seed, density, start, goal)
+    if path:
+        assert path[0] == start and path[-1] == goal
+        assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+        assert not any(is_obstacle(cell) for cell in path)
+        assert len(path) - 1 == result['score'] >= expected['score']
+
+
+@pytest.mark.parametrize("seed, density, start, goal", [
+    (629, 0.3, (7, 39), (18, 8)), # the start is a transition cell
+    (557, 0.3, (8, 15), (30, 22)), # the goal is blocked in the terrain
+    (427, 0.35, (24, 38), (37, 14)), # the start is blocked in the terrain
+])
+def test_endpoints_on_cluster_borders(seed, density, start, goal):
+    _check_against_a_star(seed, density, start, goal)
+
+
+def test_finds_a_path_whenever_a_star_does():
+    # With every transition kept the abstract graph loses no connection
+    rng = random.Random(7)
+    for _ in range(300):
+        start = (rng.randrange(DIMS[0]), rng.randrange(DIMS[1]))
+        goal = (rng.randrange(DIMS[0]), rng.randrange(DIMS[1]))
+        _check_against_a_star(rng.randrange(1000), rng.choice((0.1, 0.2, 0.3, 0.35)), start, goal)
+
+
+def _append_records(path, clusters):
+    store = ClusterGraphStore(path, DIMS, 5, 0.3, 8, None)
+    for cluster in clusters:
+        store.put(cluster[0] * 5 + cluster[1], build_cluster_record(cluster, 8, DIMS, 5, 0.3, None))
+    store.close()
+
+
+def test_concurrent_appends_keep_records_whole(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    clusters = [(r, c) for r in range(5) for c in range(5)]
+    context = multiprocessing.get_context("fork")
+    writers = [context.Process(target=_append_records, args=(path, clusters[i::2] * 20)) for i in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    store = ClusterGraphStore(path, DIMS, 5, 0.3, 8, None)
+    assert len(store) == len(clusters)
+    for cluster in clusters:
+        expected = build_cluster_record(cluster, 8, DIMS, 5, 0.3, None)
+        for array, expected_array in zip(store.get(cluster[0] * 5 + cluster[1]), expected):
+            np.testing.assert_array_equal(array, expected_array)
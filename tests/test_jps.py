@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from algorithm import a_star_search_implicit, heuristic_manhattan
+from jps import jump_point_search_implicit
+
+
+def _random_map(rng, n_rows, n_cols, density):
+    blocked = {(r, c) for r in range(n_rows) for c in range(n_cols) if rng.random() < density}
+    start = (rng.randrange(n_rows), rng.randrange(n_cols))
+    goal = (rng.randrange(n_rows), rng.randrange(n_cols))
+    # Searches open their endpoints, like `is_obstacle_procedural`
+    return start, goal, lambda pos: pos in blocked and pos != start and pos != goal
+
+
+@pytest.mark.parametrize("max_jump", [2, 5, 1024])
+def test_costs_match_a_star_on_random_small_maps(max_jump):
+    rng = random.Random(max_jump)
+    for _ in range(400):
+        n_rows, n_cols = rng.randint(1, 24), rng.randint(1, 24)
+        start, goal, is_obstacle = _random_map(rng, n_rows, n_cols, rng.choice((0.0, 0.1, 0.25, 0.4)))
+        expected = a_star_search_implicit((n_rows, n_cols), start, goal, heuristic_manhattan, is_obstacle, 10**6)
+        result = jump_point_search_implicit((n_rows, n_cols), start, goal, heuristic_manhattan, is_obstacle, 10**6,
+                                            max_jump=max_jump)
+        assert result['score'] == expected['score'], (n_rows, n_cols, start, goal)
+        if result['path']:
+            path = result['path']
+            assert path[0] == start and path[-1] == goal and len(path) - 1 == result['score']
+            assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+            assert not any(is_obstacle(p) for p in path)
+
+
+def test_capped_probes_do_not_stop_vertical_scans():
+    # The grid is wider than the cap, so every horizontal probe on it runs into the cap
+    result = jump_point_search_implicit((2000, 2000), (10, 10), (60, 60), heuristic_manhattan, lambda pos: False, 10**6)
+    assert result['score'] == 100
+    assert result['nodes_explored'] <= 4
@@ -0,0 +1,49 @@
+from algorithm import a_star_search_implicit, beam_search_astar_pruning_implicit, heuristic_manhattan
+from path_cache import PathCache, map_key
+
+# A narrow beam walks into the box around the start and dead-ends there
+TRAP = [
+    "..........",
+    ".####.....",
+    ".#..#.....",
+    ".#S.#..G..",
+    ".#..#.....",
+    ".#.##.....",
+    "..........",
+]
+DIMS = (len(TRAP), len(TRAP[0]))
+START, GOAL = (3, 2), (3, 7)
+BLOCKED = {(r, c) for r, line in enumerate(TRAP) for c, cell in enumerate(line) if cell == "#"}
+KEY = map_key(1, 0.2, DIMS)
+
+
+def _is_obstacle(pos):
+    return pos in BLOCKED
+
+
+def test_failed_beam_search_is_not_served(tmp_path):
+    failed = beam_search_astar_pruning_implicit(DIMS, START, GOAL, heuristic_manhattan, _is_obstacle, 1, 10**6)
+    assert not failed['path'] and not failed['limit_reached']
+
+    cache = PathCache(cache_dir=str(tmp_path))
+    assert not cache.put(KEY, START, GOAL, failed)
+    assert cache.get(KEY, START, GOAL) is None
+    assert cache.get(KEY, GOAL, START) is None
+
+    # A proven path is still stored and served
+    found = a_star_search_implicit(DIMS, START, GOAL, heuristic_manhattan, _is_obstacle, 10**6)
+    assert cache.put(KEY, START, GOAL, found)
+    hit = cache.get(KEY, START, GOAL)
+    assert hit['cached'] == "memory" and hit['optimal'] and hit['score'] == found['score'] == 11
+    cache.close()
+
+
+def test_proven_no_path_is_served():
+    walled = BLOCKED | {(r, 5) for r in range(DIMS[0])}
+    result = a_star_search_implicit(DIMS, START, GOAL, heuristic_manhattan, lambda pos: pos in walled, 10**6)
+    assert not result['path']
+
+    cache = PathCache()
+    assert cache.put(KEY, START, GOAL, result)
+    hit = cache.get(KEY, START, GOAL)
+    assert hit['optimal'] and hit['path'] == [] and hit['score'] == float('inf')
@@ -0,0 +1,136 @@
+"""
+Optional instrumentation for `a_star_search_implicit` and
+`beam_search_astar_pruning_implicit`.
+
+Pass a `SearchTrace` as `trace=` and the search fills it in. Without one the
+searches run their original loops; the only extra work is a couple of
+`if tracing` branches per pop (A*) or per depth (beam).
+
+Most counters are derived instead of counted in the hot loop: every heap push
+is either popped or still in the open set at the end, visited cells only
+grow, and a beam candidate that passed the bounds and obstacle checks was
+either kept or dropped as a duplicate. Obstacle checks are counted and timed
+by wrapping `is_obstacle_func`, so an enabled trace includes that per-call
+timing overhead in the search time.
+
+`trace.to_dict()` is JSON-ready, and `csv_columns(trace_dict)` gives the
+values for `TRACE_CSV_HEADER`.
+"""
+import time
+
+TRACE_CSV_HEADER = [
+    "Obstacle_Checks", "Obstacle_Time_s", "Heap_Pushes", "Heap_Pops", "Stale_Pops",
+    "Peak_Open", "Peak_Visited", "Reconstruct_Time_s",
+]
+
+
+class SearchTrace:
+    """
+    Counters, phase timings and frontier samples of one search.
+
+    `sample_interval` > 0 takes a snapshot every that many pops (A*) or depth
+    steps (beam): elapsed time, open/beam size, visited size and up to
+    `frontier_sample_size` frontier cells (the front of the heap for A*, the
+    beam itself for beam search). Snapshots go to `on_sample(snapshot)` if
+    given, and are kept in `samples` otherwise.
+    """
+
+    def __init__(self, sample_interval=0, on_sample=None, frontier_sample_size=64):
+        self.sample_interval = sample_interval
+        self.on_sample = on_sample
+        self.frontier_sample_size = frontier_sample_size
+        self.samples = []
+
+        self.obstacle_checks = 0
+        self.obstacles_hit = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.stale_pops = 0
+        self.duplicates_dropped = 0
+        self.peak_open = 0
+        self.peak_visited = 0
+        self.beam_sizes = []
+        self.phase_times = {"obstacle_checks": 0.0, "search_loop": 0.0, "reconstruct_path": 0.0}
+        self._start_time = None
+
+    def wrap_obstacle_func(self, is_obstacle_func):
+        """`is_obstacle_func`, counting and timing each call into this trace."""
+        perf_counter = time.perf_counter
+        phase_times = self.phase_times
+
+        def traced_is_obstacle(position):
+            started = perf_counter()
+            blocked = is_obstacle_func(position)
+            phase_times["obstacle_checks"] += perf_counter() - started
+            self.obstacle_checks += 1
+            if blocked:
+                self.obstacles_hit += 1
+            return blocked
+
+        return traced_is_obstacle
+
+    def start(self):
+        self._start_time = time.perf_counter()
+
+    def sample(self, step, open_size, visited_size, frontier):
+        snapshot = {
+            "step": step,
+            "time": time.perf_counter() - self._start_time,
+            "open_size": open_size,
+            "visited_size": visited_size,
+            "frontier": [list(position) for position in frontier[:self.frontier_sample_size]],
+        }
+        if self.on_sample is not None:
+            self.on_sample(snapshot)
+        else:
+            self.samples.append(snapshot)
+
+    def _finish(self):
+        self.phase_times["search_loop"] = time.perf_counter() - self._start_time - self.phase_times["reconstruct_path"]
+
+    def finish_heap_search(self, pops, open_size, visited_size):
+        """Derived A* counters: every push was either popped or is still open."""
+        self.heap_pops = pops
+        self.heap_pushes = pops + open_size
+        self.peak_open = max(self.peak_open, open_size)
+        self.peak_visited = visited_size
+        self._finish()
+
+    def finish_beam_search(self, expanded, candidates, visited_size):
+        """
+        Derived beam counters: pops are expanded beam nodes, pushes are
+        generated candidates, and a neighbor that passed the obstacle check
+        but did not become a candidate was a duplicate.
+        """
+        self.heap_pops = expanded
+        self.heap_pushes = candidates
+        self.duplicates_dropped = self.obstacle_checks - self.obstacles_hit - candidates
+        self.peak_visited = visited_size
+        self._finish()
+
+    def to_dict(self):
+        return {
+            "obstacle_checks": self.obstacle_checks,
+            "obstacles_hit": self.obstacles_hit,
+            "heap_pushes": self.heap_pushes,
+            "heap_pops": self.heap_pops,
+            "stale_pops": self.stale_pops,
+            "duplicates_dropped": self.duplicates_dropped,
+            "peak_open": self.peak_open,
+            "peak_visited": self.peak_visited,
+            "beam_sizes": list(self.beam_sizes),
+            "phase_times": dict(self.phase_times),
+            "samples": list(self.samples),
+        }
+
+
+def csv_columns(trace_dict):
+    """Values for TRACE_CSV_HEADER from `SearchTrace.to_dict()` output (or N/A without a trace)."""
+    if trace_dict is None:
+        return ["N/A"] * len(TRACE_CSV_HEADER)
+    phase_times = trace_dict["phase_times"]
+    return [
+        trace_dict["obstacle_checks"], f"{phase_times['obstacle_checks']:.6f}",
+        trace_dict["heap_pushes"], trace_dict["heap_pops"], trace_dict["stale_pops"],
+        trace_dict["peak_open"], trace_dict["peak_visited"], f"{phase_times['reconstruct_path']:.6f}",
+    ]